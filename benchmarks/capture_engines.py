@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark the thread and process capture engines on synthetic streams.
+
+Serves paced MJPEG streams from a separate process on localhost, runs them
+through a CameraPool with CameraSettings.capture_engine set to "thread" and
+then "process", and reports per engine and stream count:
+
+- delivered frames per second per stream
+- lateness of a 10 ms timer in the main process (GIL contention seen by
+  a UI thread)
+- CPU time used by the main process
+
+Usage: python benchmarks/capture_engines.py --streams 8 16 32 --duration 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import statistics
+import sys
+import time
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from cameraapp.budget import DecodeBudget  # noqa: E402
+from cameraapp.camera import Camera  # noqa: E402
+from cameraapp.config import CAMERA_SETTINGS, LOGGER_NAME  # noqa: E402
+from cameraapp.pool import CameraPool  # noqa: E402
+
+TICK = 0.01
+
+
+def encode_frames(width: int, height: int, count: int = 25) -> list[bytes]:
+    """Encode a short loop of moving test frames as JPEG."""
+    frames = []
+    for i in range(count):
+        image = np.zeros((height, width, 3), dtype=np.uint8)
+        image[:, :, 0] = np.linspace(0, 255, width, dtype=np.uint8)
+        x = i * width // count
+        image[:, x : x + width // 10] = (0, 128, 255)
+        cv2.putText(
+            image, str(i), (20, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 3, (255,) * 3, 4
+        )
+        frames.append(cv2.imencode(".jpg", image)[1].tobytes())
+    return frames
+
+
+def serve_streams(
+    port_queue: multiprocessing.Queue, width: int, height: int, fps: float
+) -> None:
+    """Serve paced MJPEG streams until killed (runs in its own process)."""
+    frames = encode_frames(width, height)
+
+    class StreamHandler(BaseHTTPRequestHandler):
+        """Sends the frame loop as multipart JPEG at ``fps``."""
+
+        def do_GET(self) -> None:  # noqa: N802
+            """Stream frames until the client disconnects."""
+            self.send_response(200)
+            self.send_header(
+                "Content-Type", "multipart/x-mixed-replace; boundary=frame"
+            )
+            self.end_headers()
+            next_frame = time.monotonic()
+            index = 0
+            try:
+                while True:
+                    jpeg = frames[index % len(frames)]
+                    index += 1
+                    self.wfile.write(
+                        b"--frame\r\nContent-Type: image/jpeg\r\n"
+                        b"Content-Length: %d\r\n\r\n%s\r\n" % (len(jpeg), jpeg)
+                    )
+                    next_frame += 1.0 / fps
+                    time.sleep(max(0.0, next_frame - time.monotonic()))
+            except OSError:
+                pass
+
+        def log_message(self, format: str, *args: object) -> None:
+            """Silence per-request logging."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def run(engine: str, streams: int, url: str, duration: float) -> None:
+    """Run ``streams`` cameras on one engine and print the measurements."""
+    logger = logging.getLogger("benchmark")
+    settings = replace(CAMERA_SETTINGS, capture_engine=engine)
+    with patch("cameraapp.camera.CAMERA_SETTINGS", settings):
+        # No decode budget: every stream should decode at its full rate
+        pool = CameraPool(logger, workers=streams, budget=DecodeBudget(cores=-1))
+        for i in range(streams):
+            pool.add(
+                Camera(
+                    f"127.0.0.{i + 1}",
+                    80,
+                    "",
+                    "",
+                    f"{url}?stream={i}",
+                    logger_instance=logger,
+                )
+            )
+        pool.start(keep_trying=False)
+        deadline = time.monotonic() + 60
+        while not all(camera.frame_seq for camera in pool):
+            if time.monotonic() > deadline:
+                print(f"{engine:<7} {streams:>3} streams: not all streams started")
+                pool.stop()
+                return
+            time.sleep(0.1)
+
+        start_frames = sum(camera.metrics.frames_decoded for camera in pool)
+        start_cpu = time.process_time()
+        start = time.monotonic()
+        lateness = []
+        seen: dict[str, int] = {}
+        while time.monotonic() - start < duration:
+            before = time.monotonic()
+            time.sleep(TICK)
+            lateness.append((time.monotonic() - before - TICK) * 1000)
+            # Fetch frames the way a UI tick does
+            for camera_id, packet in pool.latest_frames(after=seen).items():
+                seen[camera_id] = packet.seq
+        elapsed = time.monotonic() - start
+        frames = sum(camera.metrics.frames_decoded for camera in pool) - start_frames
+        cpu = time.process_time() - start_cpu
+        pool.stop()
+
+    lateness.sort()
+    print(
+        f"{engine:<7} {streams:>3} streams | "
+        f"{frames / elapsed / streams:5.1f} fps/stream | "
+        f"timer lateness p50 {statistics.median(lateness):6.2f} ms "
+        f"p95 {lateness[int(len(lateness) * 0.95) - 1]:6.2f} ms | "
+        f"main process CPU {cpu / elapsed * 100:5.1f}%"
+    )
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--streams", type=int, nargs="+", default=[8, 16, 32], help="Stream counts"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--fps", type=float, default=25.0, help="Frames per stream")
+    parser.add_argument("--width", type=int, default=1280, help="Frame width")
+    parser.add_argument("--height", type=int, default=720, help="Frame height")
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=["thread", "process"],
+        choices=["thread", "process"],
+        help="Engines to compare",
+    )
+    args = parser.parse_args()
+    for name in ("benchmark", LOGGER_NAME):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    ctx = multiprocessing.get_context("spawn")
+    port_queue = ctx.Queue()
+    server = ctx.Process(
+        target=serve_streams,
+        args=(port_queue, args.width, args.height, args.fps),
+        daemon=True,
+    )
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get(timeout=30)}/stream.mjpg"
+    print(
+        f"{args.width}x{args.height} MJPEG at {args.fps:g} fps per stream, "
+        f"{args.duration:g} s per run"
+    )
+
+    try:
+        for streams in args.streams:
+            for engine in args.engines:
+                run(engine, streams, url, args.duration)
+    finally:
+        server.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
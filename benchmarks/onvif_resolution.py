@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark ONVIF stream resolution for many cameras.
+
+Starts one fake ONVIF device per camera on localhost and resolves the RTSP
+stream URI of each one with:
+
+- legacy: a new ONVIFCamera(no_cache=True, adjust_time=True) per camera,
+  as Camera.get_rtsp_url_from_onvif used to do
+- cold: a fresh OnvifClientFactory (WSDLs parsed on first use)
+- warm: the same factory again (parsed WSDLs, open sessions, cached services)
+
+Usage: python benchmarks/onvif_resolution.py --cameras 50 --latency 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from cameraapp.onvif_client import ONVIF_AVAILABLE, OnvifClientFactory  # noqa: E402
+
+ENVELOPE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" '
+    'xmlns:tds="http://www.onvif.org/ver10/device/wsdl" '
+    'xmlns:trt="http://www.onvif.org/ver10/media/wsdl" '
+    'xmlns:tt="http://www.onvif.org/ver10/schema">'
+    "<s:Body>{body}</s:Body></s:Envelope>"
+)
+
+RESPONSES = {
+    "GetSystemDateAndTime": (
+        "<tds:GetSystemDateAndTimeResponse><tds:SystemDateAndTime>"
+        "<tt:DateTimeType>NTP</tt:DateTimeType>"
+        "<tt:DaylightSavings>false</tt:DaylightSavings>"
+        "<tt:UTCDateTime><tt:Time><tt:Hour>{now.tm_hour}</tt:Hour>"
+        "<tt:Minute>{now.tm_min}</tt:Minute><tt:Second>{now.tm_sec}</tt:Second>"
+        "</tt:Time><tt:Date><tt:Year>{now.tm_year}</tt:Year>"
+        "<tt:Month>{now.tm_mon}</tt:Month><tt:Day>{now.tm_mday}</tt:Day>"
+        "</tt:Date></tt:UTCDateTime>"
+        "</tds:SystemDateAndTime></tds:GetSystemDateAndTimeResponse>"
+    ),
+    "GetCapabilities": (
+        "<tds:GetCapabilitiesResponse><tds:Capabilities>"
+        "<tt:Media><tt:XAddr>http://127.0.0.1:{port}/onvif/media_service</tt:XAddr>"
+        "<tt:StreamingCapabilities><tt:RTPMulticast>false</tt:RTPMulticast>"
+        "<tt:RTP_TCP>true</tt:RTP_TCP><tt:RTP_RTSP_TCP>true</tt:RTP_RTSP_TCP>"
+        "</tt:StreamingCapabilities></tt:Media>"
+        "</tds:Capabilities></tds:GetCapabilitiesResponse>"
+    ),
+    "GetProfiles": (
+        '<trt:GetProfilesResponse><trt:Profiles token="main">'
+        "<tt:Name>main</tt:Name></trt:Profiles></trt:GetProfilesResponse>"
+    ),
+    "GetStreamUri": (
+        "<trt:GetStreamUriResponse><trt:MediaUri>"
+        "<tt:Uri>rtsp://127.0.0.1:{port}/Streaming/Channels/101</tt:Uri>"
+        "<tt:InvalidAfterConnect>false</tt:InvalidAfterConnect>"
+        "<tt:InvalidAfterReboot>false</tt:InvalidAfterReboot>"
+        "<tt:Timeout>PT0S</tt:Timeout>"
+        "</trt:MediaUri></trt:GetStreamUriResponse>"
+    ),
+}
+
+
+class FakeOnvifHandler(BaseHTTPRequestHandler):
+    """Answers the four calls needed to resolve a stream URI."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    latency = 0.0
+    stats: dict[str, int] = {"requests": 0, "connections": 0}
+    stats_lock = threading.Lock()
+
+    def setup(self) -> None:
+        """Count TCP connections."""
+        super().setup()
+        with self.stats_lock:
+            self.stats["connections"] += 1
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Reply to a SOAP request based on the operation in the body."""
+        length = int(self.headers.get("Content-Length", 0))
+        request = self.rfile.read(length).decode("utf-8", "replace")
+        with self.stats_lock:
+            self.stats["requests"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        operation = next((name for name in RESPONSES if name in request), None)
+        if operation is None:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = RESPONSES[operation].format(
+            now=time.gmtime(), port=self.server.server_address[1]
+        )
+        payload = ENVELOPE.format(body=body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/soap+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Silence per-request logging."""
+
+
+def start_devices(count: int) -> list[ThreadingHTTPServer]:
+    """Start one fake device per camera on an ephemeral localhost port."""
+    servers = []
+    for _ in range(count):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOnvifHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def run(name: str, ports: list[int], resolve: Callable[[int], str]) -> None:
+    """Resolve every camera once and print per-camera timings."""
+    FakeOnvifHandler.stats.update(requests=0, connections=0)
+    timings = []
+    for port in ports:
+        start = time.perf_counter()
+        uri = resolve(port)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert uri.endswith("/Streaming/Channels/101"), uri
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+    stats = FakeOnvifHandler.stats
+    print(
+        f"{name:<7} mean {statistics.mean(timings):7.1f} ms | "
+        f"p50 {statistics.median(timings):7.1f} ms | p95 {p95:7.1f} ms | "
+        f"total {sum(timings) / 1000:6.2f} s | "
+        f"{stats['requests'] / len(ports):.1f} requests, "
+        f"{stats['connections'] / len(ports):.1f} connections per camera"
+    )
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cameras", type=int, default=50, help="Number of devices")
+    parser.add_argument(
+        "--latency", type=float, default=5.0, help="Simulated per-request latency (ms)"
+    )
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="Skip the ONVIFCamera baseline"
+    )
+    args = parser.parse_args()
+
+    if not ONVIF_AVAILABLE:
+        print("onvif-zeep is not installed: pip install -e .[onvif]")
+        return 1
+
+    FakeOnvifHandler.latency = args.latency / 1000
+    servers = start_devices(args.cameras)
+    ports = [server.server_address[1] for server in servers]
+    print(f"{args.cameras} cameras, {args.latency:g} ms simulated latency per request")
+
+    if not args.skip_legacy:
+        from onvif import ONVIFCamera
+
+        def legacy(port: int) -> str:
+            camera = ONVIFCamera(
+                "127.0.0.1", port, "admin", "admin", no_cache=True, adjust_time=True
+            )
+            media = camera.create_media_service()
+            token = media.GetProfiles()[0].token
+            return media.GetStreamUri(
+                {
+                    "StreamSetup": {
+                        "Stream": "RTP-Unicast",
+                        "Transport": {"Protocol": "RTSP"},
+                    },
+                    "ProfileToken": token,
+                }
+            ).Uri
+
+        run("legacy", ports, legacy)
+
+    factory = OnvifClientFactory()
+
+    def shared(port: int) -> str:
+        return factory.device("127.0.0.1", port, "admin", "admin").get_stream_uri()[0]
+
+    run("cold", ports, shared)
+    run("warm", ports, shared)
+
+    factory.close()
+    for server in servers:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark the async and thread port scan engines on a simulated /16.
+
+Every address in 127.0.0.0/8 is local on Linux, so a loopback /16 behaves
+like a large subnet in which most ports refuse at once. A few addresses get
+listeners on the camera ports (shifted by 10000 so no privileges are
+needed) to stand in for cameras, and ``--silent-ports`` of the other ports
+behave like a firewall that drops SYNs: they are bound on every address to
+a listener whose accept queue is kept full, so connects to them time out.
+Each engine scans the whole range in a fresh process and the benchmark
+reports, per engine:
+
+- wall time and probes per second
+- peak resident memory of the scanning process
+- cameras found
+
+Usage: python benchmarks/port_scan.py --prefix 16 --cameras 20 --silent-ports 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import logging
+import multiprocessing
+import random
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from cameraapp.config import LOGGER_NAME  # noqa: E402
+from cameraapp.scanner import CAMERA_PORTS, NetworkScanner  # noqa: E402
+
+PORT_OFFSET = 10000
+
+
+def benchmark_ports() -> list[int]:
+    """Return the camera ports shifted into the unprivileged range."""
+    return [port + PORT_OFFSET for port in CAMERA_PORTS]
+
+
+def start_cameras(network: str, count: int, seed: int = 1) -> list[socket.socket]:
+    """Listen on RTSP and HTTP ports of ``count`` random hosts of the range."""
+    hosts = list(ipaddress.ip_network(network).hosts())
+    rng = random.Random(seed)
+    listeners = []
+    for host in rng.sample(hosts, count):
+        for port in (554 + PORT_OFFSET, 80 + PORT_OFFSET):
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((str(host), port))
+            listener.listen(64)
+            listeners.append(listener)
+
+    def accept(listener: socket.socket) -> None:
+        """Accept and drop connections until the listener is closed."""
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            conn.close()
+
+    for listener in listeners:
+        threading.Thread(target=accept, args=(listener,), daemon=True).start()
+    return listeners
+
+
+def start_silent_ports(count: int) -> list[socket.socket]:
+    """Make ``count`` non-camera ports drop SYNs on every loopback address."""
+    ports = [port for port in benchmark_ports() if port % PORT_OFFSET not in (554, 80)]
+    sockets = []
+    for port in ports[:count]:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(("0.0.0.0", port))
+        listener.listen(0)
+        sockets.append(listener)
+        # Fill the accept queue; it is never drained, so later SYNs are dropped
+        for _ in range(4):
+            filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            filler.setblocking(False)
+            filler.connect_ex(("127.0.0.1", port))
+            sockets.append(filler)
+    time.sleep(0.2)
+    return sockets
+
+
+def run_engine(
+    engine: str,
+    network: str,
+    timeout: float,
+    workers: int,
+    concurrency: int,
+    results: multiprocessing.Queue,
+) -> None:
+    """Scan the range with one engine and report (runs in its own process)."""
+    import resource
+
+    logging.getLogger(LOGGER_NAME).setLevel(logging.WARNING)
+    scanner = NetworkScanner(
+        timeout=timeout, max_workers=workers, engine=engine, concurrency=concurrency
+    )
+    start = time.monotonic()
+    cameras = scanner.scan_ports(network, ports=benchmark_ports(), probe_onvif=False)
+    elapsed = time.monotonic() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, peak_kib, len(cameras)))
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--prefix", type=int, default=16, help="Prefix length")
+    parser.add_argument("--cameras", type=int, default=20, help="Listening hosts")
+    parser.add_argument(
+        "--silent-ports", type=int, default=1, help="Ports whose SYNs are dropped"
+    )
+    parser.add_argument("--timeout", type=float, default=0.5, help="Probe timeout")
+    parser.add_argument("--workers", type=int, default=100, help="Thread engine")
+    parser.add_argument(
+        "--concurrency", type=int, default=512, help="Async engine window"
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=["async", "thread"],
+        choices=["async", "thread"],
+        help="Engines to compare",
+    )
+    args = parser.parse_args()
+
+    network = f"127.1.0.0/{args.prefix}"
+    sockets = start_cameras(network, args.cameras)
+    sockets += start_silent_ports(args.silent_ports)
+    probes = NetworkScanner()._count_ip_range(network) * len(CAMERA_PORTS)
+    print(
+        f"{network}: {probes} probes, {args.cameras} listening hosts, "
+        f"{args.silent_ports} silent ports, {args.timeout:g} s timeout"
+    )
+
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        for engine in args.engines:
+            results = ctx.Queue()
+            process = ctx.Process(
+                target=run_engine,
+                args=(
+                    engine,
+                    network,
+                    args.timeout,
+                    args.workers,
+                    args.concurrency,
+                    results,
+                ),
+            )
+            process.start()
+            elapsed, peak_kib, found = results.get()
+            process.join()
+            print(
+                f"{engine:<6} | {elapsed:7.1f} s | {probes / elapsed:8.0f} probes/s | "
+                f"peak RSS {peak_kib / 1024:6.1f} MiB | {found} cameras found"
+            )
+    finally:
+        for sock in sockets:
+            sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,23 @@ __version__ = "1.0.0"
 __author__ = "Caio Vinicius"
 __email__ = "contact@cfatech.com"
 
-from cameraapp.app import CameraApp
-from cameraapp.camera import Camera
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from cameraapp.app import CameraApp
+    from cameraapp.camera import Camera
 
 __all__ = ["CameraApp", "Camera", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the public classes on first use (keeps headless starts free of Tk)."""
+    if name == "CameraApp":
+        from cameraapp.app import CameraApp
+
+        return CameraApp
+    if name == "Camera":
+        from cameraapp.camera import Camera
+
+        return Camera
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
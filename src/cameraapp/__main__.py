@@ -3,9 +3,12 @@ Entry point for CameraApp when run as a module.
 
 Usage:
     python -m cameraapp
+    python -m cameraapp --headless
 """
 
+import sys
+
 from cameraapp.main import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -8,17 +8,34 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
+import time
 import tkinter as tk
+from functools import partial
 from tkinter import messagebox, ttk
-from typing import Optional
+from typing import Callable, Generator, Optional
 
-import cv2
-import numpy as np
-from numpy.typing import NDArray
-from PIL import Image, ImageTk
+from PIL import ImageTk
 
 from cameraapp.camera import Camera, ONVIF_AVAILABLE
-from cameraapp.config import APP_NAME, LOGGER_NAME, UI_SETTINGS
+from cameraapp.config import (
+    APP_NAME,
+    LOGGER_NAME,
+    METRICS_SETTINGS,
+    PATHS,
+    UI_SETTINGS,
+)
+from cameraapp.frames import FrameNotifier, FramePacket
+from cameraapp.metrics import metrics_registry
+from cameraapp.pool import CameraPool
+from cameraapp.render import (
+    MosaicCompositor,
+    PreparedTile,
+    RenderPipeline,
+    TickTimer,
+    TileSurface,
+)
+from cameraapp.timeline import summarize as summarize_timelines
 from cameraapp.utils import center_window, load_cameras, save_cameras
 from cameraapp.scanner import NetworkScanner, DiscoveredCamera, get_local_network
 
@@ -90,12 +107,56 @@ class CameraApp:
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # State
-        self.cameras: list[Camera] = []
+        self.pool: CameraPool = CameraPool(app_logger)
         self._labels: list[tk.Label] = []
         self._aspect_ratios: list[str] = []
         self._camera_list_window: Optional[tk.Toplevel] = None
         self._camera_treeview: Optional[ttk.Treeview] = None
-        self._empty_frame_counts: dict[str, int] = {}  # Track empty frames per camera
+        self._tile_seqs: list[int] = []  # Last frame sequence sent to each tile
+        self._tile_status: list[str] = []  # Status text shown on each tile
+        self._tile_sizes: list[tuple[int, int]] = []  # From <Configure> events
+        self._tile_surfaces: list[Optional[TileSurface]] = []
+        self._tile_photos: list[Optional[ImageTk.PhotoImage]] = []
+        self._render_pipeline = RenderPipeline(UI_SETTINGS.render_workers)
+        self._tick_timer = TickTimer(
+            "UI tick (main thread)", UI_SETTINGS.tick_stats_interval, app_logger
+        )
+
+        # Event-driven refresh: capture threads wake the tick when it is idle.
+        # Generating a Tk event from another thread is only safe when Tcl is
+        # built with threads; otherwise the tick just polls the notifier flag.
+        self._tick_after_id: Optional[str] = None
+        self._tick_interval = UI_SETTINGS.frame_update_interval
+        wakeup = self._wake_ui if self._tcl_is_threaded() else None
+        self._frame_notifier = FrameNotifier(wakeup, name="UIWakeup")
+        self.root.bind("<<FramesReady>>", self._on_frames_ready)
+        self._frame_notifier.start()
+        if wakeup is None:
+            self._logger.info("Tcl is not threaded; the UI tick polls for frames")
+
+        # Cameras whose tile cannot be seen stop decoding
+        self._visibility_after_id: Optional[str] = None
+        self._bind_visibility_events(self.root)
+
+        # Time-to-first-frame tracking (the pool runs the background startup)
+        self._startup_reported = False
+        self._first_frame_times: dict[Camera, float] = {}
+
+        # Mosaic renderer (one canvas, one image per tick)
+        self._renderer = UI_SETTINGS.renderer
+        self._compositor: Optional[MosaicCompositor] = None
+        if self._renderer == "mosaic":
+            self._compositor = MosaicCompositor(UI_SETTINGS.grid_columns)
+        self._canvas: Optional[tk.Canvas] = None
+        self._canvas_image_id = 0
+        self._canvas_size = (0, 0)
+        self._canvas_texts: list[int] = []
+        self._mosaic_photo: Optional[ImageTk.PhotoImage] = None
+        self._mosaic_dirty = False
+        # Tiles to paint black through the render pipeline
+        self._tiles_to_clear: set[int] = set()
+
+        self._start_metrics_export()
         self.running = True
 
         # Setup UI
@@ -140,11 +201,11 @@ class CameraApp:
             self._frame_container.pack(expand=True, fill=tk.BOTH)
 
             self._load_cameras()
-            self._start_cameras()
             self._create_video_labels()
+            self._start_cameras()
             self._update_frames()
 
-            self._logger.info("Widgets created and cameras started")
+            self._logger.info("Widgets created, cameras connecting in background")
         except Exception as e:
             self._logger.error(f"Error creating widgets: {e}", exc_info=True)
             messagebox.showerror(
@@ -153,48 +214,73 @@ class CameraApp:
             )
             self._on_close()
 
+    @property
+    def cameras(self) -> tuple[Camera, ...]:
+        """Return the pool's cameras in grid order."""
+        cameras: tuple[Camera, ...] = self.pool.cameras
+        return cameras
+
     def _load_cameras(self) -> None:
-        """Load cameras from configuration file."""
+        """Load cameras from configuration file into the pool."""
         try:
             loaded_cameras = load_cameras(self._logger)
-            self.cameras = [cam for cam in loaded_cameras if isinstance(cam, Camera)]
-            self._logger.info(f"{len(self.cameras)} cameras loaded")
+            for cam in loaded_cameras:
+                if isinstance(cam, Camera):
+                    self.pool.add(cam)
+            self._logger.info(f"{len(self.pool)} cameras loaded")
         except Exception as e:
             self._logger.error(f"Error loading cameras: {e}", exc_info=True)
-            self.cameras = []
 
     def _start_cameras(self) -> None:
-        """Connect all loaded cameras."""
-        try:
-            self._logger.info("Starting camera connections...")
-            connected = 0
-
-            for camera in self.cameras:
-                if not camera.connected:
-                    if camera.connect():
-                        connected += 1
-                    else:
-                        self._logger.warning(
-                            f"Failed to connect: IP={camera.ip}, "
-                            f"RTSP={camera.rtsp_url}"
-                        )
-                else:
-                    connected += 1
+        """
+        Connect all loaded cameras in the background.
 
-            self._logger.info(f"{connected}/{len(self.cameras)} cameras connected")
+        The pool opens connections on a bounded worker pool in priority order
+        (camera.priority, then grid position) so the window appears at once
+        and the first tiles connect first. Cameras that are down keep
+        retrying under the reconnect scheduler.
+        """
+        try:
+            self._startup_reported = not self.cameras
+            self._first_frame_times = {}
+            self.pool.start()
         except Exception as e:
             self._logger.error(f"Error starting cameras: {e}", exc_info=True)
 
+    def _report_startup(self) -> None:
+        """Log the grid's time-to-first-frame once every connected tile has video."""
+        if self._startup_reported or not self.pool.startup_done:
+            return
+        if any(
+            cam.connected and cam not in self._first_frame_times for cam in self.cameras
+        ):
+            return
+
+        self._startup_reported = True
+        if self._first_frame_times:
+            shown = len(self._first_frame_times)
+            slowest = max(self._first_frame_times.values())
+            self._logger.info(
+                f"Time to first frame: {shown}/{len(self.cameras)} "
+                f"tiles showing video after {slowest:.2f}s"
+            )
+            # Where the time went, from each camera's first successful attempt
+            timelines = []
+            for cam in self._first_frame_times:
+                connected = [
+                    t for t in cam.connect_timelines if t.outcome == "connected"
+                ]
+                if connected:
+                    timelines.append(connected[0])
+            if timelines:
+                self._logger.info(summarize_timelines(timelines))
+        else:
+            self._logger.warning("No camera delivered a frame during startup")
+
     def _create_video_labels(self) -> None:
-        """Create video display labels for each camera."""
+        """Create video display tiles (labels or a mosaic canvas) for each camera."""
         try:
-            # Clear existing labels
-            for label in self._labels:
-                if label.winfo_exists():
-                    label.destroy()
-
-            self._labels = []
-            self._aspect_ratios = []
+            self._clear_tiles()
 
             num_cameras = len(self.cameras)
             display_cells = max(num_cameras, 1)
@@ -207,23 +293,24 @@ class CameraApp:
             for i in range(cols):
                 self._frame_container.grid_columnconfigure(i, weight=1)
 
-            # Create labels
             for i in range(num_cameras):
-                label = tk.Label(
-                    self._frame_container,
-                    bg="black",
-                    text=f"Camera {i + 1}",
-                    fg="white",
-                )
-                row = i // cols
-                col = i % cols
-                label.grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
-
-                self._labels.append(label)
+                camera = self.cameras[i]
+                if isinstance(camera, Camera):
+                    camera.add_frame_listener(self._frame_notifier.notify)
                 self._aspect_ratios.append(UI_SETTINGS.default_aspect_ratio)
-                self._add_context_menu(label, i)
+                self._tile_seqs.append(0)
+                self._tile_status.append(f"Camera {i + 1}")
+                self._tile_sizes.append((0, 0))
+                self._tile_surfaces.append(None)
+                self._tile_photos.append(None)
+
+            if self._compositor is not None:
+                self._create_mosaic_canvas(rows, cols)
+            else:
+                self._create_tile_labels(num_cameras, cols)
 
-            self._logger.info(f"Created {num_cameras} video labels")
+            self._logger.info(f"Created {num_cameras} video tiles ({self._renderer})")
+            self._schedule_visibility_update()
 
             if num_cameras == 0:
                 no_cam_label = tk.Label(
@@ -237,22 +324,128 @@ class CameraApp:
         except Exception as e:
             self._logger.error(f"Error creating video labels: {e}", exc_info=True)
 
-    def _add_context_menu(self, label: tk.Label, index: int) -> None:
-        """Add aspect ratio context menu to a label."""
-        try:
-            menu = tk.Menu(label, tearoff=0)
-            menu.add_command(
-                label="4:3",
-                command=lambda: self._set_aspect_ratio(index, "4:3"),
+    def _clear_tiles(self) -> None:
+        """Destroy the existing tiles and forget their per-tile state."""
+        for label in self._labels:
+            if label.winfo_exists():
+                label.destroy()
+        if self._canvas is not None and self._canvas.winfo_exists():
+            self._canvas.destroy()
+        self._canvas = None
+
+        self._labels = []
+        self._aspect_ratios = []
+        self._tile_seqs = []
+        self._tile_status = []
+        self._tile_sizes = []
+        self._tile_surfaces = []
+        self._tile_photos = []
+        self._render_pipeline.reset()
+
+    def _create_tile_labels(self, num_cameras: int, cols: int) -> None:
+        """Create one label per camera for the per-tile renderer."""
+        for i in range(num_cameras):
+            label = tk.Label(
+                self._frame_container,
+                bg="black",
+                text=f"Camera {i + 1}",
+                fg="white",
             )
-            menu.add_command(
-                label="16:9",
-                command=lambda: self._set_aspect_ratio(index, "16:9"),
+            row = i // cols
+            col = i % cols
+            label.grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
+
+            self._labels.append(label)
+            self._add_context_menu(label, i)
+            label.bind("<Configure>", partial(self._on_tile_configure, i))
+
+    def _create_mosaic_canvas(self, rows: int, cols: int) -> None:
+        """Create the single canvas used by the mosaic renderer."""
+        self._canvas = tk.Canvas(
+            self._frame_container,
+            bg="black",
+            highlightthickness=0,
+        )
+        self._canvas.grid(row=0, column=0, rowspan=rows, columnspan=cols, sticky="nsew")
+        self._canvas_image_id = self._canvas.create_image(0, 0, anchor=tk.NW)
+        self._canvas_size = (0, 0)
+        self._canvas_texts = []
+        self._mosaic_photo = None
+        self._mosaic_dirty = False
+        self._tiles_to_clear.clear()
+
+        # Force a fresh layout on the next tick
+        self._compositor = MosaicCompositor(UI_SETTINGS.grid_columns)
+
+        menus = [
+            self._build_aspect_menu(self._canvas, i)
+            for i in range(len(self._tile_seqs))
+        ]
+
+        def on_right_click(event: tk.Event) -> None:
+            index = (
+                self._compositor.tile_at(event.x, event.y) if self._compositor else None
             )
-            menu.add_command(
-                label="Fit",
-                command=lambda: self._set_aspect_ratio(index, "fit"),
+            if index is not None and index < len(menus):
+                menus[index].post(event.x_root, event.y_root)
+
+        self._canvas.bind("<Button-3>", on_right_click)
+        self._canvas.bind("<Configure>", self._on_canvas_configure)
+
+    def _on_tile_configure(self, index: int, event: tk.Event) -> None:
+        """Cache a label's size so the frame loop never queries geometry."""
+        # The size also weights the camera's share of the decode budget
+        if index < len(self._tile_sizes):
+            self._tile_sizes[index] = (event.width, event.height)
+        cameras = self.cameras
+        if index < len(cameras):
+            cameras[index].display_area = event.width * event.height
+
+    def _on_canvas_configure(self, event: tk.Event) -> None:
+        """Cache the mosaic canvas size."""
+        self._canvas_size = (event.width, event.height)
+
+    def _layout_mosaic_texts(self) -> None:
+        """Place one status text item at the centre of each mosaic tile."""
+        if self._canvas is None or self._compositor is None:
+            return
+
+        for item_id in self._canvas_texts:
+            self._canvas.delete(item_id)
+
+        self._canvas_texts = []
+        for i, tile in enumerate(self._compositor.tiles):
+            status = self._tile_status[i] if i < len(self._tile_status) else ""
+            self._canvas_texts.append(
+                self._canvas.create_text(
+                    tile.x + tile.width // 2,
+                    tile.y + tile.height // 2,
+                    text=status,
+                    fill="white",
+                )
             )
+
+    def _build_aspect_menu(self, parent: tk.Misc, index: int) -> tk.Menu:
+        """Build the aspect ratio context menu for a tile."""
+        menu = tk.Menu(parent, tearoff=0)
+        menu.add_command(
+            label="4:3",
+            command=lambda: self._set_aspect_ratio(index, "4:3"),
+        )
+        menu.add_command(
+            label="16:9",
+            command=lambda: self._set_aspect_ratio(index, "16:9"),
+        )
+        menu.add_command(
+            label="Fit",
+            command=lambda: self._set_aspect_ratio(index, "fit"),
+        )
+        return menu
+
+    def _add_context_menu(self, label: tk.Label, index: int) -> None:
+        """Add aspect ratio context menu to a label."""
+        try:
+            menu = self._build_aspect_menu(label, index)
             label.bind("<Button-3>", lambda e: menu.post(e.x_root, e.y_root))
         except Exception as e:
             self._logger.error(f"Error adding context menu: {e}")
@@ -263,171 +456,397 @@ class CameraApp:
             self._aspect_ratios[index] = ratio
             self._logger.info(f"Aspect ratio for camera {index} set to {ratio}")
 
-    def _resize_frame(
-        self,
-        frame: NDArray[np.uint8],
-        label: tk.Label,
-        aspect_ratio: str,
-    ) -> Optional[NDArray[np.uint8]]:
+    def _set_tile_status(self, index: int, text: str, color: str = "white") -> None:
         """
-        Resize frame to fit label with specified aspect ratio.
+        Show a status text (or clear it) on a tile.
 
         Args:
-            frame: Input frame
-            label: Target label widget
-            aspect_ratio: Aspect ratio ("4:3", "16:9", or "fit")
-
-        Returns:
-            Resized frame or None on error
+            index: Tile index
+            text: Status text ("" once video is shown)
+            color: Text colour
         """
-        try:
-            label_width = label.winfo_width()
-            label_height = label.winfo_height()
-
-            if label_width <= 1 or label_height <= 1:
-                return None
-
-            frame_height, frame_width = frame.shape[:2]
-            if frame_height == 0 or frame_width == 0:
-                return None
-
-            # Determine interpolation
-            interpolation = cv2.INTER_AREA
-
-            # Handle "fit" mode
-            if aspect_ratio == "fit":
-                if label_width > frame_width:
-                    interpolation = cv2.INTER_LINEAR
-                return cv2.resize(
-                    frame,
-                    (label_width, label_height),
-                    interpolation=interpolation,
-                )
+        if index >= len(self._tile_status) or self._tile_status[index] == text:
+            return
+        self._tile_status[index] = text
 
-            # Calculate target ratio
-            target_ratio = {"4:3": 4 / 3, "16:9": 16 / 9}.get(aspect_ratio)
-            if target_ratio is None:
-                return cv2.resize(
-                    frame,
-                    (label_width, label_height),
-                    interpolation=interpolation,
+        if self._compositor is not None:
+            if self._canvas is not None and index < len(self._canvas_texts):
+                self._canvas.itemconfig(
+                    self._canvas_texts[index], text=text, fill=color
                 )
+            if text:
+                # A render worker may be drawing this tile; clear it through
+                # the pipeline once the tile is free
+                self._tiles_to_clear.add(index)
+        elif index < len(self._labels) and text:
+            self._labels[index].config(image="", text=text, fg=color)
+            # The photo is detached; attach it again with the next frame
+            self._tile_photos[index] = None
+
+    def _tcl_is_threaded(self) -> bool:
+        """Return whether Tcl was built with thread support."""
+        try:
+            return str(self.root.tk.eval("set tcl_platform(threaded)")) == "1"
+        except tk.TclError:
+            return False
 
-            # Calculate new dimensions maintaining ratio
-            new_width = label_width
-            new_height = int(new_width / target_ratio)
+    def _wake_ui(self) -> None:
+        """
+        Ask the Tk loop to run a tick now (called from the notifier thread).
 
-            if new_height > label_height:
-                new_height = label_height
-                new_width = int(new_height * target_ratio)
+        Only used with threaded Tcl, which hands the event over to the Tk
+        thread instead of touching the interpreter from this one.
+        """
+        if not self.running:
+            return
+        try:
+            self.root.event_generate("<<FramesReady>>", when="tail")
+        except (tk.TclError, RuntimeError) as e:
+            # The window is closing or the main loop is not running; the
+            # tick still picks frames up from the notifier flag
+            self._logger.debug(f"UI wakeup failed: {e}")
+
+    def _on_frames_ready(self, event: Optional[tk.Event] = None) -> None:
+        """Run a tick immediately instead of waiting out the idle backoff."""
+        if not self.running:
+            return
+        if self._tick_after_id is not None:
+            self.root.after_cancel(self._tick_after_id)
+            self._tick_after_id = None
+        self._update_frames()
 
-            new_width = max(1, new_width)
-            new_height = max(1, new_height)
+    def _schedule_tick(self, active: bool) -> None:
+        """
+        Schedule the next UI tick.
 
-            if new_width > frame_width:
-                interpolation = cv2.INTER_LINEAR
+        While frames arrive the tick runs every frame_update_interval; when a
+        tick finds nothing to do the interval doubles up to max_idle_interval
+        and the notifier is armed to wake the loop on the next frame.
 
-            resized = cv2.resize(
-                frame,
-                (new_width, new_height),
-                interpolation=interpolation,
+        Args:
+            active: Whether the last tick had frames or render jobs in flight
+        """
+        if not self.running:
+            return
+        if active:
+            self._tick_interval = UI_SETTINGS.frame_update_interval
+        else:
+            self._tick_interval = min(
+                self._tick_interval * 2, UI_SETTINGS.max_idle_interval
             )
-
-            # Add padding if needed
-            if new_width != label_width or new_height != label_height:
-                top = (label_height - new_height) // 2
-                left = (label_width - new_width) // 2
-                output = np.zeros((label_height, label_width, 3), dtype=np.uint8)
-                output[top : top + new_height, left : left + new_width] = resized
-                return output
-
-            return resized
-
-        except Exception as e:
-            self._logger.error(f"Error resizing frame: {e}", exc_info=True)
-            return None
+            self._frame_notifier.arm()
+        self._tick_after_id = self.root.after(self._tick_interval, self._update_frames)
 
     def _update_frames(self) -> None:
-        """Update video frames for all cameras (called periodically)."""
+        """Update tiles whose cameras published new frames."""
+        self._tick_after_id = None
         try:
             if not self.running:
                 return
 
-            num_labels = len(self._labels)
+            tick_start = time.perf_counter()
+            frames_ready = self._frame_notifier.consume()
+            num_tiles = len(self._tile_seqs)
             num_cameras = len(self.cameras)
 
-            # Recreate labels if mismatch
-            if num_labels != num_cameras:
+            # Recreate tiles if mismatch
+            if num_tiles != num_cameras:
                 self._logger.warning(
-                    f"Label/camera mismatch ({num_labels}/{num_cameras}). Recreating."
+                    f"Tile/camera mismatch ({num_tiles}/{num_cameras}). Recreating."
                 )
                 self._create_video_labels()
-                self.root.after(UI_SETTINGS.frame_update_interval, self._update_frames)
+                self._schedule_tick(active=True)
                 return
 
-            for i in range(num_cameras):
-                camera = self.cameras[i]
-                label = self._labels[i]
+            if self._compositor is not None:
+                updated = self._update_mosaic()
+            else:
+                updated = self._update_labels()
 
-                if not label.winfo_exists():
-                    continue
+            self._tick_timer.record(time.perf_counter() - tick_start, updated)
+            self._report_startup()
+            self._schedule_tick(
+                active=frames_ready or updated > 0 or self._render_pipeline.pending > 0
+            )
 
-                if not isinstance(camera, Camera):
-                    label.config(image="", text=f"Error {i}", fg="red")
-                    continue
+        except Exception as e:
+            self._logger.error(f"Error in frame update loop: {e}", exc_info=True)
+            if self.running:
+                self._tick_after_id = self.root.after(
+                    UI_SETTINGS.frame_update_interval * 10,
+                    self._update_frames,
+                )
 
-                frame = None
-                if camera.connected:
-                    frame = camera.get_frame()
+    def _poll_camera(self, index: int) -> Optional[FramePacket]:
+        """
+        Fetch a new frame for a tile and detect stalled streams.
 
-                if frame is not None:
-                    # Reset empty frame counter on successful frame
-                    self._empty_frame_counts[camera.ip] = 0
+        Only tiles whose camera published past the tile's sequence number
+        are fetched, so idle or slow cameras cost one integer compare.
 
-                    aspect = (
-                        self._aspect_ratios[i]
-                        if 0 <= i < len(self._aspect_ratios)
-                        else "fit"
-                    )
-                    resized = self._resize_frame(frame, label, aspect)
-
-                    if resized is not None:
-                        try:
-                            rgb_frame = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
-                            img = Image.fromarray(rgb_frame)
-                            imgtk = ImageTk.PhotoImage(image=img)
-                            label.config(image=imgtk, text="")
-                            label.image = imgtk  # Keep reference
-                        except Exception as e:
-                            self._logger.error(f"Error displaying frame: {e}")
-                            label.config(image="", text="Display Error", fg="red")
+        Args:
+            index: Tile/camera index
+
+        Returns:
+            A frame newer than the one last shown, or None
+        """
+        camera = self.cameras[index]
+
+        if not isinstance(camera, Camera):
+            self._set_tile_status(index, f"Error {index}", "red")
+            return None
+
+        # Leave the frame in the camera until the tile is free again
+        if self._render_pipeline.is_busy(index):
+            return None
+
+        packet = None
+        if camera.connected and camera.frame_seq != self._tile_seqs[index]:
+            packet = camera.get_latest_frame(after_seq=self._tile_seqs[index])
+
+        if packet is not None:
+            self._tile_seqs[index] = packet.seq
+            if camera not in self._first_frame_times:
+                elapsed = time.monotonic() - self.pool.startup_started
+                self._first_frame_times[camera] = elapsed
+                self._logger.debug(f"First frame from {camera.ip} after {elapsed:.2f}s")
+            return packet
+
+        self._restart_if_stalled(camera)
+        self._show_connection_status(index, camera)
+        return None
+
+    def _restart_if_stalled(self, camera: Camera) -> None:
+        """
+        Restart a connected camera's stream once its newest frame is too old.
+
+        The reader thread handles the restart, so the UI never waits on
+        capture I/O.
+        """
+        if not camera.connected:
+            return
+        frame_age = time.monotonic() - camera.last_frame_time
+        if frame_age > UI_SETTINGS.frame_stall_timeout:
+            self._logger.warning(
+                f"Camera {camera.ip} stopped sending frames ({frame_age:.1f}s)"
+            )
+            if not camera.reconnect():
+                camera.connected = False
+
+    def _show_connection_status(self, index: int, camera: Camera) -> None:
+        """Show a tile's connecting, reconnecting or disconnected status."""
+        camera_id = self.pool.id_of(camera)
+        if camera_id is not None and self.pool.is_pending(camera_id):
+            self._set_tile_status(index, "Connecting...", "yellow")
+        elif not camera.connected:
+            next_attempt = camera.next_reconnect_attempt
+            if next_attempt is not None and next_attempt > time.monotonic():
+                wait = int(next_attempt - time.monotonic()) + 1
+                self._set_tile_status(index, f"Reconnecting in {wait}s", "orange")
+            else:
+                self._set_tile_status(index, "Disconnected", "orange")
+            self._update_treeview_status(index, "Disconnected")
+
+    def _aspect_ratio(self, index: int) -> str:
+        """Return the aspect ratio configured for a tile."""
+        if 0 <= index < len(self._aspect_ratios):
+            return self._aspect_ratios[index]
+        return "fit"
+
+    def _update_labels(self) -> int:
+        """
+        Run one tick of the per-camera label renderer.
+
+        Returns:
+            Number of labels updated
+        """
+        updated = self._apply_prepared_tiles()
+
+        for i in range(len(self._labels)):
+            packet = self._poll_camera(i)
+            if packet is None:
+                continue
+
+            width, height = self._tile_sizes[i]
+            if width <= 1 or height <= 1:
+                continue  # Not laid out yet
+
+            # Reuse the tile's buffers unless its geometry changed
+            surface = self._tile_surfaces[i]
+            if surface is None or surface.size != (width, height):
+                surface = TileSurface.allocate(width, height)
+                self._tile_surfaces[i] = surface
+                self._tile_photos[i] = None
+
+            self._render_pipeline.submit_call(
+                i,
+                packet.seq,
+                surface.draw,
+                packet.frame,
+                self._aspect_ratio(i),
+            )
+
+        # Synchronous preparation finishes immediately; show it this tick
+        if UI_SETTINGS.render_workers <= 0:
+            updated += self._apply_prepared_tiles()
+        return updated
+
+    def _apply_prepared_tiles(self) -> int:
+        """
+        Copy finished tile surfaces into their labels' photo images.
+
+        Returns:
+            Number of labels updated
+        """
+        updated = 0
+        for tile in self._render_pipeline.collect():
+            index = tile.index
+            self._record_render_time(tile)
+            if index >= len(self._labels):
+                continue
+            label = self._labels[index]
+            surface = self._tile_surfaces[index]
+            if not label.winfo_exists() or surface is None:
+                continue
+
+            if tile.error is not None:
+                self._logger.error(f"Error displaying frame: {tile.error}")
+                self._set_tile_status(index, "Display Error", "red")
+            elif not tile.result:
+                self._set_tile_status(index, "Resize Error", "red")
+            else:
+                try:
+                    photo = self._tile_photos[index]
+                    if photo is None:
+                        photo = ImageTk.PhotoImage(image=surface.image)
+                        label.config(image=photo, text="")
+                        label.image = photo  # Keep reference
+                        self._tile_photos[index] = photo
                     else:
-                        label.config(image="", text="Resize Error", fg="red")
-                else:
-                    # Track consecutive empty frames before marking disconnected
-                    empty_count = self._empty_frame_counts.get(camera.ip, 0) + 1
-                    self._empty_frame_counts[camera.ip] = empty_count
+                        photo.paste(surface.image)
+                    self._set_tile_status(index, "")
+                    updated += 1
+                except Exception as e:
+                    self._logger.error(f"Error displaying frame: {e}")
+                    self._set_tile_status(index, "Display Error", "red")
+        return updated
+
+    def _start_metrics_export(self) -> None:
+        """Start the optional metrics endpoint and file dump."""
+        try:
+            if METRICS_SETTINGS.http_port:
+                metrics_registry.start_http_server(
+                    METRICS_SETTINGS.http_port, METRICS_SETTINGS.http_host
+                )
+            if METRICS_SETTINGS.dump_interval > 0:
+                metrics_registry.start_file_dump(
+                    PATHS.metrics_file, METRICS_SETTINGS.dump_interval
+                )
+        except OSError as e:
+            self._logger.error(f"Could not start metrics export: {e}")
 
-                    # Only mark disconnected after 100 consecutive empty frames (~3 seconds)
-                    if camera.connected and empty_count >= 100:
-                        self._logger.warning(f"Camera {camera.ip} stopped sending frames")
-                        camera.connected = False
+    def _record_render_time(self, tile: PreparedTile) -> None:
+        """Add a finished tile job to its camera's render time histogram."""
+        if tile.index < len(self.cameras):
+            camera = self.cameras[tile.index]
+            if isinstance(camera, Camera):
+                camera.metrics.render_seconds.observe(tile.duration)
 
-                    if not camera.connected:
-                        if label.cget("text") != "Disconnected":
-                            label.config(image="", text="Disconnected", fg="orange")
-                        self._update_treeview_status(i, "Disconnected")
+    def _update_mosaic(self) -> int:
+        """
+        Run one tick of the single-canvas mosaic renderer.
 
-            if self.running:
-                self.root.after(UI_SETTINGS.frame_update_interval, self._update_frames)
+        New frames are drawn into the shared buffer on the worker pool; the
+        buffer is pushed to the canvas once every draw of the batch is done.
 
-        except Exception as e:
-            self._logger.error(f"Error in frame update loop: {e}", exc_info=True)
-            if self.running:
-                self.root.after(
-                    UI_SETTINGS.frame_update_interval * 10,
-                    self._update_frames,
+        Returns:
+            Number of tiles updated
+        """
+        compositor = self._compositor
+        canvas = self._canvas
+        if compositor is None or canvas is None or not canvas.winfo_exists():
+            return 0
+
+        updated = self._collect_mosaic_draws()
+
+        # Never push a half-drawn tile or relayout under a running draw
+        if self._render_pipeline.pending:
+            return updated
+
+        if self._mosaic_dirty:
+            self._push_mosaic()
+
+        width, height = self._canvas_size
+        if compositor.configure(width, height, len(self._tile_seqs)):
+            # New buffer: redraw every tile from its latest frame
+            self._tile_seqs = [0] * len(self._tile_seqs)
+            self._mosaic_photo = None
+            self._layout_mosaic_texts()
+            for camera, tile in zip(self.cameras, compositor.tiles):
+                camera.display_area = tile.width * tile.height
+
+        for i in range(len(self._tile_seqs)):
+            if i in self._tiles_to_clear and not self._render_pipeline.is_busy(i):
+                self._tiles_to_clear.discard(i)
+                self._render_pipeline.submit_call(
+                    i, self._tile_seqs[i], compositor.clear_tile, i
                 )
+                continue
+            packet = self._poll_camera(i)
+            if packet is not None:
+                self._render_pipeline.submit_call(
+                    i,
+                    packet.seq,
+                    compositor.draw,
+                    i,
+                    packet.frame,
+                    self._aspect_ratio(i),
+                )
+
+        # Synchronous drawing finishes immediately; show it this tick
+        if UI_SETTINGS.render_workers <= 0:
+            updated += self._collect_mosaic_draws()
+            if self._mosaic_dirty:
+                self._push_mosaic()
+        return updated
+
+    def _collect_mosaic_draws(self) -> int:
+        """
+        Collect finished mosaic tile draws and clears.
+
+        Returns:
+            Number of tiles drawn
+        """
+        drawn = 0
+        for tile in self._render_pipeline.collect():
+            self._record_render_time(tile)
+            if tile.error is not None:
+                self._logger.error(f"Error drawing tile {tile.index}: {tile.error}")
+                self._set_tile_status(tile.index, "Display Error", "red")
+            elif tile.result is None:
+                # clear_tile returns nothing; the black tile still needs a push
+                self._mosaic_dirty = True
+            elif tile.result:
+                self._set_tile_status(tile.index, "")
+                drawn += 1
+        if drawn:
+            self._mosaic_dirty = True
+        return drawn
+
+    def _push_mosaic(self) -> None:
+        """Push the composited buffer to the canvas as a single image."""
+        if self._compositor is None or self._canvas is None:
+            return
+        image = self._compositor.image
+        if image is None:
+            return
+
+        if self._mosaic_photo is None:
+            self._mosaic_photo = ImageTk.PhotoImage(image=image)
+            self._canvas.itemconfig(self._canvas_image_id, image=self._mosaic_photo)
+        else:
+            self._mosaic_photo.paste(image)
+        self._mosaic_dirty = False
 
     def _update_treeview_status(self, index: int, status: str) -> None:
         """Update camera status in the treeview."""
@@ -467,6 +886,7 @@ class CameraApp:
             self._camera_list_window.title("Manage Cameras")
             self._camera_list_window.geometry("800x400")
             center_window(self._camera_list_window)
+            self._bind_visibility_events(self._camera_list_window)
 
             # Buttons
             button_frame = ttk.Frame(self._camera_list_window, padding="5")
@@ -671,9 +1091,9 @@ class CameraApp:
 
             camera = Camera(ip, port, username, password, logger_instance=self._logger)
             if camera.connect(timeout_open=10000):
-                self.cameras.append(camera)
+                self.pool.add(camera)
                 self._populate_camera_list()
-                save_cameras(self.cameras, self._logger)
+                save_cameras(list(self.cameras), self._logger)
                 self._create_video_labels()
                 dialog.destroy()
                 self._logger.info(f"ONVIF camera added: {ip}")
@@ -749,13 +1169,14 @@ class CameraApp:
                 ip, port, user, password, rtsp_url, logger_instance=self._logger
             )
             if camera.connect():
-                self.cameras.append(camera)
+                self.pool.add(camera)
                 self._populate_camera_list()
-                save_cameras(self.cameras, self._logger)
+                save_cameras(list(self.cameras), self._logger)
                 self._create_video_labels()
                 dialog.destroy()
                 self._logger.info(f"RTSP camera added: {rtsp_url}")
             else:
+                camera.disconnect()
                 messagebox.showerror(
                     "Error",
                     f"Failed to connect to RTSP:\n{rtsp_url}",
@@ -852,7 +1273,7 @@ class CameraApp:
 
                 if camera.connect(timeout_open=10000):
                     self._populate_camera_list()
-                    save_cameras(self.cameras, self._logger)
+                    save_cameras(list(self.cameras), self._logger)
                     self._create_video_labels()
                     dialog.destroy()
                 else:
@@ -903,10 +1324,11 @@ class CameraApp:
 
                 if camera.connect():
                     self._populate_camera_list()
-                    save_cameras(self.cameras, self._logger)
+                    save_cameras(list(self.cameras), self._logger)
                     self._create_video_labels()
                     dialog.destroy()
                 else:
+                    camera.disconnect()
                     messagebox.showerror(
                         "Error",
                         f"Failed to reconnect:\n{rtsp_url}",
@@ -957,10 +1379,11 @@ class CameraApp:
             f"Remove camera {camera.ip}?",
             parent=self._camera_list_window,
         ):
-            camera.disconnect()
-            del self.cameras[index]
+            camera_id = self.pool.id_of(camera)
+            if camera_id is not None:
+                self.pool.remove(camera_id)
             self._camera_treeview.delete(selected[0])
-            save_cameras(self.cameras, self._logger)
+            save_cameras(list(self.cameras), self._logger)
             self._create_video_labels()
             self._logger.info(f"Camera {camera.ip} removed")
 
@@ -1099,10 +1522,82 @@ class CameraApp:
 
     # ==================== Network Scanner ====================
 
+    @staticmethod
+    def _call_in_dialog(
+        dialog: tk.Toplevel, closed: threading.Event, callback: Callable[[], object]
+    ) -> bool:
+        """
+        Schedule a callback on the Tk thread from a dialog's worker thread.
+
+        Args:
+            dialog: Dialog the callback updates
+            closed: Event set when the dialog is closed
+            callback: Function to run on the Tk thread
+
+        Returns:
+            False (and nothing is scheduled) once the dialog is gone
+        """
+
+        def run() -> None:
+            if closed.is_set():
+                return  # Closed after the callback was scheduled
+            try:
+                callback()
+            except tk.TclError:
+                pass  # Dialog destroyed before the callback ran
+
+        if closed.is_set():
+            return False
+        try:
+            if not dialog.winfo_exists():
+                return False
+            dialog.after(0, run)
+            return True
+        except (tk.TclError, RuntimeError):
+            return False
+
+    @staticmethod
+    def _stream_scan(
+        scans: Generator[DiscoveredCamera, None, None],
+        show: Callable[[DiscoveredCamera], bool],
+    ) -> None:
+        """
+        Hand each camera from a running scan to ``show`` (scan thread side).
+
+        Args:
+            scans: NetworkScanner.iter_scan() generator
+            show: Schedules a camera for display; False once the dialog is gone
+        """
+        try:
+            for cam in scans:
+                if not show(cam):
+                    break
+        finally:
+            # Stops the scan when the dialog was closed mid-scan
+            scans.close()
+
+    @staticmethod
+    def _show_scan_result(
+        tree: ttk.Treeview, rows: dict[str, str], cam: DiscoveredCamera
+    ) -> None:
+        """
+        Add a scanned camera to the results tree or update its row.
+
+        Args:
+            tree: Results tree of the scan dialog
+            rows: Tree item IDs by camera IP
+            cam: Camera snapshot from the scan
+        """
+        ports_str = ", ".join(str(p) for p in cam.ports[:4])
+        rtsp_url = cam.get_suggested_rtsp_url()
+        values = (cam.ip, ports_str, cam.manufacturer, rtsp_url)
+        if cam.ip in rows:
+            tree.item(rows[cam.ip], values=values)
+        else:
+            rows[cam.ip] = tree.insert("", tk.END, values=values)
+
     def _open_network_scan_dialog(self) -> None:
         """Open network scan dialog to find cameras."""
-        import threading
-
         parent = self._camera_list_window or self.root
         dialog = tk.Toplevel(parent)
         dialog.title("Scan Network for Cameras")
@@ -1153,71 +1648,71 @@ class CameraApp:
         status_label = ttk.Label(progress_frame, text="Ready to scan")
         status_label.pack(anchor=tk.W)
 
-        # Store discovered cameras
-        discovered: list[DiscoveredCamera] = []
+        # Store discovered cameras by IP with their result rows
+        discovered: dict[str, DiscoveredCamera] = {}
+        rows: dict[str, str] = {}
         scanner: Optional[NetworkScanner] = None
         scan_thread: Optional[threading.Thread] = None
+        # Set when the dialog closes; the scan thread then stops scheduling
+        # UI updates and closes its scan
+        closed = threading.Event()
 
         def update_progress(current: int, total: int, message: str) -> None:
-            """Update progress from scanner (called from thread)."""
-            try:
-                if total > 0:
-                    pct = (current / total) * 100
-                    progress_var.set(pct)
-                status_label.config(text=message)
-                dialog.update_idletasks()
-            except Exception:
-                pass
+            """Update progress from scanner (scheduled on the Tk thread)."""
+            if total > 0:
+                pct = (current / total) * 100
+                progress_var.set(pct)
+            status_label.config(text=message)
+            dialog.update_idletasks()
+
+        def schedule(callback: Callable[[], object]) -> bool:
+            """Run a callback on the Tk thread; False once the dialog is gone."""
+            return self._call_in_dialog(dialog, closed, callback)
 
         def run_scan() -> None:
             """Run scan in background thread."""
-            nonlocal discovered, scanner
+            nonlocal scanner
 
             try:
                 scanner = NetworkScanner(
                     timeout=1.0,
                     max_workers=100,
-                    progress_callback=lambda c, t, m: dialog.after(
-                        0, lambda: update_progress(c, t, m)
+                    progress_callback=lambda c, t, m: schedule(
+                        lambda: update_progress(c, t, m)
                     ),
                 )
 
                 ip_range = ip_entry.get().strip()
                 include_onvif = onvif_var.get()
 
-                discovered = scanner.full_scan(
-                    ip_range=ip_range,
-                    include_onvif=include_onvif,
+                # Show each camera (and each update to it) as it is found
+                self._stream_scan(
+                    scanner.iter_scan(ip_range=ip_range, include_onvif=include_onvif),
+                    lambda cam: schedule(partial(show_camera, cam)),
                 )
 
                 # Update UI in main thread
-                dialog.after(0, display_results)
+                schedule(finish_scan)
 
             except Exception as e:
-                dialog.after(
-                    0,
-                    lambda: messagebox.showerror("Scan Error", str(e), parent=dialog),
+                error = str(e)
+                schedule(
+                    lambda: messagebox.showerror("Scan Error", error, parent=dialog)
                 )
             finally:
-                dialog.after(0, lambda: scan_btn.config(state=tk.NORMAL))
-                dialog.after(0, lambda: stop_btn.config(state=tk.DISABLED))
-
-        def display_results() -> None:
-            """Display scan results in treeview."""
-            # Clear previous results
-            for item in results_tree.get_children():
-                results_tree.delete(item)
-
-            for cam in discovered:
-                ports_str = ", ".join(str(p) for p in cam.ports[:4])
-                rtsp_url = cam.get_suggested_rtsp_url()
-                results_tree.insert(
-                    "",
-                    tk.END,
-                    values=(cam.ip, ports_str, cam.manufacturer, rtsp_url),
-                )
-
-            status_label.config(text=f"Scan complete: {len(discovered)} camera(s) found")
+                schedule(lambda: scan_btn.config(state=tk.NORMAL))
+                schedule(lambda: stop_btn.config(state=tk.DISABLED))
+
+        def show_camera(cam: DiscoveredCamera) -> None:
+            """Add a camera to the treeview or update its row."""
+            discovered[cam.ip] = cam
+            self._show_scan_result(results_tree, rows, cam)
+
+        def finish_scan() -> None:
+            """Show the scan summary."""
+            status_label.config(
+                text=f"Scan complete: {len(discovered)} camera(s) found"
+            )
             progress_var.set(100)
 
         def start_scan() -> None:
@@ -1228,6 +1723,11 @@ class CameraApp:
             stop_btn.config(state=tk.NORMAL)
             progress_var.set(0)
 
+            # Clear previous results
+            results_tree.delete(*results_tree.get_children())
+            discovered.clear()
+            rows.clear()
+
             scan_thread = threading.Thread(target=run_scan, daemon=True)
             scan_thread.start()
 
@@ -1238,6 +1738,12 @@ class CameraApp:
             stop_btn.config(state=tk.DISABLED)
             status_label.config(text="Stopping scan...")
 
+        def close_dialog() -> None:
+            """Stop any running scan and close the dialog."""
+            closed.set()
+            stop_scan()
+            dialog.destroy()
+
         def add_selected() -> None:
             """Add selected camera to the app."""
             selected = results_tree.selection()
@@ -1253,7 +1759,7 @@ class CameraApp:
             rtsp_url = values[3] if len(values) > 3 else ""
 
             # Find the discovered camera
-            cam_data = next((c for c in discovered if c.ip == ip), None)
+            cam_data = discovered.get(str(ip))
             if not cam_data:
                 return
 
@@ -1274,9 +1780,10 @@ class CameraApp:
             side=tk.LEFT, padx=2
         )
 
-        ttk.Button(btn_frame, text="Close", command=dialog.destroy).pack(
+        ttk.Button(btn_frame, text="Close", command=close_dialog).pack(
             side=tk.RIGHT, padx=2
         )
+        dialog.protocol("WM_DELETE_WINDOW", close_dialog)
 
         # Results - pack after buttons so it fills remaining space
         results_frame = ttk.LabelFrame(main_frame, text="Found Cameras", padding="10")
@@ -1373,9 +1880,9 @@ class CameraApp:
             )
 
             if camera.connect():
-                self.cameras.append(camera)
+                self.pool.add(camera)
                 self._populate_camera_list()
-                save_cameras(self.cameras, self._logger)
+                save_cameras(list(self.cameras), self._logger)
                 self._create_video_labels()
                 dialog.destroy()
                 self._logger.info(f"Camera added: {cam_data.ip}")
@@ -1385,6 +1892,7 @@ class CameraApp:
                     parent=parent,
                 )
             else:
+                camera.disconnect()
                 messagebox.showerror(
                     "Error",
                     f"Failed to connect to {cam_data.ip}\n\nTry different credentials or RTSP URL.",
@@ -1404,6 +1912,76 @@ class CameraApp:
 
         user_entry.focus_set()
 
+    # ==================== Tile Visibility ====================
+
+    def _bind_visibility_events(self, window: tk.Misc) -> None:
+        """Recompute tile visibility when a window is moved, shown or hidden."""
+        for sequence in ("<Map>", "<Unmap>", "<Configure>", "<FocusIn>", "<Destroy>"):
+            window.bind(sequence, self._schedule_visibility_update, add="+")
+
+    def _schedule_visibility_update(self, event: Optional[tk.Event] = None) -> None:
+        """Run _update_visibility() once the current burst of events is handled."""
+        if self._visibility_after_id is None and self.running:
+            self._visibility_after_id = self.root.after_idle(self._update_visibility)
+
+    def _update_visibility(self) -> None:
+        """
+        Tell each camera whether its tile can be seen.
+
+        Every tile is hidden while the main window is minimized, and a tile
+        is hidden while the camera manager lies on top of all of it. Hidden
+        cameras keep their stream open but stop decoding (see
+        Camera.visible), and resume as soon as their tile shows again.
+        """
+        self._visibility_after_id = None
+        try:
+            if not self.running or not self.root.winfo_exists():
+                return
+            minimized = self.root.state() in ("iconic", "withdrawn")
+            cover = None if minimized else self._camera_manager_rect()
+            for i, camera in enumerate(self.cameras):
+                if not isinstance(camera, Camera):
+                    continue
+                covered = False
+                if cover is not None:
+                    tile = self._tile_screen_rect(i)
+                    covered = tile is not None and (
+                        cover[0] <= tile[0]
+                        and cover[1] <= tile[1]
+                        and cover[2] >= tile[2]
+                        and cover[3] >= tile[3]
+                    )
+                camera.visible = not (minimized or covered)
+        except Exception as e:
+            self._logger.error(f"Error updating tile visibility: {e}")
+
+    def _camera_manager_rect(self) -> Optional[tuple[int, int, int, int]]:
+        """Return the screen area of the camera manager if it is above the grid."""
+        window = self._camera_list_window
+        if window is None or not window.winfo_exists() or not window.winfo_viewable():
+            return None
+        above = self.root.tk.call("wm", "stackorder", window, "isabove", self.root)
+        if not self.root.tk.getboolean(above):
+            return None
+        x, y = window.winfo_rootx(), window.winfo_rooty()
+        return (x, y, x + window.winfo_width(), y + window.winfo_height())
+
+    def _tile_screen_rect(self, index: int) -> Optional[tuple[int, int, int, int]]:
+        """Return the screen area of a tile (None before it is laid out)."""
+        if self._canvas is not None and self._compositor is not None:
+            tiles = self._compositor.tiles
+            if index >= len(tiles):
+                return None
+            tile = tiles[index]
+            x = self._canvas.winfo_rootx() + tile.x
+            y = self._canvas.winfo_rooty() + tile.y
+            return (x, y, x + tile.width, y + tile.height)
+        if index < len(self._labels):
+            label = self._labels[index]
+            x, y = label.winfo_rootx(), label.winfo_rooty()
+            return (x, y, x + label.winfo_width(), y + label.winfo_height())
+        return None
+
     # ==================== Window Controls ====================
 
     def _minimize(self) -> None:
@@ -1419,15 +1997,18 @@ class CameraApp:
         try:
             self._logger.info("Closing application...")
             self.running = False
+            self._frame_notifier.stop()
+            if self._tick_after_id is not None:
+                try:
+                    self.root.after_cancel(self._tick_after_id)
+                except Exception:
+                    pass
+                self._tick_after_id = None
+            self._render_pipeline.shutdown()
+            metrics_registry.stop()
 
             # Disconnect cameras
-            self._logger.info("Disconnecting cameras...")
-            for i, cam in enumerate(self.cameras):
-                if isinstance(cam, Camera):
-                    try:
-                        cam.disconnect()
-                    except Exception as e:
-                        self._logger.error(f"Error disconnecting camera {i}: {e}")
+            self.pool.stop()
 
             # Close camera manager
             if self._camera_list_window and self._camera_list_window.winfo_exists():
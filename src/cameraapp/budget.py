@@ -0,0 +1,351 @@
+"""
+Decode budget module for CameraApp.
+
+Cameras decode independently, so nothing stops thirty streams from using
+more CPU than the machine has and starving the UI thread. The DecodeBudget
+looks at all of them together: it measures each camera's source frame rate
+and CPU cost, gives the cameras that matter most (by priority, tile
+visibility and tile size) the largest share of a fixed CPU budget, and
+caps every camera's decode rate accordingly. It rebalances periodically
+and whenever cameras come and go, so adding a camera beyond capacity lowers
+the rates of low-priority streams instead of overloading the process.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from cameraapp.camera import Camera, CameraState
+from cameraapp.config import CAMERA_SETTINGS, LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# Used until a camera's frame rate and decode cost have been measured
+ASSUMED_SOURCE_FPS = 25.0
+ASSUMED_PIXELS = 1920 * 1080
+ASSUMED_COST_PER_PIXEL = 2e-9  # seconds
+
+# Weight of the newest measurement in the running averages
+SMOOTHING = 0.5
+
+# Smallest tile weight, so tiny tiles are slowed down but never starved
+MIN_SIZE_WEIGHT = 0.25
+
+
+@dataclass
+class DecodeEstimate:
+    """
+    Measured decode behaviour of one camera.
+
+    Attributes:
+        source_fps: Frames per second the stream delivers (None if unknown)
+        grab_cost: CPU seconds per grabbed frame (None if unknown)
+        cost: Seconds per retrieved frame (None if unknown)
+        time: time.monotonic() of the counters below
+        grabbed: frames_grabbed at that time
+        decoded: frames_decoded at that time
+        grab_seconds: Total grab CPU time at that time
+        decode_seconds: Total retrieve time at that time
+    """
+
+    source_fps: Optional[float] = None
+    grab_cost: Optional[float] = None
+    cost: Optional[float] = None
+    time: float = 0.0
+    grabbed: int = 0
+    decoded: int = 0
+    grab_seconds: float = 0.0
+    decode_seconds: float = 0.0
+
+
+def _assumed_cost(camera: Camera) -> float:
+    """Return the per-frame cost assumed for a camera not measured yet."""
+    metrics = camera.metrics
+    pixels = metrics.stream_width * metrics.stream_height or ASSUMED_PIXELS
+    return float(pixels * ASSUMED_COST_PER_PIXEL)
+
+
+def _smooth(previous: Optional[float], value: float) -> float:
+    """Blend a new measurement into a running average."""
+    if previous is None:
+        return value
+    return previous + SMOOTHING * (value - previous)
+
+
+class DecodeBudget:
+    """
+    Shares a CPU budget for decoding between cameras.
+
+    What the budget limits is the rate at which grabbed frames are
+    retrieved: converted to BGR, (for capture workers) copied out of shared
+    memory, and handed to consumers. Every frame is still grabbed, in both
+    capture engines, to keep the stream live, and grab is where FFmpeg
+    decodes the compressed stream; that cost (source fps times the measured
+    CPU time per grab) cannot be lowered, so it is reserved out of the
+    budget first.
+
+    Every camera that is connecting or connected gets a demand (its source
+    frame rate, capped by its own decode_fps; hidden cameras only ask for
+    CameraSettings.hidden_decode_fps) and a weight (higher for lower
+    priority values and larger tiles). Each camera first gets ``min_fps``,
+    then the rest of the budget is split in proportion to the weights,
+    with whatever a satisfied camera does not need going to the others.
+    The result is applied through Camera.budget_fps; cameras whose whole
+    demand fits are left unlimited.
+    """
+
+    def __init__(
+        self,
+        cores: float = CAMERA_SETTINGS.decode_budget_cores,
+        min_fps: float = CAMERA_SETTINGS.decode_budget_min_fps,
+        interval: float = CAMERA_SETTINGS.decode_budget_interval,
+        logger_instance: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Initialize the budget.
+
+        Args:
+            cores: CPU cores decoding may use (0 = half of the machine's
+                cores, negative disables the budget)
+            min_fps: Decode rate every visible camera keeps when over budget
+            interval: Seconds between rebalances
+            logger_instance: Optional logger instance
+        """
+        if cores == 0:
+            cores = (os.cpu_count() or 1) / 2
+        self.capacity = cores  # Seconds of decoding per second
+        self.min_fps = max(0.0, min_fps)
+        self.interval = interval
+        self._logger = logger_instance or logger
+        self._lock = threading.Lock()
+        self._estimates: dict[Camera, DecodeEstimate] = {}
+        self._wake = threading.Event()
+        self._stop: Optional[threading.Event] = None
+        self._over_budget = False
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether decode rates are being limited."""
+        return self.capacity > 0
+
+    def estimate(self, camera: Camera) -> Optional[DecodeEstimate]:
+        """Return the latest measurements of a camera (None if not seen yet)."""
+        return self._estimates.get(camera)
+
+    def start(self, cameras: Callable[[], Sequence[Camera]]) -> None:
+        """
+        Rebalance in a background thread until stop() is called.
+
+        Args:
+            cameras: Returns the cameras to share the budget between
+        """
+        if not self.enabled or self._stop is not None:
+            return
+        stop = threading.Event()
+        self._stop = stop
+
+        def run() -> None:
+            while not stop.is_set():
+                try:
+                    self.rebalance(cameras())
+                except Exception as e:
+                    self._logger.error(f"Decode budget error: {e}", exc_info=True)
+                self._wake.wait(self.interval)
+                self._wake.clear()
+
+        threading.Thread(target=run, name="DecodeBudget", daemon=True).start()
+        self._logger.info(
+            f"Decode budget: {self.capacity:g} cores, at least "
+            f"{self.min_fps:g} fps per camera"
+        )
+
+    def stop(self) -> None:
+        """Stop the background rebalancing."""
+        if self._stop is not None:
+            self._stop.set()
+            self._wake.set()
+            self._stop = None
+
+    def request_rebalance(self) -> None:
+        """Rebalance as soon as possible instead of at the next interval."""
+        self._wake.set()
+
+    def forget(self, camera: Camera) -> None:
+        """Drop a camera's measurements and lift its decode limit."""
+        with self._lock:
+            self._estimates.pop(camera, None)
+        camera.budget_fps = 0.0
+
+    def rebalance(
+        self, cameras: Sequence[Camera], now: Optional[float] = None
+    ) -> dict[Camera, float]:
+        """
+        Measure the cameras and assign their decode rates.
+
+        Args:
+            cameras: Cameras sharing the budget
+            now: time.monotonic() of the measurement (defaults to now)
+
+        Returns:
+            Mapping of each camera to its assigned rate limit (0 = unlimited)
+        """
+        if now is None:
+            now = time.monotonic()
+
+        demands: list[tuple[Camera, float, float, float]] = []
+        limits: dict[Camera, float] = {}
+        grabbing = 0.0  # CPU seconds per second spent grabbing
+        with self._lock:
+            areas = [camera.display_area for camera in cameras if camera.visible]
+            largest_area = max(areas, default=0)
+            for camera in cameras:
+                estimate = self._measure(camera, now)
+                limits[camera] = 0.0
+                if camera.state not in (CameraState.CONNECTING, CameraState.CONNECTED):
+                    continue
+                # Every frame is grabbed whatever the camera's decode rate
+                grabbing += self._grab_load(camera, estimate)
+                demand = self._demand(camera, estimate)
+                if demand <= 0:
+                    continue
+                demands.append(
+                    (
+                        camera,
+                        demand,
+                        self._cost(camera, estimate),
+                        self._weight(camera, largest_area),
+                    )
+                )
+
+        wanted = grabbing + sum(demand * cost for _, demand, cost, _ in demands)
+        rates = self._allocate(demands, self.capacity - grabbing)
+        for camera, demand, _, _ in demands:
+            rate = rates[camera]
+            # A camera whose whole demand fits is not held back at all
+            limits[camera] = 0.0 if rate >= demand * 0.999 else rate
+
+        over_budget = wanted > self.capacity
+        if over_budget and not self._over_budget:
+            self._logger.warning(
+                f"Decoding {len(demands)} cameras needs {wanted:.2f} cores "
+                f"({grabbing:.2f} for grabbing), budget is {self.capacity:g}; "
+                "lowering low-priority decode rates"
+            )
+        elif self._over_budget and not over_budget:
+            self._logger.info("Decoding is back within budget")
+        self._over_budget = over_budget
+
+        for camera, limit in limits.items():
+            camera.budget_fps = limit
+        self._logger.debug(
+            "Decode budget: "
+            + ", ".join(
+                f"{camera.ip}={limit:.1f}" for camera, limit in limits.items() if limit
+            )
+        )
+        return limits
+
+    def _measure(self, camera: Camera, now: float) -> DecodeEstimate:
+        """Update a camera's frame rate and cost from its metrics (locked)."""
+        metrics = camera.metrics
+        estimate = self._estimates.get(camera)
+        if estimate is None:
+            estimate = self._estimates[camera] = DecodeEstimate()
+        else:
+            elapsed = now - estimate.time
+            grabbed = metrics.frames_grabbed - estimate.grabbed
+            decoded = metrics.frames_decoded - estimate.decoded
+            grab_seconds = metrics.grab_seconds.sum - estimate.grab_seconds
+            decode_seconds = metrics.decode_seconds.sum - estimate.decode_seconds
+            if elapsed > 0 and grabbed > 0:
+                estimate.source_fps = _smooth(estimate.source_fps, grabbed / elapsed)
+                estimate.grab_cost = _smooth(estimate.grab_cost, grab_seconds / grabbed)
+            if decoded > 0 and decode_seconds > 0:
+                estimate.cost = _smooth(estimate.cost, decode_seconds / decoded)
+
+        estimate.time = now
+        estimate.grabbed = metrics.frames_grabbed
+        estimate.decoded = metrics.frames_decoded
+        estimate.grab_seconds = metrics.grab_seconds.sum
+        estimate.decode_seconds = metrics.decode_seconds.sum
+        return estimate
+
+    def _demand(self, camera: Camera, estimate: DecodeEstimate) -> float:
+        """Return the decode rate a camera would use if unlimited."""
+        if not camera.visible:
+            return max(0.0, float(CAMERA_SETTINGS.hidden_decode_fps))
+        demand = estimate.source_fps or ASSUMED_SOURCE_FPS
+        if camera.decode_fps > 0:
+            demand = min(demand, camera.decode_fps)
+        return demand
+
+    @staticmethod
+    def _cost(camera: Camera, estimate: DecodeEstimate) -> float:
+        """Return the seconds retrieving one frame of a camera takes."""
+        if estimate.cost is not None:
+            return estimate.cost
+        return _assumed_cost(camera)
+
+    @staticmethod
+    def _grab_load(camera: Camera, estimate: DecodeEstimate) -> float:
+        """Return the CPU seconds per second a camera spends grabbing."""
+        source_fps = estimate.source_fps or ASSUMED_SOURCE_FPS
+        if estimate.grab_cost is not None:
+            return source_fps * estimate.grab_cost
+        return source_fps * _assumed_cost(camera)
+
+    @staticmethod
+    def _weight(camera: Camera, largest_area: int) -> float:
+        """Return a camera's share weight from its priority and tile size."""
+        weight = 1.0 / (1 + max(0, int(camera.priority)))
+        if camera.visible and largest_area > 0 and camera.display_area > 0:
+            size = math.sqrt(camera.display_area / largest_area)
+            weight *= max(MIN_SIZE_WEIGHT, size)
+        return weight
+
+    def _allocate(
+        self, demands: list[tuple[Camera, float, float, float]], capacity: float
+    ) -> dict[Camera, float]:
+        """
+        Split the budget by weighted max-min fairness.
+
+        Args:
+            demands: (camera, demand in fps, seconds per frame, weight)
+            capacity: CPU seconds per second left for retrieving frames
+
+        Returns:
+            Mapping of each camera to its decode rate in fps
+        """
+        rates = {camera: min(self.min_fps, demand) for camera, demand, _, _ in demands}
+        remaining = capacity - sum(
+            rates[camera] * cost for camera, _, cost, _ in demands
+        )
+        # CPU seconds per second each camera still wants beyond its floor
+        wanting = {
+            camera: ((demand - rates[camera]) * cost, cost, weight)
+            for camera, demand, cost, weight in demands
+            if demand > rates[camera]
+        }
+        while wanting and remaining > 1e-9:
+            share = remaining / sum(weight for _, _, weight in wanting.values())
+            satisfied = [
+                camera
+                for camera, (need, _, weight) in wanting.items()
+                if need <= share * weight
+            ]
+            if not satisfied:
+                for camera, (_, cost, weight) in wanting.items():
+                    rates[camera] += share * weight / cost
+                break
+            for camera in satisfied:
+                need, cost, _ = wanting.pop(camera)
+                rates[camera] += need / cost
+                remaining -= need
+        return rates
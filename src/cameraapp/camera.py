@@ -10,27 +10,42 @@ import logging
 import queue
 import threading
 import time
+from collections import deque
+from dataclasses import dataclass, replace
 from enum import Enum, auto
-from typing import Optional
+from typing import Any, Callable, Optional, Union
 
 import cv2
 import numpy as np
 from numpy.typing import NDArray
 
 from cameraapp.config import CAMERA_SETTINGS, LOGGER_NAME
-
-# Try to import ONVIFCamera
-try:
-    from onvif import ONVIFCamera
-
-    ONVIF_AVAILABLE = True
-except ImportError:
-    ONVIFCamera = None
-    ONVIF_AVAILABLE = False
-
+from cameraapp.connection_cache import ConnectionProfile, connection_cache
+from cameraapp.frames import (
+    DropPolicy,
+    FramePacket,
+    FrameSubscription,
+    LatestFrameSlot,
+)
+from cameraapp.metrics import metrics_registry
+from cameraapp.onvif_client import ONVIF_AVAILABLE, OnvifDevice, onvif_clients
+from cameraapp.process_capture import ProcessCapture
+from cameraapp.reconnect import reconnect_scheduler
+from cameraapp.timeline import (
+    PHASE_ADMISSION,
+    PHASE_BACKOFF,
+    PHASE_FIRST_FRAME,
+    PHASE_ONVIF,
+    PHASE_OPEN,
+    ConnectTimeline,
+)
 
 logger = logging.getLogger(LOGGER_NAME)
 
+# A stream handle owned by a reader thread: an OpenCV capture for the thread
+# engine, or a handle on a capture worker for the process engine
+Capture = Union[cv2.VideoCapture, ProcessCapture]
+
 
 class CameraType(Enum):
     """Camera connection type enumeration."""
@@ -48,6 +63,73 @@ class CameraState(Enum):
     ERROR = auto()
 
 
+class ReaderCommand(Enum):
+    """Control messages for a camera's reader thread."""
+
+    STOP = auto()
+    RECONNECT = auto()
+
+
+class _ReaderControl:
+    """Control channel between a Camera and one of its reader threads."""
+
+    def __init__(self) -> None:
+        """Initialize an empty channel."""
+        self._commands: queue.SimpleQueue[ReaderCommand] = queue.SimpleQueue()
+        self.stopped = threading.Event()
+        self.opened = threading.Event()  # Set after the first open attempt
+        self.open_ok = False
+
+    def send(self, command: ReaderCommand) -> None:
+        """Queue a command for the reader."""
+        self._commands.put(command)
+
+    def stop(self) -> None:
+        """Tell the reader to exit."""
+        self.stopped.set()
+        self._commands.put(ReaderCommand.STOP)
+
+    def poll(self) -> Optional[ReaderCommand]:
+        """Return the next queued command without blocking."""
+        try:
+            return self._commands.get_nowait()
+        except queue.Empty:
+            return None
+
+    def wait(self, timeout: float) -> Optional[ReaderCommand]:
+        """Wait up to ``timeout`` seconds for a command."""
+        try:
+            return self._commands.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+@dataclass
+class _ReaderState:
+    """
+    State of one reader thread's read loop.
+
+    Attributes:
+        timeout_open: OpenCV open timeout in milliseconds
+        timeout_read: OpenCV read timeout in milliseconds
+        cap: The open capture (None while disconnected)
+        failures: Failed reads in a row
+        last_decode: time.monotonic() of the last retrieve
+        last_publish: Timestamp of the last published frame
+        pending: Connect attempt still waiting for its first frame
+        opened_at: time.monotonic() when that attempt opened the stream
+    """
+
+    timeout_open: int
+    timeout_read: int
+    cap: Optional[Capture] = None
+    failures: int = 0
+    last_decode: float = 0.0
+    last_publish: float = 0.0
+    pending: Optional[ConnectTimeline] = None
+    opened_at: float = 0.0
+
+
 class Camera:
     """
     Represents an IP camera with RTSP/ONVIF support.
@@ -62,6 +144,8 @@ class Camera:
         password: Authentication password
         rtsp_url: Direct RTSP URL (optional)
         camera_type: Type of camera connection (RTSP or ONVIF)
+        decode_fps: Target decode rate in frames per second (0 = every frame)
+        priority: Startup order (lower values connect first)
         connected: Whether the camera is currently connected
     """
 
@@ -74,6 +158,8 @@ class Camera:
         rtsp_url: str = "",
         camera_type: str = "RTSP",
         logger_instance: Optional[logging.Logger] = None,
+        decode_fps: Optional[float] = None,
+        priority: int = 0,
     ) -> None:
         """
         Initialize a Camera instance.
@@ -86,13 +172,23 @@ class Camera:
             rtsp_url: Direct RTSP URL (optional)
             camera_type: Type of camera ("RTSP" or "ONVIF")
             logger_instance: Optional logger instance
+            decode_fps: Target decode rate (None uses the global setting)
+            priority: Startup order (lower values connect first)
         """
         self.ip = ip
         self.port = port
         self.username = username
         self.password = password
         self.rtsp_url = rtsp_url
+        self.priority = priority
         self._logger = logger_instance or logger
+        self._decode_fps = 0.0
+        self._budget_fps = 0.0
+        self._visible = True
+        self.display_area = 0  # Pixels of the tile showing it (0 = unknown)
+        self.decode_fps = (
+            CAMERA_SETTINGS.target_decode_fps if decode_fps is None else decode_fps
+        )
 
         # Determine camera type
         self.camera_type = self._determine_camera_type(camera_type, rtsp_url)
@@ -103,18 +199,26 @@ class Camera:
         )
 
         # Connection state
-        self._onvif_cam: Optional[ONVIFCamera] = None
-        self._cap: Optional[cv2.VideoCapture] = None
+        self._onvif_cam: Optional[OnvifDevice] = None
+        self._onvif_profile_token = ""
         self._connected = False
         self._state = CameraState.DISCONNECTED
 
         # Threading components
-        self._frame_queue: queue.Queue[NDArray[np.uint8]] = queue.Queue(
-            maxsize=CAMERA_SETTINGS.frame_queue_size
-        )
-        self._stop_event = threading.Event()
+        self._frame_slot: LatestFrameSlot = LatestFrameSlot()
+        self._last_read_seq = 0
+        self._connected_at = 0.0
+        self._last_grab_at = 0.0
+        self._frame_listeners: list[Callable[[FramePacket], None]] = []
+        self._state_listeners: list[Callable[[Camera, CameraState], None]] = []
+        self._control: Optional[_ReaderControl] = None
         self._thread: Optional[threading.Thread] = None
-        self._lock = threading.Lock()
+
+        # Runtime metrics (see metrics.py) and recent connect attempts
+        self.metrics = metrics_registry.register(self, f"{ip}:{port}")
+        self._timelines: deque[ConnectTimeline] = deque(
+            maxlen=CAMERA_SETTINGS.connect_history
+        )
 
     def _determine_camera_type(self, camera_type: str, rtsp_url: str) -> str:
         """Determine the actual camera type based on inputs."""
@@ -139,14 +243,203 @@ class Camera:
     def connected(self, value: bool) -> None:
         """Set the connected state."""
         self._connected = value
-        self._state = CameraState.CONNECTED if value else CameraState.DISCONNECTED
+        self._set_state(CameraState.CONNECTED if value else CameraState.DISCONNECTED)
+
+    @property
+    def connect_timelines(self) -> list[ConnectTimeline]:
+        """Return the most recent finished connect attempts, oldest first."""
+        return list(self._timelines)
+
+    @property
+    def last_connect_timeline(self) -> Optional[ConnectTimeline]:
+        """Return the most recent finished connect attempt (or None)."""
+        timelines = self._timelines
+        return timelines[-1] if timelines else None
+
+    @property
+    def next_reconnect_attempt(self) -> Optional[float]:
+        """Return time.monotonic() of the next scheduled reconnect (or None)."""
+        next_attempt: Optional[float] = reconnect_scheduler.next_attempt(self)
+        return next_attempt
 
     @property
     def state(self) -> CameraState:
         """Return the current camera state."""
         return self._state
 
-    def get_rtsp_url_from_onvif(self, timeout: int = 10) -> Optional[str]:
+    @property
+    def decode_fps(self) -> float:
+        """Return the target decode rate in frames per second (0 = unlimited)."""
+        return self._decode_fps
+
+    @decode_fps.setter
+    def decode_fps(self, value: float) -> None:
+        """Set the target decode rate; takes effect on the next frame."""
+        self._decode_fps = max(0.0, float(value))
+
+    @property
+    def budget_fps(self) -> float:
+        """Return the decode rate limit set by the decode budget (0 = none)."""
+        return self._budget_fps
+
+    @budget_fps.setter
+    def budget_fps(self, value: float) -> None:
+        """Set the decode budget's rate limit; takes effect on the next frame."""
+        self._budget_fps = max(0.0, float(value))
+
+    @property
+    def effective_decode_fps(self) -> float:
+        """Return the lower of decode_fps and budget_fps (0 = unlimited)."""
+        rates = [rate for rate in (self._decode_fps, self._budget_fps) if rate > 0]
+        return min(rates, default=0.0)
+
+    @property
+    def visible(self) -> bool:
+        """Return whether a viewer is showing this camera."""
+        return self._visible
+
+    @visible.setter
+    def visible(self, value: bool) -> None:
+        """
+        Show or hide the camera; takes effect on the next frame.
+
+        A hidden camera keeps grabbing so the stream session stays open,
+        but decodes at CameraSettings.hidden_decode_fps (0 = not at all).
+        Showing it again decodes the next frame that arrives.
+        """
+        value = bool(value)
+        if value == self._visible:
+            return
+        self._visible = value
+        self._logger.debug(
+            f"Camera {self.ip} {'shown' if value else 'hidden'}: decoding "
+            f"{'resumed' if value else 'throttled'}"
+        )
+
+    @property
+    def frame_seq(self) -> int:
+        """Return the sequence number of the latest captured frame (0 if none)."""
+        seq: int = self._frame_slot.seq
+        return seq
+
+    @property
+    def last_frame_time(self) -> float:
+        """
+        Return the monotonic time the stream last delivered a frame.
+
+        Frames that were grabbed but not decoded count, so a hidden camera
+        is not mistaken for a stalled one. Falls back to the time the
+        connection was opened, so a stream that never delivers a frame
+        still ages from the moment it connected.
+        """
+        latest = max(self._connected_at, self._last_grab_at)
+        packet = self._frame_slot.latest()
+        if packet is None:
+            return latest
+        published: float = packet.timestamp
+        return max(published, latest)
+
+    def add_frame_listener(self, listener: Callable[[FramePacket], None]) -> None:
+        """
+        Register a callback run for every published frame.
+
+        Listeners run on the capture thread and must return quickly.
+
+        Args:
+            listener: Callable receiving the new FramePacket
+        """
+        if listener not in self._frame_listeners:
+            self._frame_listeners = [*self._frame_listeners, listener]
+
+    def remove_frame_listener(self, listener: Callable[[FramePacket], None]) -> None:
+        """
+        Unregister a frame callback.
+
+        Args:
+            listener: Callable previously passed to add_frame_listener()
+        """
+        self._frame_listeners = [
+            registered for registered in self._frame_listeners if registered != listener
+        ]
+
+    def subscribe(
+        self,
+        name: str,
+        policy: DropPolicy = DropPolicy.LATEST,
+        max_pending: int = CAMERA_SETTINGS.subscriber_queue_size,
+    ) -> FrameSubscription:
+        """
+        Attach a consumer that receives this camera's frames.
+
+        Any number of consumers can subscribe; each gets every published
+        packet (the same read-only array, never a copy) subject to its own
+        drop policy, and keeps its own delivered/dropped/lag counters. The
+        newest frame, if any, is offered at once.
+
+        Args:
+            name: Consumer name used in logs and stats (e.g. "recorder")
+            policy: DropPolicy.LATEST for the newest frame only, or a queue
+                policy to receive every frame while the consumer keeps up
+            max_pending: Queue length for the queue policies
+
+        Returns:
+            The subscription; call close() on it to detach
+        """
+        subscription = FrameSubscription(
+            name, policy, max_pending, on_close=self._unsubscribe
+        )
+        self.add_frame_listener(subscription.offer)
+        packet = self._frame_slot.latest()
+        if packet is not None:
+            subscription.offer(packet)
+        return subscription
+
+    def _unsubscribe(self, subscription: FrameSubscription) -> None:
+        """Detach a closed subscription from the capture thread."""
+        self.remove_frame_listener(subscription.offer)
+
+    def add_state_listener(
+        self, listener: Callable[[Camera, CameraState], None]
+    ) -> None:
+        """
+        Register a callback run whenever the camera's state changes.
+
+        Listeners run on the thread that changed the state (usually the
+        capture thread) and must return quickly.
+
+        Args:
+            listener: Callable receiving the camera and its new state
+        """
+        if listener not in self._state_listeners:
+            self._state_listeners = [*self._state_listeners, listener]
+
+    def remove_state_listener(
+        self, listener: Callable[[Camera, CameraState], None]
+    ) -> None:
+        """
+        Unregister a state callback.
+
+        Args:
+            listener: Callable previously passed to add_state_listener()
+        """
+        self._state_listeners = [
+            registered for registered in self._state_listeners if registered != listener
+        ]
+
+    def _set_state(self, state: CameraState) -> None:
+        """Change the camera state and run the state listeners if it changed."""
+        if state is self._state:
+            return
+        self._state = state
+        for listener in self._state_listeners:
+            try:
+                listener(self, state)
+            except Exception as e:
+                self._logger.error(f"State listener error for {self.ip}: {e}")
+
+    def get_rtsp_url_from_onvif(
+        self, timeout: int = CAMERA_SETTINGS.connect_timeout_onvif
+    ) -> Optional[str]:
         """
         Discover RTSP URL using ONVIF protocol.
 
@@ -163,125 +456,275 @@ class Camera:
         self._logger.info(f"Discovering RTSP URL via ONVIF for {self.ip}:{self.port}")
 
         try:
-            self._onvif_cam = ONVIFCamera(
-                self.ip,
-                self.port,
-                self.username,
-                self.password,
-                no_cache=True,
-                adjust_time=True,
-                connect_timeout=timeout,
+            # Shared client: WSDLs parsed once, one keep-alive session per device
+            self._onvif_cam = onvif_clients.device(
+                self.ip, self.port, self.username, self.password
+            )
+            discovered_url: str
+            discovered_url, self._onvif_profile_token = self._onvif_cam.get_stream_uri(
+                timeout=timeout
             )
-
-            media = self._onvif_cam.create_media_service()
-            profiles = media.GetProfiles()
-
-            if not profiles:
-                self._logger.error(f"No ONVIF profiles found for {self.ip}")
-                return None
-
-            profile = profiles[0]
-            stream_uri_params = {
-                "StreamSetup": {
-                    "Stream": "RTP-Unicast",
-                    "Transport": {"Protocol": "RTSP"},
-                },
-                "ProfileToken": profile.token,
-            }
-
-            stream_uri = media.GetStreamUri(stream_uri_params)
-            discovered_url = stream_uri.Uri
 
             self._logger.info(f"Discovered RTSP URL via ONVIF: {discovered_url}")
             return discovered_url
 
+        except LookupError as e:
+            self._logger.error(str(e))
+            return None
         except Exception as e:
             self._logger.error(
                 f"ONVIF discovery error for {self.ip}: {e}", exc_info=True
             )
+            # Start from a fresh session next time
+            onvif_clients.forget(self.ip, self.port)
+            self._onvif_cam = None
             return None
 
     def connect(
         self,
         timeout_open: int = CAMERA_SETTINGS.connect_timeout_cv_open,
         timeout_read: int = CAMERA_SETTINGS.connect_timeout_cv_read,
-        start_thread: bool = True,
+        keep_trying: bool = False,
     ) -> bool:
         """
-        Connect to the camera and optionally start frame capture thread.
+        Start the reader thread and wait for its first connection attempt.
+
+        The reader thread resolves the stream URL, opens the VideoCapture and
+        owns it from then on; no other thread ever touches the capture.
 
         Args:
             timeout_open: OpenCV open timeout in milliseconds
             timeout_read: OpenCV read timeout in milliseconds
-            start_thread: Whether to start the reader thread (False for reconnection from thread)
+            keep_trying: Hand the camera to the reconnect scheduler if the
+                first attempt fails instead of stopping the reader
 
         Returns:
             True if connection was successful
         """
         self._logger.debug(f"Connecting to {self.ip} (Type: {self.camera_type})...")
-        self._state = CameraState.CONNECTING
-        if start_thread:
-            self._stop_event.clear()
+        self._set_state(CameraState.CONNECTING)
+
+        control = self._start_reader_thread(timeout_open, timeout_read, keep_trying)
 
-        # Get RTSP URL
+        # Bound the wait by the open timeout plus two ONVIF resolutions
+        # (cached URI failed, resolve again)
+        wait_time = timeout_open / 1000 * 2 + CAMERA_SETTINGS.connect_timeout_onvif * 2
+        if not control.opened.wait(timeout=wait_time):
+            if not keep_trying:
+                # The caller treats the camera as failed; don't leave its
+                # reader to finish the open and stream for nobody
+                self._logger.warning(
+                    f"Connection to {self.ip} timed out after {wait_time:.0f}s"
+                )
+                self.disconnect()
+                return False
+            self._logger.warning(
+                f"Connection to {self.ip} still pending after {wait_time:.0f}s"
+            )
+        return control.open_ok
+
+    def reconnect(self) -> bool:
+        """
+        Ask the reader thread to drop its stream and open it again now.
+
+        Returns:
+            False if no reader thread is running
+        """
+        control = self._control
+        thread = self._thread
+        if control is None or thread is None or not thread.is_alive():
+            return False
+
+        self._connected = False
+        self._set_state(CameraState.CONNECTING)
+        control.send(ReaderCommand.RECONNECT)
+        return True
+
+    def _open_stream(
+        self, timeout_open: int, timeout_read: int, timeline: ConnectTimeline
+    ) -> Optional[Capture]:
+        """
+        Resolve the stream URL and open it (runs in the reader thread).
+
+        Args:
+            timeout_open: OpenCV open timeout in milliseconds
+            timeout_read: OpenCV read timeout in milliseconds
+            timeline: Timeline of the attempt (ONVIF and open phases)
+
+        Returns:
+            The opened capture or None
+        """
+        # Get RTSP URL (ONVIF cameras use the cached profile when there is one)
         rtsp_url = self.rtsp_url
+        profile: Optional[ConnectionProfile] = None
+        from_cache = False
         if self.camera_type == "ONVIF" and not rtsp_url:
-            rtsp_url = self.get_rtsp_url_from_onvif()
-            if not rtsp_url:
+            profile = connection_cache.get(self.ip, self.port)
+            from_cache = profile is not None
+            if profile is None:
+                with timeline.phase(PHASE_ONVIF):
+                    profile = self._resolve_onvif_profile()
+            if profile is None:
                 self._logger.error(f"Failed to get RTSP URL for {self.ip}")
-                self._state = CameraState.ERROR
-                return False
+                self._set_state(CameraState.ERROR)
+                return None
+            rtsp_url = profile.url_for(self.username, self.password)
 
         if not rtsp_url:
             self._logger.error(f"No RTSP URL available for {self.ip}")
-            self._state = CameraState.ERROR
-            return False
+            self._set_state(CameraState.ERROR)
+            return None
 
-        # Use URL as-is (don't force transport=tcp as some cameras don't support it)
-        url_to_connect = rtsp_url
+        timeline.from_cache = from_cache
+        with timeline.phase(PHASE_OPEN):
+            cap = self._open_capture(rtsp_url, timeout_open, timeout_read)
 
-        self._logger.info(f"Connecting with cv2.VideoCapture: {self._mask_url(url_to_connect)}")
+        if cap is None and from_cache:
+            # The camera may have changed its stream; resolve it again
+            self._logger.info(
+                f"Cached stream URI failed for {self.ip}, re-resolving via ONVIF"
+            )
+            connection_cache.invalidate(self.ip, self.port)
+            with timeline.phase(PHASE_ONVIF):
+                profile = self._resolve_onvif_profile()
+            if profile is not None:
+                rtsp_url = profile.url_for(self.username, self.password)
+                with timeline.phase(PHASE_OPEN):
+                    cap = self._open_capture(rtsp_url, timeout_open, timeout_read)
+                from_cache = False
+                timeline.from_cache = False
+
+        if cap is None:
+            self._set_state(CameraState.ERROR)
+            return None
+
+        if profile is not None:
+            self._remember_profile(cap, profile, from_cache)
+        return cap
+
+    def _open_capture(
+        self, url: str, timeout_open: int, timeout_read: int
+    ) -> Optional[Capture]:
+        """
+        Open a VideoCapture on the given URL.
+
+        Args:
+            url: Stream URL
+            timeout_open: OpenCV open timeout in milliseconds
+            timeout_read: OpenCV read timeout in milliseconds
 
+        Returns:
+            The opened capture or None
+        """
+        if CAMERA_SETTINGS.capture_engine == "process":
+            return self._open_process_capture(url, timeout_open, timeout_read)
+
+        # Use URL as-is (don't force transport=tcp as some cameras don't support it)
+        self._logger.info(f"Connecting with cv2.VideoCapture: {self._mask_url(url)}")
+
+        cap = None
         try:
-            # Release previous capture
-            with self._lock:
-                if self._cap:
-                    self._cap.release()
-                    self._cap = None
-
-                self._cap = cv2.VideoCapture(url_to_connect, cv2.CAP_FFMPEG)
-                self._cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_open)
-                self._cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_read)
-                self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 3)
-
-                if not self._cap.isOpened():
-                    self._logger.error(
-                        f"Failed to open RTSP stream: {self._mask_url(url_to_connect)}"
-                    )
-                    self._cap.release()
-                    self._cap = None
-                    self._state = CameraState.ERROR
-                    return False
+            cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+            cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_open)
+            cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_read)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 3)
+
+            if not cap.isOpened():
+                self._logger.error(f"Failed to open RTSP stream: {self._mask_url(url)}")
+                cap.release()
+                return None
 
             self._logger.info(f"VideoCapture opened successfully for {self.ip}")
-            self._connected = True
-            self._state = CameraState.CONNECTED
-            self.rtsp_url = rtsp_url
+            return cap
 
-            # Start reader thread (unless reconnecting from within thread)
-            if start_thread:
-                self._start_reader_thread()
-            return True
+        except Exception as e:
+            self._logger.error(f"Exception connecting to {self.ip}: {e}", exc_info=True)
+            self._release_capture(cap)
+            return None
+
+    def _open_process_capture(
+        self, url: str, timeout_open: int, timeout_read: int
+    ) -> Optional[ProcessCapture]:
+        """
+        Open the stream in a capture worker process.
 
+        Args:
+            url: Stream URL
+            timeout_open: OpenCV open timeout in milliseconds
+            timeout_read: OpenCV read timeout in milliseconds
+
+        Returns:
+            The opened capture or None
+        """
+        self._logger.info(f"Connecting with a capture worker: {self._mask_url(url)}")
+        try:
+            cap = ProcessCapture(
+                url,
+                timeout_open,
+                timeout_read,
+                decode_fps=self._worker_decode_fps(),
+                name=self.ip,
+            )
         except Exception as e:
             self._logger.error(f"Exception connecting to {self.ip}: {e}", exc_info=True)
-            with self._lock:
-                if self._cap:
-                    self._cap.release()
-                    self._cap = None
-            self._connected = False
-            self._state = CameraState.ERROR
-            return False
+            return None
+
+        if not cap.isOpened():
+            self._logger.error(f"Failed to open RTSP stream: {self._mask_url(url)}")
+            cap.release()
+            return None
+
+        self._logger.info(f"Capture worker {cap.pid} opened stream for {self.ip}")
+        return cap
+
+    def _release_capture(self, cap: Optional[Capture]) -> None:
+        """Release a capture owned by the calling reader thread."""
+        if cap is None:
+            return
+        try:
+            cap.release()
+        except Exception as e:
+            self._logger.error(f"Error releasing capture for {self.ip}: {e}")
+
+    def _resolve_onvif_profile(self) -> Optional[ConnectionProfile]:
+        """Resolve the stream through ONVIF and wrap it in a profile."""
+        uri = self.get_rtsp_url_from_onvif()
+        if not uri:
+            return None
+        return ConnectionProfile.from_uri(uri, profile_token=self._onvif_profile_token)
+
+    def _remember_profile(
+        self, cap: Capture, profile: ConnectionProfile, from_cache: bool
+    ) -> None:
+        """
+        Persist a working ONVIF profile with the stream's resolution and codec.
+
+        Args:
+            cap: Capture opened with the profile
+            profile: Profile the stream was opened with
+            from_cache: Whether the profile came from the cache
+        """
+        width = height = 0
+        codec = ""
+        try:
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+            codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+            codec = codec.strip("\x00 ")
+        except Exception as e:
+            self._logger.debug(f"Could not read stream info for {self.ip}: {e}")
+
+        if from_cache:
+            connection_cache.update_stream_info(
+                self.ip, self.port, width, height, codec
+            )
+        else:
+            connection_cache.put(
+                self.ip,
+                self.port,
+                replace(profile, width=width, height=height, codec=codec),
+            )
 
     def _mask_url(self, url: str) -> str:
         """Mask password in URL for logging."""
@@ -295,132 +738,441 @@ class Camera:
                     return f"{scheme_user}:****@{parts[1]}"
         return url
 
-    def _start_reader_thread(self) -> None:
-        """Start the frame reader thread."""
-        # Stop existing thread
-        if self._thread and self._thread.is_alive():
+    def _start_reader_thread(
+        self, timeout_open: int, timeout_read: int, keep_trying: bool
+    ) -> _ReaderControl:
+        """
+        Start a reader thread, telling any previous one to stop.
+
+        Args:
+            timeout_open: OpenCV open timeout in milliseconds
+            timeout_read: OpenCV read timeout in milliseconds
+            keep_trying: Keep retrying if the first open fails
+
+        Returns:
+            The control channel of the new thread
+        """
+        # A previous reader may be blocked in a read; it exits on its own
+        previous = self._control
+        if previous is not None:
             self._logger.warning(f"Stopping existing thread for {self.ip}")
-            self._stop_event.set()
-            self._thread.join(timeout=1)
+            previous.stop()
 
-        self._stop_event.clear()
+        control = _ReaderControl()
+        self._control = control
         self._thread = threading.Thread(
             target=self._read_frames,
+            args=(control, timeout_open, timeout_read, keep_trying),
             name=f"CamReader_{self.ip}",
             daemon=True,
         )
         self._thread.start()
         self._logger.info(f"Reader thread started for {self.ip}")
+        return control
 
-    def _read_frames(self) -> None:
+    def _read_frames(
+        self,
+        control: _ReaderControl,
+        timeout_open: int,
+        timeout_read: int,
+        keep_trying: bool,
+    ) -> None:
         """
-        Read frames from camera in a loop (runs in background thread).
+        Open the stream and read frames in a loop (runs in background thread).
 
-        Handles reconnection on failures with exponential backoff.
+        The capture is owned by this thread (kept in a _ReaderState). Stop
+        and reconnect requests arrive through ``control`` and are handled
+        between reads; lost connections are retried when the reconnect
+        scheduler says so.
+
+        Args:
+            control: Control channel for this thread
+            timeout_open: OpenCV open timeout in milliseconds
+            timeout_read: OpenCV read timeout in milliseconds
+            keep_trying: Keep retrying if the first open fails
         """
         self._logger.info(f"Frame reader started for {self.ip}")
+        state = _ReaderState(timeout_open, timeout_read)
 
-        retry_count = 0
-        consecutive_failures = 0
-
-        while not self._stop_event.is_set():
-            # Check connection
-            needs_reconnect = False
-            with self._lock:
-                cap = self._cap
-                if not self._connected or cap is None or not cap.isOpened():
-                    self._logger.warning(f"Camera {self.ip} disconnected in thread")
-                    self._connected = False
-                    needs_reconnect = True
-
-            # Handle reconnection outside of lock
-            if needs_reconnect:
-                if retry_count < CAMERA_SETTINGS.max_retries:
-                    retry_count += 1
-                    wait_time = min(
-                        CAMERA_SETTINGS.retry_delay_base ** retry_count,
-                        CAMERA_SETTINGS.max_retry_wait,
-                    )
-                    self._logger.info(
-                        f"Reconnection attempt {retry_count}/{CAMERA_SETTINGS.max_retries} "
-                        f"for {self.ip} in {wait_time}s"
-                    )
-
-                    if self._stop_event.wait(timeout=wait_time):
-                        break
+        try:
+            self._open_reader_capture(control, state, ConnectTimeline("connect"))
+            control.open_ok = state.cap is not None
+            control.opened.set()
+            if state.cap is None and not keep_trying:
+                return
+
+            while not control.stopped.is_set():
+                command = control.poll()
+                if command is ReaderCommand.STOP:
+                    break
+                if command is ReaderCommand.RECONNECT:
+                    self._logger.info(f"Reconnect requested for {self.ip}")
+                    self._drop_capture(state)
+                    reconnect_scheduler.reset(self)
 
-                    # Reconnect without starting new thread (we ARE the thread)
-                    if self.connect(start_thread=False):
-                        retry_count = 0
-                        consecutive_failures = 0
-                    continue
-                else:
-                    self._logger.error(
-                        f"Max retries reached for {self.ip}. Stopping thread."
-                    )
-                    self._state = CameraState.ERROR
+                if state.cap is None:
+                    if not self._reconnect(control, state, command):
+                        break
+                elif not self._read_once(control, state):
                     break
 
-            # Read frame
-            try:
-                with self._lock:
-                    if self._cap is None:
-                        continue
-                    ret, frame = self._cap.read()
-
-                if ret and frame is not None:
-                    consecutive_failures = 0
-
-                    # Add to queue, dropping old frames if full
-                    if self._frame_queue.full():
-                        try:
-                            self._frame_queue.get_nowait()
-                        except queue.Empty:
-                            pass
-
-                    self._frame_queue.put(frame)
-                    time.sleep(0.01)  # Yield CPU
-                else:
-                    consecutive_failures += 1
-                    self._logger.warning(
-                        f"Frame read failed for {self.ip} "
-                        f"(failure #{consecutive_failures})"
-                    )
-
-                    if consecutive_failures >= CAMERA_SETTINGS.consecutive_read_failures_limit:
-                        self._logger.error(
-                            f"Too many read failures for {self.ip}. Marking disconnected."
-                        )
-                        self._connected = False
-                        with self._lock:
-                            if self._cap:
-                                self._cap.release()
-                                self._cap = None
-                    else:
-                        time.sleep(0.5)
+        except Exception as e:
+            self._logger.error(f"Frame reader error for {self.ip}: {e}", exc_info=True)
+            self._set_state(CameraState.ERROR)
+
+        finally:
+            # Cleanup
+            self._release_capture(state.cap)
+            self._mark_disconnected(control)
+            if self._control is control:
+                reconnect_scheduler.reset(self)
+            control.opened.set()
+            self._logger.info(f"Frame reader stopped for {self.ip}")
+
+    def _open_reader_capture(
+        self, control: _ReaderControl, state: _ReaderState, timeline: ConnectTimeline
+    ) -> None:
+        """
+        Open the stream for a reader and record the attempt.
 
-            except Exception as e:
-                self._logger.error(f"Frame read exception for {self.ip}: {e}")
-                self._connected = False
-                with self._lock:
-                    if self._cap:
-                        self._cap.release()
-                        self._cap = None
-
-        # Cleanup
-        with self._lock:
-            if self._cap:
-                self._cap.release()
-                self._cap = None
+        Args:
+            control: Control channel of the calling reader
+            state: The reader's state; gets the capture if the open succeeds
+            timeline: Timeline of the attempt
+        """
+        state.cap = self._open_admitted(
+            control, state.timeout_open, state.timeout_read, timeline
+        )
+        if state.cap is None:
+            self._record_timeline(timeline, "failed")
+            return
+        state.failures = 0
+        self._mark_connected(control)
+        state.pending, state.opened_at = timeline, time.monotonic()
+
+    def _reconnect(
+        self,
+        control: _ReaderControl,
+        state: _ReaderState,
+        command: Optional[ReaderCommand],
+    ) -> bool:
+        """
+        Wait for the reconnect scheduler, then reopen the stream.
+
+        Args:
+            control: Control channel of the calling reader
+            state: The reader's state
+            command: Command received this iteration (a requested reconnect
+                is attempted at once)
+
+        Returns:
+            False if the reader was stopped while waiting
+        """
+        wait_time = 0.0
+        if command is not ReaderCommand.RECONNECT:
+            wait_time = reconnect_scheduler.schedule(self)
+        if reconnect_scheduler.is_offline(self):
+            self._set_state(CameraState.ERROR)
+        self._logger.info(
+            f"Reconnection attempt "
+            f"{reconnect_scheduler.attempts(self) + 1} "
+            f"for {self.ip} in {wait_time:.1f}s"
+        )
+
+        timeline = ConnectTimeline("reconnect")
+        if wait_time:
+            with timeline.phase(PHASE_BACKOFF):
+                command = control.wait(wait_time)
+            if command is ReaderCommand.STOP:
+                return False
+        if control.stopped.is_set():
+            return False
+
+        self.metrics.reconnects += 1
+        self._open_reader_capture(control, state, timeline)
+        return True
+
+    def _drop_capture(self, state: _ReaderState) -> None:
+        """Release a reader's capture and close an attempt still without frames."""
+        self._release_capture(state.cap)
+        state.cap = None
+        if state.pending is not None:
+            self._record_timeline(state.pending, "no_frames")
+            state.pending = None
+
+    def _read_once(self, control: _ReaderControl, state: _ReaderState) -> bool:
+        """
+        Read (or skip) one frame and publish it.
+
+        Args:
+            control: Control channel of the calling reader
+            state: The reader's state, with an open capture
+
+        Returns:
+            False if the reader was stopped
+        """
+        try:
+            ret, frame = self._next_frame(state)
+            if control.stopped.is_set():
+                return False
+
+            if ret and frame is not None:
+                state.failures = 0
+                self._publish_frame(state, frame)
+            elif ret:
+                # Grabbed but not decoded to honour the decode rate
+                state.failures = 0
+            else:
+                return self._read_failed(control, state)
+
+        except Exception as e:
+            self._logger.error(f"Frame read exception for {self.ip}: {e}")
+            self._mark_disconnected(control)
+            self._drop_capture(state)
+        return True
+
+    def _next_frame(self, state: _ReaderState) -> tuple[bool, Optional[NDArray[Any]]]:
+        """
+        Grab the next frame and decode it if one is due.
+
+        Args:
+            state: The reader's state, with an open capture
+
+        Returns:
+            (ok, frame); ok with no frame means the frame was grabbed but
+            skipped to honour the decode rate
+        """
+        cap = state.cap
+        assert cap is not None
+        metrics = self.metrics
+        if isinstance(cap, ProcessCapture):
+            worker_fps = self._worker_decode_fps()
+            if cap.decode_fps != worker_fps:
+                cap.decode_fps = worker_fps
+
+        if CAMERA_SETTINGS.capture_mode != "grab" and self._visible:
+            cpu_start = time.thread_time()
+            ret, frame = cap.read()
+            if ret:
+                self._count_grabs(cap, time.thread_time() - cpu_start)
+            return ret and frame is not None, frame
+
+        # grab() drains (and decodes) the stream without the BGR conversion;
+        # only frames that will be handed out are retrieved
+        cpu_start = time.thread_time()
+        if not cap.grab():
+            return False, None
+        self._count_grabs(cap, time.thread_time() - cpu_start)
+        now = self._last_grab_at
+        if isinstance(cap, ProcessCapture):
+            # Capture workers retrieve at the camera's rate
+            due = cap.frame_ready
+        else:
+            due = self._decode_due(now, state.last_decode)
+        if not due:
+            return True, None
+
+        decode_start = time.perf_counter()
+        ret, frame = cap.retrieve()
+        decode_time = time.perf_counter() - decode_start
+        if isinstance(cap, ProcessCapture):
+            # Add the worker's retrieve to the reader's copy out of the ring
+            decode_time += cap.decode_seconds
+        metrics.decode_seconds.observe(decode_time)
+        state.last_decode = now
+        return ret and frame is not None, frame
+
+    def _count_grabs(self, cap: Capture, cpu_seconds: float) -> None:
+        """
+        Record the frames one grab() or read() call grabbed and their CPU time.
+
+        Args:
+            cap: The capture that grabbed
+            cpu_seconds: The reader thread's CPU time for the call (capture
+                workers report their own grabs instead)
+        """
+        grabs = 1
+        if isinstance(cap, ProcessCapture):
+            grabs, cpu_seconds = cap.grabs, cap.grab_seconds
+        self._last_grab_at = time.monotonic()
+        if grabs > 0:
+            self.metrics.frames_grabbed += grabs
+            self.metrics.grab_seconds.observe(cpu_seconds / grabs, grabs)
+
+    def _publish_frame(self, state: _ReaderState, frame: NDArray[Any]) -> None:
+        """
+        Hand a decoded frame to consumers and update the metrics.
+
+        Args:
+            state: The reader's state
+            frame: The decoded frame
+        """
+        metrics = self.metrics
+        # Replace the previous frame; consumers only want the newest
+        packet = self._frame_slot.publish(frame)
+        # Counted by the slot, once per packet however many consumers read it
+        metrics.frames_delivered = self._frame_slot.delivered
+        metrics.frames_dropped = self._frame_slot.dropped
+        metrics.frames_decoded += 1
+        metrics.stream_height, metrics.stream_width = frame.shape[:2]
+        if state.last_publish:
+            metrics.frame_interval_seconds.observe(
+                packet.timestamp - state.last_publish
+            )
+        state.last_publish = packet.timestamp
+        if state.pending is not None:
+            state.pending.add(PHASE_FIRST_FRAME, packet.timestamp - state.opened_at)
+            self._record_timeline(state.pending, "connected")
+            state.pending = None
+        self._notify_listeners(packet)
+        if CAMERA_SETTINGS.capture_mode != "grab":
+            time.sleep(0.01)  # Yield CPU
+
+    def _read_failed(self, control: _ReaderControl, state: _ReaderState) -> bool:
+        """
+        Count a failed read; drop the stream after too many in a row.
+
+        Args:
+            control: Control channel of the calling reader
+            state: The reader's state
+
+        Returns:
+            False if the reader was stopped while backing off
+        """
+        state.failures += 1
+        self.metrics.read_failures += 1
+        self._logger.warning(
+            f"Frame read failed for {self.ip} (failure #{state.failures})"
+        )
+
+        # A capture worker that gave up has closed the stream
+        cap = state.cap
+        if (
+            state.failures >= CAMERA_SETTINGS.consecutive_read_failures_limit
+            or cap is None
+            or not cap.isOpened()
+        ):
+            self._logger.error(
+                f"Too many read failures for {self.ip}. Marking disconnected."
+            )
+            self._mark_disconnected(control)
+            self._drop_capture(state)
+            return True
+        return control.wait(0.5) is not ReaderCommand.STOP
+
+    def _open_admitted(
+        self,
+        control: _ReaderControl,
+        timeout_open: int,
+        timeout_read: int,
+        timeline: ConnectTimeline,
+    ) -> Optional[Capture]:
+        """
+        Open the stream once the reconnect scheduler admits another open.
+
+        Args:
+            control: Control channel of the calling reader
+            timeout_open: OpenCV open timeout in milliseconds
+            timeout_read: OpenCV read timeout in milliseconds
+            timeline: Timeline of the attempt
+
+        Returns:
+            The opened capture, or None if it failed or the reader was stopped
+        """
+        admission_start = time.monotonic()
+        with reconnect_scheduler.open_slot(control.stopped) as admitted:
+            timeline.add(PHASE_ADMISSION, time.monotonic() - admission_start)
+            if not admitted:
+                return None
+            return self._open_stream(timeout_open, timeout_read, timeline)
+
+    def _record_timeline(self, timeline: ConnectTimeline, outcome: str) -> None:
+        """
+        Finish a connect attempt and keep it in the camera's history.
+
+        Args:
+            timeline: Timeline of the attempt
+            outcome: "connected", "failed" or "no_frames"
+        """
+        timeline.finish(outcome)
+        self._timelines.append(timeline)
+        self._logger.debug(
+            f"Connect timeline for {self.ip} ({timeline.reason}, "
+            f"{timeline.total:.2f}s): {timeline.describe()}"
+        )
+
+    def _mark_connected(self, control: _ReaderControl) -> None:
+        """Record a successful open, unless this reader has been replaced."""
+        if self._control is not control or control.stopped.is_set():
+            return
+        reconnect_scheduler.reset(self)
+        self._connected = True
+        self._connected_at = time.monotonic()
+        self._set_state(CameraState.CONNECTED)
+
+    def _mark_disconnected(self, control: _ReaderControl) -> None:
+        """Record a lost stream, unless this reader has been replaced."""
+        if self._control is not control:
+            return
         self._connected = False
-        self._logger.info(f"Frame reader stopped for {self.ip}")
+        if self._state is CameraState.CONNECTED:
+            self._set_state(CameraState.DISCONNECTED)
+
+    def _notify_listeners(self, packet: FramePacket) -> None:
+        """Run frame listeners, isolating the reader from their errors."""
+        for listener in self._frame_listeners:
+            try:
+                listener(packet)
+            except Exception as e:
+                self._logger.error(f"Frame listener error for {self.ip}: {e}")
+
+    def _decode_due(self, now: float, last_decode: float) -> bool:
+        """Return whether enough time has passed to decode another frame."""
+        if self._visible:
+            fps = self.effective_decode_fps
+            if fps <= 0:
+                return True
+        else:
+            fps = CAMERA_SETTINGS.hidden_decode_fps
+            if fps <= 0:
+                return False
+        return now - last_decode >= 1.0 / fps
+
+    def _worker_decode_fps(self) -> float:
+        """Return the decode rate for a capture worker (negative = none)."""
+        if self._visible:
+            return self.effective_decode_fps
+        return CAMERA_SETTINGS.hidden_decode_fps or -1.0
 
     def get_frame(self) -> Optional[NDArray[np.uint8]]:
         """
-        Get the most recent frame from the queue.
+        Get the most recent frame if it is new since the last call.
+
+        The "last call" is shared by all callers; consumers that need their
+        own view of the stream should use subscribe() instead.
 
         Returns:
-            Frame as numpy array or None if no frame available
+            Frame as numpy array or None if no new frame available
+        """
+        packet = self.get_latest_frame(after_seq=self._last_read_seq)
+        if packet is None:
+            return None
+        self._last_read_seq = packet.seq
+        frame: NDArray[np.uint8] = packet.frame
+        return frame
+
+    def get_latest_frame(self, after_seq: int = 0) -> Optional[FramePacket]:
+        """
+        Get the most recent frame with its sequence number and capture time.
+
+        Unlike get_frame(), this does not consume anything, so several
+        consumers can each track their own last-seen sequence number.
+
+        Args:
+            after_seq: Only return a frame newer than this sequence number
+
+        Returns:
+            The latest FramePacket or None if no newer frame is available
         """
         try:
             # Check if thread is alive
@@ -431,52 +1183,69 @@ class Camera:
                 self.disconnect()
                 return None
 
-            return self._frame_queue.get_nowait()
+            return self._frame_slot.latest_after(after_seq)
 
-        except queue.Empty:
-            return None
         except Exception as e:
             self._logger.error(f"Error getting frame for {self.ip}: {e}")
             return None
 
-    def disconnect(self) -> None:
-        """Disconnect camera and release all resources."""
-        if self._stop_event.is_set() and not self._connected and self._thread is None:
-            return
+    def request_stop(self) -> Optional[threading.Thread]:
+        """
+        Tell the reader thread to stop without waiting for it.
+
+        The reader releases its own capture when its current read returns,
+        so many cameras can be stopped at once and joined afterwards.
+
+        Returns:
+            The reader thread to join, or None if there is nothing to wait for
+        """
+        control = self._control
+        if control is None and not self._connected:
+            return None
 
         self._logger.info(f"Disconnecting camera {self.ip}...")
+        thread = self._thread
+        self._control = None
+        self._thread = None
         self._connected = False
-        self._state = CameraState.DISCONNECTED
-        self._stop_event.set()
+        self._set_state(CameraState.DISCONNECTED)
+        if control is not None:
+            control.stop()
+        reconnect_scheduler.reset(self)
 
-        # Store references for cleanup
-        thread_to_join = self._thread
-        cap_to_release = self._cap
-        self._thread = None
-        self._cap = None
+        # Drop the buffered frame
+        self._frame_slot.clear()
 
-        # Wait for thread
-        if thread_to_join and thread_to_join.is_alive():
-            self._logger.debug(f"Waiting for thread to finish for {self.ip}")
-            thread_to_join.join(timeout=2)
-            if thread_to_join.is_alive():
-                self._logger.warning(f"Thread join timeout for {self.ip}")
+        if thread is None or not thread.is_alive():
+            return None
+        if thread is threading.current_thread():
+            return None
+        return thread
 
-        # Release capture
-        if cap_to_release:
-            try:
-                cap_to_release.release()
-            except Exception as e:
-                self._logger.error(f"Error releasing capture for {self.ip}: {e}")
+    def disconnect(self, timeout: float = CAMERA_SETTINGS.stop_join_timeout) -> None:
+        """
+        Disconnect camera and release all resources.
 
-        # Clear queue
-        while not self._frame_queue.empty():
-            try:
-                self._frame_queue.get_nowait()
-            except queue.Empty:
-                break
+        The reader thread is told to stop and releases its own capture. A
+        reader blocked in a read is not waited for beyond ``timeout``; it
+        exits as soon as the read returns.
+
+        Args:
+            timeout: Maximum time to wait for the reader thread in seconds
+        """
+        was_running = self._control is not None or self._connected
+        thread_to_join = self.request_stop()
+
+        if thread_to_join is not None:
+            self._logger.debug(f"Waiting for thread to finish for {self.ip}")
+            thread_to_join.join(timeout=timeout)
+            if thread_to_join.is_alive():
+                self._logger.debug(
+                    f"Reader for {self.ip} still in I/O; it will release the capture"
+                )
 
-        self._logger.info(f"Camera {self.ip} disconnected")
+        if was_running:
+            self._logger.info(f"Camera {self.ip} disconnected")
 
     def __repr__(self) -> str:
         """Return string representation of camera."""
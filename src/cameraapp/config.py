@@ -42,6 +42,8 @@ class Paths:
     data_dir: Path
     log_dir: Path
     cameras_file: Path
+    connection_cache_file: Path
+    metrics_file: Path
 
     @classmethod
     def create(cls) -> "Paths":
@@ -57,11 +59,15 @@ class Paths:
 
         log_dir = data_dir / "logs"
         cameras_file = data_dir / "cameras.json"
+        connection_cache_file = data_dir / "connections.json"
+        metrics_file = data_dir / "metrics.prom"
 
         return cls(
             data_dir=data_dir,
             log_dir=log_dir,
             cameras_file=cameras_file,
+            connection_cache_file=connection_cache_file,
+            metrics_file=metrics_file,
         )
 
 
@@ -75,19 +81,40 @@ class CameraSettings:
     max_retries: int = 5
     retry_delay_base: int = 2
     max_retry_wait: int = 60
-    frame_queue_size: int = 5
     consecutive_read_failures_limit: int = 10
+    capture_mode: str = "grab"  # "grab" (grab/retrieve split) or "read"
+    target_decode_fps: float = 15.0  # Frames retrieved per second (0 = all)
+    hidden_decode_fps: float = 0.0  # Decode rate of hidden tiles (0 = none)
+    decode_budget_cores: float = 0.0  # 0 = half the cores, negative disables
+    decode_budget_min_fps: float = 1.0  # Rate every camera keeps over budget
+    decode_budget_interval: float = 2.0  # seconds between budget rebalances
+    startup_workers: int = 4  # Cameras connected in parallel at startup
+    stop_join_timeout: float = 0.5  # seconds disconnect() waits for the reader
+    shutdown_timeout: float = 2.0  # seconds stopping all cameras may take in total
+    max_concurrent_opens: int = 8  # Streams opened at the same time
+    offline_retry_interval: int = 300  # seconds between attempts once offline
+    connect_history: int = 10  # Connect timelines kept per camera
+    subscriber_queue_size: int = 8  # Frames queued per "every frame" subscriber
+    capture_engine: str = "thread"  # "thread" (reader threads) or "process"
+    worker_start_method: str = ""  # "" = forkserver where available, else spawn
+    worker_ring_slots: int = 6  # Shared-memory frames per process-engine stream
+    worker_max_restarts: int = 3  # Immediate restarts of a crashed worker
 
 
 @dataclass(frozen=True)
 class UISettings:
     """User interface settings."""
 
-    frame_update_interval: int = 30  # milliseconds
+    frame_update_interval: int = 30  # milliseconds (tick while frames arrive)
+    max_idle_interval: int = 250  # milliseconds (tick backs off to this when idle)
+    frame_stall_timeout: float = 3.0  # seconds without frames before disconnecting
     default_aspect_ratio: str = "fit"
     default_window_width: int = 1280
     default_window_height: int = 720
     grid_columns: int = 2
+    render_workers: int = 4  # 0 prepares tiles on the Tk thread
+    renderer: str = "labels"  # "labels" (one Label per camera) or "mosaic"
+    tick_stats_interval: float = 10.0  # seconds between UI tick timing logs
 
 
 @dataclass(frozen=True)
@@ -109,6 +136,34 @@ class NetworkSettings:
 
     onvif_discovery_timeout: int = 5
     force_tcp_transport: bool = True
+    scan_engine: str = "async"  # "async" (non-blocking connects) or "thread"
+    scan_concurrency: int = 512  # Port probes in flight (async engine)
+    scan_progress_interval: float = 0.1  # Seconds between scan progress reports
+    onvif_probe_workers: int = 16  # Direct ONVIF probes running at once
+    # Probed on every address; the vendor ports only on hosts that answered
+    scan_liveness_ports: tuple[int, ...] = (554, 80)
+    scan_vendor_ports: tuple[int, ...] = (8000, 8899, 37777, 34567, 443, 8080, 8554)
+    # Neighbor (ARP) table use: "order" known hosts first, "prune" scan only
+    # them, or "off"
+    scan_neighbor_mode: str = "order"
+
+
+@dataclass(frozen=True)
+class MetricsSettings:
+    """Runtime metrics export settings."""
+
+    http_port: int = 0  # 0 disables the OpenMetrics endpoint
+    http_host: str = "127.0.0.1"
+    dump_interval: float = 0.0  # seconds between metrics file dumps (0 disables)
+
+
+@dataclass(frozen=True)
+class HeadlessSettings:
+    """Headless capture service settings."""
+
+    frame_stall_timeout: float = 3.0  # seconds without frames before restarting
+    supervise_interval: float = 1.0  # seconds between supervision passes
+    status_interval: float = 60.0  # seconds between status log lines
 
 
 # Global configuration instances
@@ -117,6 +172,8 @@ CAMERA_SETTINGS = CameraSettings()
 UI_SETTINGS = UISettings()
 LOGGING_SETTINGS = LoggingSettings()
 NETWORK_SETTINGS = NetworkSettings()
+METRICS_SETTINGS = MetricsSettings()
+HEADLESS_SETTINGS = HeadlessSettings()
 
 # Ensure directories exist
 PATHS.data_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,237 @@
+"""
+Connection cache module for CameraApp.
+
+Persists what ONVIF resolution found for each camera (stream URI, media
+profile, transport and the last seen resolution/codec) so later starts can
+open the RTSP stream directly instead of going through the ONVIF handshake.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, urlsplit, urlunsplit
+
+from cameraapp.config import LOGGER_NAME, PATHS
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """
+    Resolved connection details for one camera.
+
+    Attributes:
+        stream_uri: RTSP URI returned by GetStreamUri (credentials stripped)
+        profile_token: ONVIF media profile used for the stream
+        transport: Stream transport requested from the camera
+        has_credentials: Whether the URI carried user info that was stripped
+        width: Last seen frame width (0 if unknown)
+        height: Last seen frame height (0 if unknown)
+        codec: Last seen codec FourCC ("" if unknown)
+        resolved_at: Wall-clock time of the ONVIF resolution
+    """
+
+    stream_uri: str
+    profile_token: str = ""
+    transport: str = "RTSP"
+    has_credentials: bool = False
+    width: int = 0
+    height: int = 0
+    codec: str = ""
+    resolved_at: float = 0.0
+
+    @classmethod
+    def from_uri(
+        cls, uri: str, profile_token: str = "", transport: str = "RTSP"
+    ) -> "ConnectionProfile":
+        """
+        Create a profile from a freshly resolved stream URI.
+
+        Args:
+            uri: Stream URI as returned by the camera
+            profile_token: ONVIF media profile token
+            transport: Stream transport
+
+        Returns:
+            Profile with credentials removed from the stored URI
+        """
+        stripped = strip_credentials(uri)
+        return cls(
+            stream_uri=stripped,
+            profile_token=profile_token,
+            transport=transport,
+            has_credentials=stripped != uri,
+            resolved_at=time.time(),
+        )
+
+    def url_for(self, username: str, password: str) -> str:
+        """
+        Return the URI to open, with credentials restored if it had any.
+
+        Args:
+            username: Camera username
+            password: Camera password
+
+        Returns:
+            Stream URL
+        """
+        if not self.has_credentials or not username:
+            return self.stream_uri
+        parts = urlsplit(self.stream_uri)
+        userinfo = quote(username, safe="")
+        if password:
+            userinfo += ":" + quote(password, safe="")
+        return urlunsplit(parts._replace(netloc=f"{userinfo}@{parts.netloc}"))
+
+
+def strip_credentials(url: str) -> str:
+    """
+    Remove user info from a URL so it can be written to disk.
+
+    Args:
+        url: URL possibly containing "user:password@"
+
+    Returns:
+        URL without user info
+    """
+    parts = urlsplit(url)
+    if "@" not in parts.netloc:
+        return url
+    host = parts.netloc.rsplit("@", 1)[1]
+    return urlunsplit(parts._replace(netloc=host))
+
+
+class ConnectionProfileCache:
+    """
+    Thread-safe cache of ConnectionProfile entries keyed by "ip:port".
+
+    The file is read lazily on first use and rewritten on every change;
+    passwords are never stored (see ConnectionProfile.from_uri()).
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON file backing the cache
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._profiles: Optional[dict[str, ConnectionProfile]] = None
+
+    @staticmethod
+    def _key(ip: str, port: int) -> str:
+        """Return the cache key for a camera."""
+        return f"{ip}:{port}"
+
+    def get(self, ip: str, port: int) -> Optional[ConnectionProfile]:
+        """
+        Return the cached profile for a camera.
+
+        Args:
+            ip: Camera IP address
+            port: Camera ONVIF port
+
+        Returns:
+            The cached profile or None
+        """
+        with self._lock:
+            return self._load().get(self._key(ip, port))
+
+    def put(self, ip: str, port: int, profile: ConnectionProfile) -> None:
+        """
+        Store a profile and persist the cache.
+
+        Args:
+            ip: Camera IP address
+            port: Camera ONVIF port
+            profile: Profile to store
+        """
+        with self._lock:
+            self._load()[self._key(ip, port)] = profile
+            self._save()
+
+    def update_stream_info(
+        self, ip: str, port: int, width: int, height: int, codec: str
+    ) -> None:
+        """
+        Record the resolution and codec last seen on a cached stream.
+
+        Args:
+            ip: Camera IP address
+            port: Camera ONVIF port
+            width: Frame width
+            height: Frame height
+            codec: Codec FourCC
+        """
+        with self._lock:
+            profiles = self._load()
+            key = self._key(ip, port)
+            profile = profiles.get(key)
+            if profile is None:
+                return
+            updated = replace(profile, width=width, height=height, codec=codec)
+            if updated != profile:
+                profiles[key] = updated
+                self._save()
+
+    def invalidate(self, ip: str, port: int) -> None:
+        """
+        Drop the cached profile for a camera.
+
+        Args:
+            ip: Camera IP address
+            port: Camera ONVIF port
+        """
+        with self._lock:
+            if self._load().pop(self._key(ip, port), None) is not None:
+                self._save()
+
+    def _load(self) -> dict[str, ConnectionProfile]:
+        """Read the cache file on first use (lock held)."""
+        if self._profiles is not None:
+            return self._profiles
+
+        self._profiles = {}
+        if not self._path.exists():
+            return self._profiles
+
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, entry in data.items():
+                try:
+                    self._profiles[key] = ConnectionProfile(**entry)
+                except TypeError as e:
+                    logger.warning(
+                        f"Ignoring invalid connection cache entry {key}: {e}"
+                    )
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Error reading connection cache {self._path}: {e}")
+        return self._profiles
+
+    def _save(self) -> None:
+        """Write the cache file (lock held)."""
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                key: asdict(profile) for key, profile in (self._profiles or {}).items()
+            }
+            tmp_path = self._path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+            tmp_path.replace(self._path)
+        except OSError as e:
+            logger.error(f"Error writing connection cache {self._path}: {e}")
+
+
+# Global connection cache instance
+connection_cache = ConnectionProfileCache(PATHS.connection_cache_file)
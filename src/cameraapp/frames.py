@@ -0,0 +1,373 @@
+"""
+Frame buffering module for CameraApp.
+
+Provides the single-slot "latest frame" buffer shared between a camera's
+capture thread and its consumers, per-consumer frame subscriptions, and the
+notifier used to wake consumers when new frames arrive.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from cameraapp.config import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+@dataclass(frozen=True)
+class FramePacket:
+    """
+    A captured frame with its sequence number and capture time.
+
+    Attributes:
+        frame: BGR image as numpy array (read-only, shared by all consumers)
+        seq: Monotonically increasing sequence number (starts at 1)
+        timestamp: Capture time from time.monotonic()
+    """
+
+    frame: NDArray[np.uint8]
+    seq: int
+    timestamp: float
+
+
+class LatestFrameSlot:
+    """
+    Thread-safe single-slot buffer holding only the newest frame.
+
+    Publishing replaces the previous frame, so consumers always see the
+    most recent capture and memory is bounded to one frame per camera.
+    Consumers compare sequence numbers to tell whether a frame is new.
+
+    The slot counts each packet once, however many consumers read it:
+    ``delivered`` packets were taken by at least one consumer through
+    latest_after() or wait_for(), ``dropped`` ones were replaced before any
+    consumer took them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty slot."""
+        self._cond = threading.Condition(threading.Lock())
+        self._packet: Optional[FramePacket] = None
+        self._seq = 0
+        self._taken = False
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def seq(self) -> int:
+        """Return the sequence number of the latest published frame (0 if none)."""
+        return self._seq
+
+    def publish(
+        self, frame: NDArray[np.uint8], timestamp: Optional[float] = None
+    ) -> FramePacket:
+        """
+        Store a new frame, replacing the previous one.
+
+        Args:
+            frame: Frame to publish
+            timestamp: Capture time (defaults to time.monotonic())
+
+        Returns:
+            The published packet
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        # Every consumer shares this array; nobody may modify it in place
+        frame.setflags(write=False)
+
+        with self._cond:
+            if self._packet is not None and not self._taken:
+                self.dropped += 1
+            self._seq += 1
+            packet = FramePacket(frame=frame, seq=self._seq, timestamp=timestamp)
+            self._packet = packet
+            self._taken = False
+            self._cond.notify_all()
+        return packet
+
+    def latest(self) -> Optional[FramePacket]:
+        """Return the latest packet without consuming it."""
+        return self._packet
+
+    def latest_after(self, seq: int) -> Optional[FramePacket]:
+        """
+        Return the latest packet only if it is newer than ``seq``.
+
+        Args:
+            seq: Sequence number the caller has already seen
+
+        Returns:
+            The latest packet, or None if nothing newer is available
+        """
+        with self._cond:
+            return self._take_after(seq)
+
+    def wait_for(
+        self, seq: int, timeout: Optional[float] = None
+    ) -> Optional[FramePacket]:
+        """
+        Block until a packet newer than ``seq`` is published.
+
+        Args:
+            seq: Sequence number the caller has already seen
+            timeout: Maximum time to wait in seconds (None waits forever)
+
+        Returns:
+            The newer packet, or None on timeout
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > seq, timeout=timeout)
+            return self._take_after(seq)
+
+    def _take_after(self, seq: int) -> Optional[FramePacket]:
+        """Return the latest packet if newer than ``seq`` and count it (locked)."""
+        packet = self._packet
+        if packet is None or packet.seq <= seq:
+            return None
+        if not self._taken:
+            self._taken = True
+            self.delivered += 1
+        return packet
+
+    def clear(self) -> None:
+        """Drop the stored frame. The sequence number keeps increasing."""
+        with self._cond:
+            self._packet = None
+
+
+class DropPolicy(Enum):
+    """How a subscription handles frames its consumer has not taken yet."""
+
+    LATEST = "latest"  # Keep only the newest frame
+    DROP_OLDEST = "drop_oldest"  # Queue frames, discarding the oldest when full
+    DROP_NEWEST = "drop_newest"  # Queue frames, discarding new ones when full
+
+
+class FrameSubscription:
+    """
+    One consumer's feed of a camera's frames.
+
+    The capture thread offers every published packet; the consumer takes
+    them with get() or poll(). Packets are shared, never copied. Each
+    subscription keeps its own counters, so a slow recorder does not hide
+    frames from the UI or vice versa.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: DropPolicy = DropPolicy.LATEST,
+        max_pending: int = 8,
+        on_close: Optional[Callable[[FrameSubscription], None]] = None,
+    ) -> None:
+        """
+        Initialize an empty subscription.
+
+        Args:
+            name: Consumer name used in logs and stats
+            policy: What to do with frames the consumer has not taken yet
+            max_pending: Queue length for the DROP_OLDEST/DROP_NEWEST policies
+            on_close: Callback run once when the subscription is closed
+        """
+        self.name = name
+        self.policy = policy
+        maxlen = 1 if policy is DropPolicy.LATEST else max(1, max_pending)
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: deque[FramePacket] = deque()
+        self._maxlen = maxlen
+        self._on_close = on_close
+        self._closed = False
+        self._last_offered = 0
+        self._last_delivered = 0
+        self.offered = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        """Return whether the subscription has been closed."""
+        return self._closed
+
+    @property
+    def lag(self) -> int:
+        """Return how many frames the consumer is behind the newest offered one."""
+        if not self._last_offered:
+            return 0
+        return self._last_offered - self._last_delivered
+
+    def offer(self, packet: FramePacket) -> None:
+        """
+        Hand a new packet to the subscription (called by the capture thread).
+
+        Never blocks: when the queue is full a frame is dropped according to
+        the subscription's policy.
+
+        Args:
+            packet: Newly published packet
+        """
+        with self._cond:
+            if self._closed or packet.seq <= self._last_offered:
+                return
+            self.offered += 1
+            self._last_offered = packet.seq
+            if len(self._pending) >= self._maxlen:
+                self.dropped += 1
+                if self.policy is DropPolicy.DROP_NEWEST:
+                    return
+                self._pending.popleft()
+            self._pending.append(packet)
+            self._cond.notify()
+
+    def poll(self) -> Optional[FramePacket]:
+        """Return the next packet without waiting (None if there is none)."""
+        with self._cond:
+            return self._take()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[FramePacket]:
+        """
+        Wait for the next packet.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits until a
+                packet arrives or the subscription is closed)
+
+        Returns:
+            The next packet, or None on timeout or after close()
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._closed, timeout)
+            return self._take()
+
+    def close(self) -> None:
+        """Stop receiving frames and wake any waiting consumer."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the subscription's counters."""
+        return {
+            "name": self.name,
+            "policy": self.policy.value,
+            "offered": self.offered,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "lag": self.lag,
+            "pending": len(self._pending),
+        }
+
+    def _take(self) -> Optional[FramePacket]:
+        """Pop the next pending packet (lock held)."""
+        if not self._pending:
+            return None
+        packet = self._pending.popleft()
+        self.delivered += 1
+        self._last_delivered = packet.seq
+        return packet
+
+
+class FrameNotifier:
+    """
+    Wakes a consumer loop when any camera publishes a frame.
+
+    Capture threads call notify(), which never blocks. When the consumer
+    has gone idle it calls arm(); the next notify() then runs the wakeup
+    callback once on the notifier's own thread, so capture threads never
+    touch the consumer's event loop directly. Without a wakeup callback no
+    thread is started and the consumer polls consume() instead.
+    """
+
+    def __init__(
+        self,
+        wakeup: Optional[Callable[[], None]] = None,
+        name: str = "FrameNotifier",
+    ) -> None:
+        """
+        Initialize the notifier.
+
+        Args:
+            wakeup: Callback run (on the notifier thread) to wake the consumer
+            name: Name of the notifier thread
+        """
+        self._wakeup = wakeup
+        self._name = name
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._pending = False
+        self._armed = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the wakeup thread."""
+        if self._thread is not None or self._wakeup is None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the wakeup thread."""
+        self._stopped = True
+        self._event.set()
+        self._thread = None
+
+    def notify(self, *_: object) -> None:
+        """Record that a new frame is available (safe from any thread)."""
+        with self._lock:
+            self._pending = True
+            if not self._armed:
+                return
+            self._armed = False
+        self._event.set()
+
+    def arm(self) -> None:
+        """Request a wakeup on the next notify()."""
+        with self._lock:
+            if self._pending:
+                self._armed = False
+                self._event.set()
+            else:
+                self._armed = True
+
+    def consume(self) -> bool:
+        """
+        Clear and return the pending flag.
+
+        Returns:
+            True if any frame was published since the last call
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = False
+            return pending
+
+    def _run(self) -> None:
+        """Deliver wakeups (runs in the notifier thread)."""
+        while True:
+            self._event.wait()
+            self._event.clear()
+            if self._stopped:
+                break
+            try:
+                if self._wakeup is not None:
+                    self._wakeup()
+            except Exception as e:
+                # Consumer loop gone; polling will pick frames up
+                logger.debug(f"{self._name}: wakeup failed: {e}")
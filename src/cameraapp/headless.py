@@ -0,0 +1,200 @@
+"""
+Headless capture service for CameraApp.
+
+Runs the saved cameras without a display: cameras are loaded with
+load_cameras() into a CameraPool, connected in parallel, supervised for
+stalled streams and disconnected cleanly on SIGTERM/SIGINT. Nothing here
+imports tkinter or PIL, so recording/analytics nodes start fast with a small
+footprint.
+
+Usage:
+    python -m cameraapp --headless
+    cameraapp-headless --duration 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+import time
+from typing import Optional
+
+from cameraapp.camera import Camera
+from cameraapp.config import (
+    HEADLESS_SETTINGS,
+    LOGGER_NAME,
+    METRICS_SETTINGS,
+    PATHS,
+)
+from cameraapp.metrics import metrics_registry
+from cameraapp.pool import CameraPool
+from cameraapp.timeline import summarize as summarize_timelines
+
+
+class HeadlessService:
+    """
+    Runs cameras' capture pipelines without a UI.
+
+    start() connects the cameras in the background; run() supervises them
+    until request_stop() is called (e.g. from a signal handler), then stop()
+    disconnects everything.
+    """
+
+    def __init__(
+        self,
+        cameras: list[Camera],
+        logger_instance: Optional[logging.Logger] = None,
+        stall_timeout: float = HEADLESS_SETTINGS.frame_stall_timeout,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            cameras: Cameras to run
+            logger_instance: Optional logger instance
+            stall_timeout: Seconds without frames before a stream is restarted
+        """
+        self._logger = logger_instance or logging.getLogger(LOGGER_NAME)
+        self.pool: CameraPool = CameraPool(self._logger)
+        for camera in cameras:
+            self.pool.add(camera)
+        self.stall_timeout = stall_timeout
+        self._stop_event = threading.Event()
+        self._startup_reported = False
+
+    @property
+    def cameras(self) -> tuple[Camera, ...]:
+        """Return the pool's cameras."""
+        cameras: tuple[Camera, ...] = self.pool.cameras
+        return cameras
+
+    def start(self) -> None:
+        """Connect all cameras in the background, highest priority first."""
+        # Cameras that are down keep retrying under the reconnect scheduler
+        self.pool.start(keep_trying=True)
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """
+        Supervise the cameras until a stop is requested.
+
+        Args:
+            duration: Stop after this many seconds (None runs until stopped)
+        """
+        deadline = None if duration is None else time.monotonic() + duration
+        last_status = time.monotonic()
+        while not self._stop_event.wait(HEADLESS_SETTINGS.supervise_interval):
+            now = time.monotonic()
+            self._check_stalls(now)
+            self._report_startup()
+            if now - last_status >= HEADLESS_SETTINGS.status_interval:
+                last_status = now
+                self._log_status()
+            if deadline is not None and now >= deadline:
+                break
+
+    def request_stop(self, *_: object) -> None:
+        """Ask run() to return (safe from signal handlers and other threads)."""
+        self._stop_event.set()
+
+    def stop(self) -> None:
+        """Disconnect every camera."""
+        self._stop_event.set()
+        self.pool.stop()
+
+    def _check_stalls(self, now: float) -> None:
+        """Restart streams whose newest frame is too old."""
+        for camera in self.cameras:
+            if not camera.connected:
+                continue
+            frame_age = now - camera.last_frame_time
+            if frame_age > self.stall_timeout:
+                self._logger.warning(
+                    f"Camera {camera.ip} stopped sending frames ({frame_age:.1f}s)"
+                )
+                camera.reconnect()
+
+    def _report_startup(self) -> None:
+        """Log time-to-first-frame once every connected camera has a frame."""
+        if self._startup_reported or not self.pool.startup_done:
+            return
+        connected = [cam for cam in self.cameras if cam.connected]
+        if any(cam.last_connect_timeline is None for cam in connected):
+            return
+
+        self._startup_reported = True
+        timelines = []
+        for camera in connected:
+            attempts = [t for t in camera.connect_timelines if t.outcome == "connected"]
+            if attempts:
+                timelines.append(attempts[0])
+        self._logger.info(summarize_timelines(timelines))
+
+    def _log_status(self) -> None:
+        """Log how many cameras are delivering frames."""
+        connected = sum(1 for cam in self.cameras if cam.connected)
+        self._logger.info(f"Status: {connected}/{len(self.cameras)} cameras connected")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Entry point of the headless service.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Exit code (0 for success, non-zero for errors)
+    """
+    parser = argparse.ArgumentParser(
+        prog="cameraapp-headless", description="Run CameraApp cameras without a UI."
+    )
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=METRICS_SETTINGS.http_port,
+        help="Serve OpenMetrics on this localhost port (0 disables)",
+    )
+    args = parser.parse_args(argv)
+
+    from cameraapp.utils import load_cameras, setup_logging
+
+    logger = setup_logging()
+    logger.info("=" * 20 + " Headless Service Started " + "=" * 20)
+
+    cameras = load_cameras(logger)
+    if not cameras:
+        logger.warning(f"No cameras configured in {PATHS.cameras_file}")
+
+    service = HeadlessService(cameras, logger)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, service.request_stop)
+
+    exit_code = 0
+    try:
+        if args.metrics_port:
+            metrics_registry.start_http_server(
+                args.metrics_port, METRICS_SETTINGS.http_host
+            )
+        if METRICS_SETTINGS.dump_interval > 0:
+            metrics_registry.start_file_dump(
+                PATHS.metrics_file, METRICS_SETTINGS.dump_interval
+            )
+        service.start()
+        service.run(duration=args.duration)
+    except Exception as e:
+        logger.critical(f"Unhandled exception in headless service: {e}", exc_info=True)
+        exit_code = 1
+    finally:
+        service.stop()
+        metrics_registry.stop()
+        logger.info("=" * 20 + " Headless Service Finished " + "=" * 20)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
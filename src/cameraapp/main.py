@@ -2,24 +2,46 @@
 Main entry point for CameraApp.
 
 This module initializes logging, creates the main window,
-and starts the application.
+and starts the application. With --headless it runs the capture service
+instead (see headless.py) and never imports tkinter.
 """
 
 from __future__ import annotations
 
 import sys
 import threading
-import tkinter as tk
-from tkinter import messagebox
+from typing import Optional
 
 
-def main() -> int:
+def main(argv: Optional[list[str]] = None) -> int:
     """
     Main entry point for the application.
 
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Exit code (0 for success, non-zero for errors)
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if "--headless" in args:
+        from cameraapp.headless import main as headless_main
+
+        exit_code: int = headless_main([arg for arg in args if arg != "--headless"])
+        return exit_code
+    return _run_gui()
+
+
+def _run_gui() -> int:
+    """
+    Run the Tk application.
+
     Returns:
         Exit code (0 for success, non-zero for errors)
     """
+    import tkinter as tk
+    from tkinter import messagebox
+
     # Set main thread name
     threading.current_thread().name = "MainThread"
 
@@ -0,0 +1,361 @@
+"""
+Runtime metrics module for CameraApp.
+
+Each camera records counters, gauges and fixed-bucket histograms about its
+capture loop and tile rendering. Recording is a few integer additions with
+no locks (every metric has a single writer thread), so metrics stay on in
+production. Snapshots are available as dictionaries, as OpenMetrics text
+over an optional localhost HTTP endpoint, or as a periodically rewritten
+file.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+
+from cameraapp.config import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# Bucket upper bounds in seconds
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+METRIC_PREFIX = "cameraapp"
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (cumulative buckets are computed on export).
+
+    Not locked: observe() must only be called from one thread.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float, count: int = 1) -> None:
+        """
+        Record a value.
+
+        Args:
+            value: The value
+            count: Number of events it stands for (e.g. an average over
+                several grabs reported together)
+        """
+        self.counts[bisect_left(self.buckets, value)] += count
+        self.sum += value * count
+        self.count += count
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket containing it.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            The bucket bound (the largest finite bound for overflows, 0 if empty)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return count, sum, mean and p50/p95 estimates."""
+        count = self.count
+        return {
+            "count": count,
+            "sum": self.sum,
+            "mean": self.sum / count if count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Return (le, cumulative count) pairs including +Inf."""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((repr(bound), total))
+        result.append(("+Inf", total + self.counts[-1]))
+        return result
+
+
+class CameraMetrics:
+    """
+    Metrics for one camera.
+
+    Counters and gauges are plain attributes. The camera's reader thread
+    writes the capture metrics, including frames_delivered/frames_dropped
+    (frames of the latest-frame slot that a consumer took, or that were
+    replaced before any did); the consumer rendering tiles writes
+    render_seconds. grab_seconds is the
+    CPU time of each grab, which is where FFmpeg decodes the stream, and
+    decode_seconds the time to retrieve a grabbed frame as a BGR image.
+    """
+
+    COUNTERS = (
+        "frames_grabbed",
+        "frames_decoded",
+        "frames_delivered",
+        "frames_dropped",
+        "read_failures",
+        "reconnects",
+    )
+    GAUGES = ("stream_width", "stream_height")
+    HISTOGRAMS = (
+        "grab_seconds",
+        "decode_seconds",
+        "frame_interval_seconds",
+        "render_seconds",
+    )
+
+    __slots__ = ("name", *COUNTERS, *GAUGES, *HISTOGRAMS)
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize zeroed metrics.
+
+        Args:
+            name: Camera label used in snapshots (e.g. "192.168.1.10:554")
+        """
+        self.name = name
+        for counter in self.COUNTERS:
+            setattr(self, counter, 0)
+        for gauge in self.GAUGES:
+            setattr(self, gauge, 0)
+        for histogram in self.HISTOGRAMS:
+            setattr(self, histogram, Histogram())
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the camera's metrics as plain values."""
+        data: dict[str, Any] = {}
+        for counter in self.COUNTERS:
+            data[counter] = getattr(self, counter)
+        for gauge in self.GAUGES:
+            data[gauge] = getattr(self, gauge)
+        for histogram in self.HISTOGRAMS:
+            data[histogram] = getattr(self, histogram).snapshot()
+        return data
+
+
+class MetricsRegistry:
+    """
+    Registry of per-camera metrics with snapshot and export helpers.
+
+    Cameras are held weakly, so removed cameras drop out of snapshots.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._cameras: weakref.WeakKeyDictionary[Any, CameraMetrics] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._dump_stop: Optional[threading.Event] = None
+
+    def register(self, owner: Any, name: str) -> CameraMetrics:
+        """
+        Create the metrics of a camera.
+
+        Args:
+            owner: Object the metrics belong to (held weakly)
+            name: Label used in snapshots
+
+        Returns:
+            The camera's metrics
+        """
+        camera_metrics = CameraMetrics(name)
+        with self._lock:
+            self._cameras[owner] = camera_metrics
+        return camera_metrics
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the metrics of every camera.
+
+        Returns:
+            Mapping of camera label to CameraMetrics.snapshot()
+        """
+        with self._lock:
+            cameras = list(self._cameras.values())
+        return {camera.name: camera.snapshot() for camera in cameras}
+
+    def render_openmetrics(self) -> str:
+        """
+        Render all metrics in the OpenMetrics text format.
+
+        Returns:
+            Exposition text ending with "# EOF"
+        """
+        with self._lock:
+            cameras = list(self._cameras.values())
+
+        lines: list[str] = []
+        for counter in CameraMetrics.COUNTERS:
+            name = f"{METRIC_PREFIX}_{counter}"
+            lines.append(f"# TYPE {name} counter")
+            for camera in cameras:
+                labels = _labels(camera.name)
+                lines.append(f"{name}_total{{{labels}}} {getattr(camera, counter)}")
+
+        for gauge in CameraMetrics.GAUGES:
+            name = f"{METRIC_PREFIX}_{gauge}"
+            lines.append(f"# TYPE {name} gauge")
+            for camera in cameras:
+                labels = _labels(camera.name)
+                lines.append(f"{name}{{{labels}}} {getattr(camera, gauge)}")
+
+        for histogram in CameraMetrics.HISTOGRAMS:
+            name = f"{METRIC_PREFIX}_{histogram}"
+            lines.append(f"# TYPE {name} histogram")
+            lines.append(f"# UNIT {name} seconds")
+            for camera in cameras:
+                labels = _labels(camera.name)
+                values: Histogram = getattr(camera, histogram)
+                for bound, count in values.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {values.sum}")
+                lines.append(f"{name}_count{{{labels}}} {values.count}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> int:
+        """
+        Serve OpenMetrics text on http://host:port/metrics.
+
+        Args:
+            port: TCP port (0 picks a free one)
+            host: Interface to bind (localhost by default)
+
+        Returns:
+            The bound port
+        """
+        if self._server is not None:
+            return self._server.server_address[1]
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """Serves the registry's OpenMetrics text."""
+
+            def do_GET(self) -> None:  # noqa: N802
+                """Reply with the current metrics."""
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                payload = registry.render_openmetrics().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                """Silence per-request logging."""
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(
+            target=server.serve_forever, name="MetricsServer", daemon=True
+        ).start()
+        self._server = server
+        bound_port = server.server_address[1]
+        logger.info(f"Metrics available at http://{host}:{bound_port}/metrics")
+        return bound_port
+
+    def start_file_dump(self, path: Path, interval: float) -> None:
+        """
+        Rewrite an OpenMetrics file every ``interval`` seconds.
+
+        Args:
+            path: File to write
+            interval: Seconds between dumps
+        """
+        if self._dump_stop is not None:
+            return
+        stop = threading.Event()
+        self._dump_stop = stop
+
+        def run() -> None:
+            while not stop.wait(interval):
+                self.dump(path)
+            self.dump(path)
+
+        threading.Thread(target=run, name="MetricsDump", daemon=True).start()
+        logger.info(f"Dumping metrics to {path} every {interval:g}s")
+
+    def dump(self, path: Path) -> None:
+        """
+        Write the current metrics to a file atomically.
+
+        Args:
+            path: File to write
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(self.render_openmetrics(), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.error(f"Error writing metrics to {path}: {e}")
+
+    def stop(self) -> None:
+        """Stop the HTTP endpoint and the file dump (writing a final dump)."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._dump_stop is not None:
+            self._dump_stop.set()
+            self._dump_stop = None
+
+
+def _labels(camera: str) -> str:
+    """Return the OpenMetrics label set for a camera."""
+    escaped = camera.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'camera="{escaped}"'
+
+
+# Global metrics registry
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,361 @@
+"""
+ONVIF client module for CameraApp.
+
+Builds ONVIF service clients that share work across cameras: each WSDL is
+parsed once per process, every device keeps one pooled HTTP session, and
+services are created only when first used.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import os
+import threading
+from typing import Any, Optional
+
+from cameraapp.config import CAMERA_SETTINGS, LOGGER_NAME
+
+# Try to import the ONVIF/zeep stack
+try:
+    import onvif
+    import requests
+    from onvif.client import ONVIFService, UsernameDigestTokenDtDiff
+    from onvif.definition import SERVICES
+    from requests.adapters import HTTPAdapter
+    from zeep.client import Client, Settings
+    from zeep.transports import Transport
+    from zeep.wsdl import Document
+
+    ONVIF_AVAILABLE = True
+except ImportError:
+    onvif = None
+    ONVIF_AVAILABLE = False
+
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+def _default_wsdl_dir() -> str:
+    """Return the WSDL directory shipped with onvif-zeep."""
+    return os.path.join(os.path.dirname(os.path.dirname(onvif.__file__)), "wsdl")
+
+
+class OnvifDevice:
+    """
+    One ONVIF device with a pooled HTTP session and lazily created services.
+
+    Instances are created by OnvifClientFactory.device() and reused for
+    every resolution of the same camera.
+    """
+
+    def __init__(
+        self,
+        factory: OnvifClientFactory,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+    ) -> None:
+        """
+        Initialize the device (no network traffic until first use).
+
+        Args:
+            factory: Factory providing parsed WSDL documents
+            host: Device host or IP address
+            port: Device ONVIF port
+            username: ONVIF username
+            password: ONVIF password
+        """
+        self.host = host
+        self.port = int(port)
+        self.username = username
+        self.password = password
+        self._factory = factory
+        self._lock = threading.RLock()
+        self._dt_diff: Optional[dt.timedelta] = None
+        self._time_checked = False
+        self._xaddrs: Optional[dict[str, str]] = None
+        self._services: dict[str, Any] = {}
+
+        # One keep-alive session per device, shared by all of its services
+        self._session = requests.Session()
+        self._session.trust_env = False  # Never route camera traffic via a proxy
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._transport = Transport(
+            session=self._session,
+            timeout=factory.timeout,
+            operation_timeout=factory.timeout,
+        )
+
+    @property
+    def device_xaddr(self) -> str:
+        """Return the fixed device-management endpoint."""
+        host = self.host
+        if not host.startswith(("http://", "https://")):
+            host = f"http://{host}"
+        return f"{host}:{self.port}/onvif/device_service"
+
+    def service(self, name: str) -> Any:
+        """
+        Return an ONVIF service, creating it on first use.
+
+        Args:
+            name: Service name as in onvif.definition.SERVICES (e.g. "media")
+
+        Returns:
+            The ONVIFService wrapper
+        """
+        name = name.lower()
+        with self._lock:
+            service = self._services.get(name)
+            if service is not None:
+                return service
+
+            if name == "devicemgmt":
+                xaddr = self.device_xaddr
+            else:
+                xaddr = self._service_xaddr(name)
+
+            service = self._create_service(name, xaddr)
+            self._services[name] = service
+            return service
+
+    def get_stream_uri(self, timeout: Optional[float] = None) -> tuple[str, str]:
+        """
+        Resolve the RTSP stream URI of the first media profile.
+
+        Args:
+            timeout: Per-request timeout in seconds (None uses the factory's)
+
+        Returns:
+            Tuple of (stream URI, profile token)
+
+        Raises:
+            ONVIFError/Exception: If the device cannot be queried
+            LookupError: If the device has no media profiles
+        """
+        with self._transport.settings(timeout=timeout or self._factory.timeout):
+            media = self.service("media")
+            profiles = media.GetProfiles()
+            if not profiles:
+                raise LookupError(f"No ONVIF profiles found for {self.host}")
+
+            profile = profiles[0]
+            stream_uri = media.GetStreamUri(
+                {
+                    "StreamSetup": {
+                        "Stream": "RTP-Unicast",
+                        "Transport": {"Protocol": "RTSP"},
+                    },
+                    "ProfileToken": profile.token,
+                }
+            )
+        return stream_uri.Uri, profile.token
+
+    def close(self) -> None:
+        """Close the device's HTTP session."""
+        with self._lock:
+            self._services.clear()
+            self._session.close()
+
+    def _create_service(self, name: str, xaddr: str) -> Any:
+        """Create a service client on the shared WSDL document (lock held)."""
+        definition = SERVICES[name]
+        binding_name = f"{{{definition['ns']}}}{definition['binding']}"
+        if name != "devicemgmt":
+            self._check_time()
+
+        wsse = UsernameDigestTokenDtDiff(
+            self.username, self.password, dt_diff=self._dt_diff, use_digest=True
+        )
+        client = Client(
+            wsdl=self._factory.document(definition["wsdl"]),
+            wsse=wsse,
+            transport=self._transport,
+            settings=self._factory.settings,
+        )
+        return ONVIFService(
+            xaddr,
+            self.username,
+            self.password,
+            os.path.join(self._factory.wsdl_dir, definition["wsdl"]),
+            zeep_client=client,
+            dt_diff=self._dt_diff,
+            binding_name=binding_name,
+        )
+
+    def _check_time(self) -> None:
+        """Measure the device clock offset once (lock held)."""
+        if self._time_checked or not self._factory.adjust_time:
+            return
+        self._time_checked = True
+        try:
+            devicemgmt = self.service("devicemgmt")
+            cdate = devicemgmt.GetSystemDateAndTime().UTCDateTime
+            cam_date = dt.datetime(
+                cdate.Date.Year,
+                cdate.Date.Month,
+                cdate.Date.Day,
+                cdate.Time.Hour,
+                cdate.Time.Minute,
+                cdate.Time.Second,
+            )
+            self._dt_diff = cam_date - dt.datetime.utcnow()
+            # The device service must sign with the corrected clock too
+            self._services.pop("devicemgmt", None)
+        except Exception as e:
+            logger.debug(f"Could not read device time for {self.host}: {e}")
+
+    def _service_xaddr(self, name: str) -> str:
+        """Return a service endpoint from the device capabilities (lock held)."""
+        if self._xaddrs is None:
+            self._check_time()
+            capabilities = self.service("devicemgmt").GetCapabilities(
+                {"Category": "All"}
+            )
+            xaddrs: dict[str, str] = {}
+            for key in capabilities:
+                capability = capabilities[key]
+                definition = SERVICES.get(key.lower())
+                if definition is not None and capability is not None:
+                    try:
+                        xaddrs[definition["ns"]] = capability["XAddr"]
+                    except (KeyError, TypeError):
+                        continue
+            self._xaddrs = xaddrs
+
+        xaddr = self._xaddrs.get(SERVICES[name]["ns"])
+        if not xaddr:
+            raise LookupError(f"Device {self.host} doesn't support service: {name}")
+        return xaddr
+
+
+class OnvifClientFactory:
+    """
+    Process-wide source of ONVIF device clients.
+
+    WSDL documents are parsed once and shared by every device; devices are
+    cached per (host, port, username) so repeated resolutions reuse their
+    session and services.
+    """
+
+    def __init__(
+        self,
+        wsdl_dir: Optional[str] = None,
+        timeout: float = CAMERA_SETTINGS.connect_timeout_onvif,
+        adjust_time: bool = True,
+    ) -> None:
+        """
+        Initialize the factory.
+
+        Args:
+            wsdl_dir: Directory with the ONVIF WSDL files (defaults to onvif-zeep's)
+            timeout: HTTP timeout in seconds for every ONVIF request
+            adjust_time: Compensate for device clock drift in WS-Security tokens
+        """
+        self._wsdl_dir = wsdl_dir
+        self.timeout = timeout
+        self.adjust_time = adjust_time
+        self._lock = threading.Lock()
+        self._documents: dict[str, Any] = {}
+        self._document_locks: dict[str, threading.Lock] = {}
+        self._devices: dict[tuple[str, int, str], OnvifDevice] = {}
+        self._settings: Optional[Any] = None
+
+    @property
+    def wsdl_dir(self) -> str:
+        """Return the WSDL directory in use."""
+        if self._wsdl_dir is None:
+            self._wsdl_dir = _default_wsdl_dir()
+        return self._wsdl_dir
+
+    @property
+    def settings(self) -> Any:
+        """Return the zeep settings shared by all clients."""
+        if self._settings is None:
+            self._settings = Settings(strict=False, xml_huge_tree=True)
+        return self._settings
+
+    def document(self, wsdl_file: str) -> Any:
+        """
+        Return a parsed WSDL document, parsing it on first use.
+
+        Args:
+            wsdl_file: WSDL file name inside wsdl_dir
+
+        Returns:
+            The shared zeep Document
+        """
+        with self._lock:
+            document = self._documents.get(wsdl_file)
+            if document is not None:
+                return document
+            lock = self._document_locks.setdefault(wsdl_file, threading.Lock())
+
+        # Parse outside the factory lock so different WSDLs load in parallel
+        with lock:
+            with self._lock:
+                document = self._documents.get(wsdl_file)
+            if document is None:
+                path = os.path.join(self.wsdl_dir, wsdl_file)
+                # zeep annotates the transport as a class, but it is used
+                # (and zeep's own Client passes it) as an instance
+                document = Document(path, Transport(), settings=self.settings)  # type: ignore[arg-type]
+                with self._lock:
+                    self._documents[wsdl_file] = document
+                logger.debug(f"Parsed ONVIF WSDL {wsdl_file}")
+            return document
+
+    def device(self, host: str, port: int, username: str, password: str) -> OnvifDevice:
+        """
+        Return the cached client for a device, creating it if needed.
+
+        Args:
+            host: Device host or IP address
+            port: Device ONVIF port
+            username: ONVIF username
+            password: ONVIF password
+
+        Returns:
+            The device client
+        """
+        key = (host, int(port), username)
+        with self._lock:
+            device = self._devices.get(key)
+            if device is not None and device.password == password:
+                return device
+            stale = device
+            device = OnvifDevice(self, host, port, username, password)
+            self._devices[key] = device
+        if stale is not None:
+            stale.close()
+        return device
+
+    def forget(self, host: str, port: int) -> None:
+        """
+        Drop cached clients for a device (e.g. after it stopped answering).
+
+        Args:
+            host: Device host or IP address
+            port: Device ONVIF port
+        """
+        with self._lock:
+            keys = [key for key in self._devices if key[:2] == (host, int(port))]
+            devices = [self._devices.pop(key) for key in keys]
+        for device in devices:
+            device.close()
+
+    def close(self) -> None:
+        """Close every device session."""
+        with self._lock:
+            devices = list(self._devices.values())
+            self._devices.clear()
+        for device in devices:
+            device.close()
+
+
+# Global ONVIF client factory
+onvif_clients = OnvifClientFactory()
@@ -0,0 +1,402 @@
+"""
+Camera pool module for CameraApp.
+
+A CameraPool owns a set of cameras keyed by stable IDs and runs them with
+the same engine whatever the front end: connections are opened in the
+background on a bounded worker pool in priority order, cameras can be
+added or removed without touching the others, state changes are reported
+through callbacks, decoding is kept within a CPU budget (see budget.py)
+and the newest frame of every camera can be fetched in one call. The Tk
+app and the headless service are both built on it.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from cameraapp.budget import DecodeBudget
+from cameraapp.camera import Camera, CameraState
+from cameraapp.config import CAMERA_SETTINGS, LOGGER_NAME
+from cameraapp.frames import FramePacket
+
+StateListener = Callable[[str, Camera, CameraState], None]
+
+
+class CameraPool:
+    """
+    Thread-safe set of cameras keyed by stable IDs.
+
+    IDs default to "ip:port" (with a "#2", "#3", ... suffix for duplicates)
+    and never change while a camera is in the pool. Iteration order is the
+    order cameras were added, which front ends use as the grid order.
+    """
+
+    def __init__(
+        self,
+        logger_instance: Optional[logging.Logger] = None,
+        workers: int = CAMERA_SETTINGS.startup_workers,
+        budget: Optional[DecodeBudget] = None,
+    ) -> None:
+        """
+        Initialize an empty pool.
+
+        Args:
+            logger_instance: Optional logger instance
+            workers: Maximum number of simultaneous connection attempts
+            budget: Decode budget shared by the cameras (defaults to one
+                built from CameraSettings)
+        """
+        self._logger = logger_instance or logging.getLogger(LOGGER_NAME)
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._cameras: dict[str, Camera] = {}
+        self._ids: dict[Camera, str] = {}
+        self._ordered: tuple[Camera, ...] = ()
+        self._state_listeners: list[StateListener] = []
+        self._pending: set[str] = set()  # Queued or connecting
+        self._startups = 0  # Startup batches still running
+        self._startup_started = time.monotonic()
+        self._closed = False
+        self.budget = budget or DecodeBudget(logger_instance=self._logger)
+
+    def __len__(self) -> int:
+        """Return the number of cameras in the pool."""
+        return len(self._ordered)
+
+    def __contains__(self, camera_id: object) -> bool:
+        """Return whether a camera ID is in the pool."""
+        return camera_id in self._cameras
+
+    def __iter__(self) -> Iterator[Camera]:
+        """Iterate over the cameras in the order they were added."""
+        return iter(self._ordered)
+
+    @property
+    def cameras(self) -> tuple[Camera, ...]:
+        """Return the cameras in the order they were added."""
+        return self._ordered
+
+    @property
+    def ids(self) -> list[str]:
+        """Return the camera IDs in the order they were added."""
+        with self._lock:
+            return list(self._cameras)
+
+    @property
+    def startup_started(self) -> float:
+        """Return time.monotonic() when the latest start() was called."""
+        return self._startup_started
+
+    @property
+    def startup_done(self) -> bool:
+        """Return True once no startup batch is running."""
+        return self._startups == 0
+
+    def get(self, camera_id: str) -> Optional[Camera]:
+        """
+        Look up a camera.
+
+        Args:
+            camera_id: ID returned by add()
+
+        Returns:
+            The camera, or None if the ID is not in the pool
+        """
+        return self._cameras.get(camera_id)
+
+    def id_of(self, camera: Camera) -> Optional[str]:
+        """Return the ID of a camera, or None if it is not in the pool."""
+        return self._ids.get(camera)
+
+    def is_pending(self, camera_id: str) -> bool:
+        """Return whether a camera is queued or connecting in a startup batch."""
+        return camera_id in self._pending
+
+    def add(self, camera: Camera, camera_id: Optional[str] = None) -> str:
+        """
+        Add a camera without connecting it.
+
+        Args:
+            camera: Camera to add
+            camera_id: Stable ID (defaults to "ip:port")
+
+        Returns:
+            The camera's ID
+
+        Raises:
+            ValueError: If the camera or the explicit ID is already in the pool
+        """
+        with self._lock:
+            if camera in self._ids:
+                raise ValueError(f"Camera {camera.ip} is already in the pool")
+            if camera_id is None:
+                camera_id = base = f"{camera.ip}:{camera.port}"
+                suffix = 2
+                while camera_id in self._cameras:
+                    camera_id = f"{base}#{suffix}"
+                    suffix += 1
+            elif camera_id in self._cameras:
+                raise ValueError(f"Camera ID {camera_id!r} is already in use")
+
+            self._cameras[camera_id] = camera
+            self._ids[camera] = camera_id
+            self._ordered = (*self._ordered, camera)
+
+        camera.add_state_listener(self._on_camera_state)
+        self.budget.request_rebalance()
+        return camera_id
+
+    def remove(self, camera_id: str) -> Camera:
+        """
+        Remove a camera and disconnect it; other cameras are not touched.
+
+        Args:
+            camera_id: ID returned by add()
+
+        Returns:
+            The removed camera
+
+        Raises:
+            KeyError: If the ID is not in the pool
+        """
+        with self._lock:
+            camera = self._cameras.pop(camera_id)
+            del self._ids[camera]
+            self._ordered = tuple(cam for cam in self._ordered if cam is not camera)
+            self._pending.discard(camera_id)
+
+        camera.remove_state_listener(self._on_camera_state)
+        self.budget.forget(camera)
+        self.budget.request_rebalance()
+        try:
+            camera.disconnect()
+        except Exception as e:
+            self._logger.error(f"Error disconnecting {camera.ip}: {e}")
+        return camera
+
+    def start(
+        self, camera_ids: Optional[list[str]] = None, keep_trying: bool = True
+    ) -> None:
+        """
+        Connect cameras in the background, highest priority first.
+
+        Cameras that are already connected are skipped. Returns at once;
+        see startup_done and is_pending() for progress. Also starts the
+        decode budget, which keeps rebalancing until stop().
+
+        Args:
+            camera_ids: Cameras to connect (defaults to every camera)
+            keep_trying: Keep retrying cameras that are down under the
+                reconnect scheduler instead of giving up
+        """
+        with self._lock:
+            self._closed = False
+            if camera_ids is None:
+                camera_ids = list(self._cameras)
+            order = sorted(
+                (
+                    (camera_id, self._cameras[camera_id])
+                    for camera_id in camera_ids
+                    if camera_id in self._cameras
+                    and not self._cameras[camera_id].connected
+                ),
+                key=lambda item: item[1].priority,
+            )
+            self._pending.update(camera_id for camera_id, _ in order)
+            self._startups += 1
+            self._startup_started = time.monotonic()
+
+        self._logger.info(
+            f"Starting {len(order)} camera connections ({self.workers} in parallel)..."
+        )
+        self.budget.start(lambda: self._ordered)
+        threading.Thread(
+            target=self._run_startup,
+            args=(order, keep_trying),
+            name="CameraStartup",
+            daemon=True,
+        ).start()
+
+    def stop(self, timeout: float = CAMERA_SETTINGS.shutdown_timeout) -> None:
+        """
+        Stop any startup in progress and disconnect every camera.
+
+        Every reader is signalled first, so all captures are released
+        concurrently by their own threads; the readers are then joined
+        against one deadline for the whole pool. Readers still blocked in
+        I/O at the deadline release their capture when the read returns.
+
+        Args:
+            timeout: Maximum time to wait for all readers in seconds
+        """
+        with self._lock:
+            self._closed = True
+            cameras = self._ordered
+        self.budget.stop()
+        if not cameras:
+            return
+
+        started = time.monotonic()
+        readers = []
+        for camera in cameras:
+            try:
+                reader = camera.request_stop()
+            except Exception as e:
+                self._logger.error(f"Error disconnecting {camera.ip}: {e}")
+                continue
+            if reader is not None:
+                readers.append(reader)
+
+        deadline = started + timeout
+        for reader in readers:
+            reader.join(timeout=max(0.0, deadline - time.monotonic()))
+
+        lingering = sum(1 for reader in readers if reader.is_alive())
+        elapsed = time.monotonic() - started
+        if lingering:
+            self._logger.warning(
+                f"Stopped {len(cameras)} cameras in {elapsed:.2f}s; "
+                f"{lingering} readers still in I/O will release their captures"
+            )
+        else:
+            self._logger.info(f"Stopped {len(cameras)} cameras in {elapsed:.2f}s")
+
+    def latest_frames(
+        self, after: Optional[Mapping[str, int]] = None
+    ) -> dict[str, FramePacket]:
+        """
+        Fetch the newest frame of every camera.
+
+        Args:
+            after: Last sequence number seen per camera ID; cameras with no
+                newer frame are left out of the result
+
+        Returns:
+            Mapping of camera ID to its newest FramePacket
+        """
+        with self._lock:
+            cameras = list(self._cameras.items())
+
+        after = after or {}
+        frames = {}
+        for camera_id, camera in cameras:
+            packet = camera.get_latest_frame(after_seq=after.get(camera_id, 0))
+            if packet is not None:
+                frames[camera_id] = packet
+        return frames
+
+    def add_state_listener(self, listener: StateListener) -> None:
+        """
+        Register a callback run whenever a camera's state changes.
+
+        Listeners run on the thread that changed the state (usually a
+        capture thread) and must return quickly; UI front ends should hand
+        the event over to their own thread.
+
+        Args:
+            listener: Callable receiving the camera ID, camera and new state
+        """
+        if listener not in self._state_listeners:
+            self._state_listeners = [*self._state_listeners, listener]
+
+    def remove_state_listener(self, listener: StateListener) -> None:
+        """
+        Unregister a state callback.
+
+        Args:
+            listener: Callable previously passed to add_state_listener()
+        """
+        self._state_listeners = [
+            registered for registered in self._state_listeners if registered != listener
+        ]
+
+    def _on_camera_state(self, camera: Camera, state: CameraState) -> None:
+        """Forward a camera's state change to the pool's listeners."""
+        camera_id = self._ids.get(camera)
+        if camera_id is None:
+            return
+        if state is not CameraState.CONNECTING:
+            # Cameras coming and going change everyone's share
+            self.budget.request_rebalance()
+        for listener in self._state_listeners:
+            try:
+                listener(camera_id, camera, state)
+            except Exception as e:
+                self._logger.error(f"State listener error for {camera_id}: {e}")
+
+    def _run_startup(self, order: list[tuple[str, Camera]], keep_trying: bool) -> None:
+        """
+        Open camera connections on a worker pool (runs in a background thread).
+
+        Args:
+            order: (ID, camera) pairs to connect, highest priority first
+            keep_trying: Passed on to Camera.connect()
+        """
+        started = time.monotonic()
+        try:
+            if order:
+                with ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="CameraConnect"
+                ) as executor:
+                    results = list(
+                        executor.map(
+                            lambda item: self._connect_camera(
+                                item[0], item[1], keep_trying
+                            ),
+                            order,
+                        )
+                    )
+            else:
+                results = []
+            self._logger.info(
+                f"{sum(results)}/{len(order)} cameras connected in "
+                f"{time.monotonic() - started:.2f}s ({results.count(False)} failed)"
+            )
+        except Exception as e:
+            self._logger.error(f"Error starting cameras: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._startups -= 1
+
+    def _connect_camera(
+        self, camera_id: str, camera: Camera, keep_trying: bool
+    ) -> bool:
+        """
+        Connect one camera (runs on the startup pool).
+
+        Args:
+            camera_id: ID of the camera
+            camera: Camera to connect
+            keep_trying: Passed on to Camera.connect()
+
+        Returns:
+            True if the camera connected
+        """
+        try:
+            if not self._is_current(camera_id, camera):
+                return False
+            connected: bool = camera.connect(keep_trying=keep_trying)
+        except Exception as e:
+            self._logger.error(f"Error connecting {camera.ip}: {e}", exc_info=True)
+            connected = False
+        finally:
+            self._pending.discard(camera_id)
+
+        if not self._is_current(camera_id, camera):
+            # Stopped or removed while connecting
+            camera.disconnect()
+            return False
+        if not connected:
+            self._logger.warning(
+                f"Failed to connect: IP={camera.ip}, RTSP={camera.rtsp_url}"
+            )
+        return connected
+
+    def _is_current(self, camera_id: str, camera: Camera) -> bool:
+        """Return whether the pool is open and still maps the ID to the camera."""
+        return not self._closed and self._cameras.get(camera_id) is camera
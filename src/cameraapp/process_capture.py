@@ -0,0 +1,707 @@
+"""
+Process capture engine for CameraApp.
+
+Runs a stream's VideoCapture in a worker process instead of the camera's
+reader thread. The worker decodes each frame straight into a slot of a
+shared-memory ring buffer and only sends the slot number over a pipe; the
+reader thread copies the newest slot out of the ring once, so frames cross
+the process boundary without being pickled and the worker never overwrites
+a frame a consumer still holds. A hung FFmpeg read or a
+crash in the decoder only takes down that stream's worker, which is
+restarted, and decoding no longer competes for the main interpreter's GIL.
+
+Select it with ``CameraSettings.capture_engine = "process"``.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import signal
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from cameraapp.config import CAMERA_SETTINGS, LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# Extra time allowed for a worker to start (a spawned worker imports cv2)
+WORKER_START_GRACE = 5.0
+
+# How often a worker that is grabbing without decoding tells the parent the
+# stream is still alive; this also bounds how long the reader takes to pass
+# on a new decode rate (e.g. when a hidden camera is shown again)
+GRAB_REPORT_INTERVAL = 0.25
+
+# Pause after a failed read in a worker, so a dead stream does not spin a core
+# and flood the pipe with failure reports
+WORKER_FAILURE_BACKOFF = 0.1
+
+
+def worker_context() -> multiprocessing.context.BaseContext:
+    """
+    Return the multiprocessing context capture workers are started with.
+
+    Uses CameraSettings.worker_start_method, or when that is empty a fork
+    server preloaded with this module where the platform has one (workers
+    then start in milliseconds instead of re-importing cv2) and spawn
+    elsewhere.
+    """
+    method = CAMERA_SETTINGS.worker_start_method
+    if not method:
+        available = multiprocessing.get_all_start_methods()
+        method = "forkserver" if "forkserver" in available else "spawn"
+    context: multiprocessing.context.BaseContext = multiprocessing.get_context(method)
+    if method == "forkserver":
+        context.set_forkserver_preload([__name__])
+    return context
+
+
+class FrameRing:
+    """
+    Fixed-size frames in one shared-memory block.
+
+    The worker writes frame ``seq`` into slot ``seq % slots``, so a view of
+    a slot stays valid only until ``slots - 1`` newer frames have been
+    written. ProcessCapture.retrieve() copies the slot out right after the
+    worker reports it, and views never leave this module.
+    """
+
+    def __init__(
+        self, shm: SharedMemory, shape: tuple[int, ...], slots: int, owner: bool
+    ) -> None:
+        """
+        Wrap a shared-memory block.
+
+        Args:
+            shm: Shared memory holding ``slots`` frames of ``shape``
+            shape: Frame shape (height, width, channels)
+            slots: Number of frames in the ring
+            owner: Whether this process created the block (and unlinks it)
+        """
+        self._shm = shm
+        self.shape = shape
+        self.slots = slots
+        self._owner = owner
+        self._frames: Optional[NDArray[np.uint8]] = np.ndarray(
+            (slots, *shape), dtype=np.uint8, buffer=shm.buf
+        )
+
+    @classmethod
+    def create(cls, shape: tuple[int, ...], slots: int) -> FrameRing:
+        """
+        Allocate a new ring.
+
+        Args:
+            shape: Frame shape (height, width, channels)
+            slots: Number of frames in the ring
+
+        Returns:
+            The ring (owned by the calling process)
+        """
+        size = slots * int(np.prod(shape))
+        return cls(SharedMemory(create=True, size=size), shape, slots, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, shape: tuple[int, ...], slots: int) -> FrameRing:
+        """
+        Map a ring created by another process.
+
+        Args:
+            name: Shared memory name (FrameRing.name)
+            shape: Frame shape the ring was created with
+            slots: Number of frames in the ring
+
+        Returns:
+            The attached ring
+        """
+        return cls(SharedMemory(name=name), shape, slots, owner=False)
+
+    @property
+    def name(self) -> str:
+        """Return the shared memory name."""
+        return self._shm.name
+
+    def slot(self, index: int) -> NDArray[np.uint8]:
+        """Return a view of one slot (no copy)."""
+        assert self._frames is not None, "ring is closed"
+        frame: NDArray[np.uint8] = self._frames[index]
+        return frame
+
+    def close(self) -> None:
+        """Unmap the ring (and free it if this process created it)."""
+        self._frames = None
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        try:
+            self._shm.close()
+        except BufferError:
+            # Consumers still hold views; the mapping goes away with them
+            pass
+
+
+def _capture_worker(
+    url: str,
+    params: list[int],
+    conn: Connection,
+    decode_fps: Any,
+    max_failures: int = CAMERA_SETTINGS.consecutive_read_failures_limit,
+) -> None:
+    """
+    Decode one stream into shared memory (runs in the worker process).
+
+    Args:
+        url: Stream URL
+        params: cv2.VideoCapture open parameters
+        conn: Pipe to the parent process
+        decode_fps: Shared double with the target decode rate (0 = every
+            frame, negative = grab without decoding)
+        max_failures: Failed reads in a row after which the worker reports
+            "failed" and exits
+    """
+    # Ctrl+C is handled by the parent, which stops its workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    worker = _CaptureWorker(
+        cv2.VideoCapture(url, cv2.CAP_FFMPEG, params), conn, decode_fps, max_failures
+    )
+    try:
+        if worker.open():
+            worker.run()
+    except (EOFError, OSError):
+        # Parent went away
+        pass
+    finally:
+        worker.close()
+
+
+class _CaptureWorker:
+    """Read loop of a capture worker process (see _capture_worker)."""
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        conn: Connection,
+        decode_fps: Any,
+        max_failures: int,
+    ) -> None:
+        """
+        Set up the loop.
+
+        Args:
+            cap: The worker's VideoCapture
+            conn: Pipe to the parent process
+            decode_fps: Shared double with the target decode rate
+            max_failures: Failed reads in a row before giving up
+        """
+        self._cap = cap
+        self._conn = conn
+        self._decode_fps = decode_fps
+        self._max_failures = max(1, max_failures)
+        self._ring: Optional[FrameRing] = None
+        self._seq = 0
+        self._failures = 0
+        # Grabs since the last frame or grab report, and their CPU time
+        self._grabs = 0
+        self._grab_seconds = 0.0
+        self._last_decode = 0.0
+        self._last_report = 0.0
+
+    def open(self) -> bool:
+        """
+        Read the first frame, report the stream and attach to the ring.
+
+        Returns:
+            True if the stream opened and the parent sent a ring
+        """
+        cap = self._cap
+        cpu_start = time.thread_time()
+        ok, frame = cap.read() if cap.isOpened() else (False, None)
+        self._grabs, self._grab_seconds = 1, time.thread_time() - cpu_start
+        if not ok or frame is None:
+            self._conn.send(("failed",))
+            return False
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        self._conn.send(("opened", frame.shape, fourcc))
+        self._ring = _receive_ring(self._conn, frame.shape)
+        if self._ring is None:
+            return False
+
+        self._seq = 1
+        index = self._seq % self._ring.slots
+        np.copyto(self._ring.slot(index), frame)
+        self._report("frame", self._seq, index, 0.0)
+        self._last_decode = self._last_report = time.monotonic()
+        return True
+
+    def run(self) -> None:
+        """Read frames until the parent stops the worker or reads keep failing."""
+        while self._handle_messages():
+            cpu_start = time.thread_time()
+            grabbed = self._cap.grab()
+            self._grab_seconds += time.thread_time() - cpu_start
+            if not grabbed:
+                running = self._read_failed()
+            elif self._skip_decode():
+                running = True
+            else:
+                running = self._decode()
+            if not running:
+                return
+
+    def close(self) -> None:
+        """Release the stream and detach from the ring."""
+        self._cap.release()
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    def _handle_messages(self) -> bool:
+        """
+        Apply pending requests from the parent.
+
+        Returns:
+            False if the parent asked the worker to stop
+        """
+        while self._conn.poll():
+            message = self._conn.recv()
+            if message[0] == "stop":
+                return False
+            if message[0] == "set":
+                self._cap.set(message[1], message[2])
+        return True
+
+    def _read_failed(self) -> bool:
+        """
+        Report a failed read and back off before the next one.
+
+        Returns:
+            False once ``max_failures`` reads in a row have failed; the worker
+            then reports "failed" so the camera reconnects on its schedule
+        """
+        self._failures += 1
+        if self._failures >= self._max_failures:
+            self._conn.send(("failed",))
+            return False
+        self._conn.send(("read_failed",))
+        # Waits on the pipe so a stop request still ends the pause at once
+        self._conn.poll(WORKER_FAILURE_BACKOFF)
+        return True
+
+    def _skip_decode(self) -> bool:
+        """
+        Return whether the grabbed frame is skipped to honour the decode rate.
+
+        A skipped grab still keeps the session alive, and is reported to the
+        parent every GRAB_REPORT_INTERVAL.
+        """
+        fps = self._decode_fps.value
+        now = time.monotonic()
+        if fps < 0 or (fps > 0 and now - self._last_decode < 1.0 / fps):
+            self._failures = 0
+            self._grabs += 1
+            if now - self._last_report >= GRAB_REPORT_INTERVAL:
+                self._report("grabbed")
+                self._last_report = now
+            return True
+        self._last_decode = self._last_report = now
+        return False
+
+    def _decode(self) -> bool:
+        """
+        Decode the grabbed frame into the next ring slot and report it.
+
+        Returns:
+            False if the worker should exit
+        """
+        assert self._ring is not None
+        self._grabs += 1
+        index = (self._seq + 1) % self._ring.slots
+        target = self._ring.slot(index)
+        cpu_start = time.thread_time()
+        ok, frame = self._cap.retrieve(target)
+        decode_seconds = time.thread_time() - cpu_start
+        if not ok or frame is None:
+            return self._read_failed()
+        if frame is not target:
+            # OpenCV allocated a new image: the stream changed resolution
+            if frame.shape != self._ring.shape:
+                self._ring.close()
+                self._conn.send(("shape", frame.shape))
+                self._ring = _receive_ring(self._conn, frame.shape)
+                if self._ring is None:
+                    return False
+                target = self._ring.slot(index)
+            np.copyto(target, frame)
+        self._failures = 0
+        self._seq += 1
+        self._report("frame", self._seq, index, decode_seconds)
+        return True
+
+    def _report(self, *message: Any) -> None:
+        """Send a frame or grab report with the grabs since the last one."""
+        self._conn.send((*message, self._grabs, self._grab_seconds))
+        self._grabs = 0
+        self._grab_seconds = 0.0
+
+
+def _receive_ring(conn: Connection, shape: tuple[int, ...]) -> Optional[FrameRing]:
+    """Wait for the parent to allocate a ring and attach to it (worker side)."""
+    message = conn.recv()
+    if message[0] != "ring":
+        return None
+    return FrameRing.attach(message[1], shape, message[2])
+
+
+class ProcessCapture:
+    """
+    VideoCapture-like handle on a stream decoded in a worker process.
+
+    Implements the part of cv2.VideoCapture the camera reader uses
+    (isOpened, grab, retrieve, read, get, set, release) and, like a
+    VideoCapture, is owned by a single reader thread. The worker grabs
+    every frame (FFmpeg decodes in grab) and retrieves them as BGR images
+    at ``decode_fps``, so skipped frames are never converted, copied or
+    sent; a negative rate keeps the stream flowing without retrieving
+    anything. Each grab() also reports how many frames the worker grabbed
+    and the CPU time they took (grabs, grab_seconds, decode_seconds).
+
+    It also supervises its worker: a worker that dies is restarted at once
+    up to ``max_restarts`` times in a row. After that reads fail, which
+    hands the stream back to the camera's reconnect scheduling.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout_open: int = CAMERA_SETTINGS.connect_timeout_cv_open,
+        timeout_read: int = CAMERA_SETTINGS.connect_timeout_cv_read,
+        decode_fps: float = 0.0,
+        slots: int = CAMERA_SETTINGS.worker_ring_slots,
+        max_restarts: int = CAMERA_SETTINGS.worker_max_restarts,
+        name: str = "",
+    ) -> None:
+        """
+        Start a worker and open the stream.
+
+        Args:
+            url: Stream URL
+            timeout_open: Open timeout in milliseconds
+            timeout_read: Read timeout in milliseconds
+            decode_fps: Target decode rate (0 decodes every frame, negative
+                grabs without decoding)
+            slots: Frames in the shared-memory ring
+            max_restarts: Consecutive worker restarts before reads fail
+            name: Label used in worker names and logs (e.g. the camera IP)
+        """
+        self._url = url
+        self._params = [
+            cv2.CAP_PROP_OPEN_TIMEOUT_MSEC,
+            timeout_open,
+            cv2.CAP_PROP_READ_TIMEOUT_MSEC,
+            timeout_read,
+        ]
+        self._timeout_open = timeout_open / 1000
+        self._timeout_read = timeout_read / 1000
+        self._slots = max(2, slots)
+        self.max_restarts = max_restarts
+        self.name = name or url
+        self._ctx = worker_context()
+        self._decode_fps = self._ctx.Value("d", float(decode_fps), lock=False)
+
+        self._process: Optional[BaseProcess] = None
+        self._conn: Optional[Connection] = None
+        self._ring: Optional[FrameRing] = None
+        self._shape: tuple[int, ...] = (0, 0, 3)
+        self._fourcc = 0
+        self._frame_slot: Optional[int] = None
+        self._failed_restarts = 0
+        self.restarts = 0
+        # Worker grabs behind the last grab() call, their CPU time, and the
+        # CPU time the worker took to retrieve the frame it found
+        self.grabs = 0
+        self.grab_seconds = 0.0
+        self.decode_seconds = 0.0
+        self._opened = self._start_worker()
+
+    @property
+    def decode_fps(self) -> float:
+        """
+        Return the worker's target decode rate.
+
+        0 decodes every frame; a negative rate grabs without decoding.
+        """
+        return float(self._decode_fps.value)
+
+    @decode_fps.setter
+    def decode_fps(self, value: float) -> None:
+        """Set the worker's target decode rate; takes effect on the next frame."""
+        self._decode_fps.value = float(value)
+
+    @property
+    def frame_ready(self) -> bool:
+        """Return whether the last grab() found a decoded frame."""
+        return self._frame_slot is not None
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Return the worker's process ID (None if no worker is running)."""
+        return self._process.pid if self._process is not None else None
+
+    def isOpened(self) -> bool:  # noqa: N802
+        """Return whether the stream is open in a live worker."""
+        return self._opened
+
+    def grab(self) -> bool:
+        """
+        Wait for the next decoded frame.
+
+        Frames that queued up while the caller was busy are skipped, so the
+        newest frame is the one retrieve() returns. While the worker is not
+        decoding, its periodic grab reports also end the wait, with
+        frame_ready False.
+
+        Returns:
+            True if a frame is ready or the worker reported a grab, False on
+            timeout, read failure or a worker crash
+        """
+        if not self._opened or self._conn is None:
+            return False
+
+        conn = self._conn
+        deadline = time.monotonic() + self._timeout_read
+        self._frame_slot = None
+        self.grabs, self.grab_seconds, self.decode_seconds = 0, 0.0, 0.0
+        grabbed = False
+        try:
+            while True:
+                wait = 0.0 if grabbed else deadline - time.monotonic()
+                if not conn.poll(max(0.0, wait)):
+                    return grabbed
+                result = self._receive(conn.recv())
+                if result is False and (not grabbed or not self._opened):
+                    return False
+                grabbed = grabbed or bool(result)
+        except (EOFError, OSError):
+            self._on_worker_exit()
+            return False
+
+    def _receive(self, message: tuple[Any, ...]) -> Optional[bool]:
+        """
+        Handle one message from the worker during grab().
+
+        Args:
+            message: Message tuple, tagged with its kind
+
+        Returns:
+            True for a decoded frame or a grab report, False for a failed
+            read, None for messages that do not end the wait
+        """
+        kind = message[0]
+        if kind == "frame":
+            self._frame_slot = message[2]
+            self.decode_seconds = message[3]
+        if kind in ("frame", "grabbed"):
+            self.grabs += message[-2]
+            self.grab_seconds += message[-1]
+            self._failed_restarts = 0
+            return True
+        if kind == "shape":
+            self._allocate_ring(message[1])
+        elif kind == "read_failed":
+            return False
+        elif kind == "failed":
+            # The worker gave up on the stream and exited
+            logger.warning(
+                f"Capture worker for {self.name} stopped after repeated read failures"
+            )
+            self.release()
+            return False
+        return None
+
+    def retrieve(
+        self, image: Optional[NDArray[np.uint8]] = None
+    ) -> tuple[bool, Optional[NDArray[np.uint8]]]:
+        """
+        Return the frame found by the last grab().
+
+        The slot is copied out of the ring: the worker keeps decoding into
+        the ring while consumers (subscriber queues, render jobs) hold the
+        frame, and a view would be overwritten under them.
+
+        Args:
+            image: Ignored; the frame is always a new array
+
+        Returns:
+            (True, read-only copy of the frame) or (False, None)
+        """
+        if self._frame_slot is None or self._ring is None:
+            return False, None
+        frame = self._ring.slot(self._frame_slot).copy()
+        frame.setflags(write=False)
+        return True, frame
+
+    def read(self) -> tuple[bool, Optional[NDArray[np.uint8]]]:
+        """Grab and retrieve the next frame."""
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop: int) -> float:
+        """
+        Return a stream property.
+
+        Args:
+            prop: cv2.CAP_PROP_FRAME_WIDTH, CAP_PROP_FRAME_HEIGHT or
+                CAP_PROP_FOURCC (other properties return 0)
+
+        Returns:
+            The property value
+        """
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._shape[1])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._shape[0])
+        if prop == cv2.CAP_PROP_FOURCC:
+            return float(self._fourcc)
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        """
+        Forward a property change to the worker's VideoCapture.
+
+        Args:
+            prop: cv2.CAP_PROP_* constant
+            value: New value
+
+        Returns:
+            True if the request was sent
+        """
+        if self._conn is None:
+            return False
+        try:
+            self._conn.send(("set", prop, value))
+            return True
+        except (EOFError, OSError):
+            return False
+
+    def release(self) -> None:
+        """Stop the worker (killing it if it is stuck) and free shared memory."""
+        self._opened = False
+        self._stop_worker()
+
+    def _start_worker(self) -> bool:
+        """
+        Start a worker and wait for it to open the stream.
+
+        Returns:
+            True if the stream opened
+        """
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        # BaseContext does not declare Process; every start-method context does
+        process_class: type[BaseProcess] = getattr(self._ctx, "Process")
+        process = process_class(
+            target=_capture_worker,
+            args=(self._url, self._params, child_conn, self._decode_fps),
+            name=f"CaptureWorker-{self.name}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+
+        try:
+            if not parent_conn.poll(self._timeout_open + WORKER_START_GRACE):
+                logger.error(f"Capture worker for {self.name} did not open in time")
+                self._stop_worker()
+                return False
+            message = parent_conn.recv()
+            if message[0] != "opened":
+                self._stop_worker()
+                return False
+            self._fourcc = message[2]
+            self._allocate_ring(message[1])
+        except (EOFError, OSError):
+            logger.error(
+                f"Capture worker for {self.name} exited while opening "
+                f"(exit code {process.exitcode})"
+            )
+            self._stop_worker()
+            return False
+
+        logger.debug(f"Capture worker {process.pid} opened {self.name}")
+        return True
+
+    def _allocate_ring(self, shape: tuple[int, ...]) -> None:
+        """Create a ring for frames of ``shape`` and hand it to the worker."""
+        assert self._conn is not None
+        old_ring = self._ring
+        self._ring = FrameRing.create(tuple(shape), self._slots)
+        self._shape = tuple(shape)
+        self._conn.send(("ring", self._ring.name, self._slots))
+        if old_ring is not None:
+            old_ring.close()
+
+    def _on_worker_exit(self) -> None:
+        """Log a dead worker and restart it unless it keeps dying."""
+        process = self._process
+        exitcode = None
+        if process is not None:
+            process.join(timeout=0.5)
+            exitcode = process.exitcode
+        self._stop_worker()
+
+        if self._failed_restarts >= self.max_restarts:
+            logger.error(
+                f"Capture worker for {self.name} exited (code {exitcode}) "
+                f"{self._failed_restarts + 1} times in a row; giving up"
+            )
+            self._opened = False
+            return
+
+        logger.warning(
+            f"Capture worker for {self.name} exited (code {exitcode}); restarting"
+        )
+        self._failed_restarts += 1
+        self.restarts += 1
+        self._opened = self._start_worker()
+
+    def _stop_worker(self) -> None:
+        """Stop the current worker and free its connection and ring."""
+        process, conn, ring = self._process, self._conn, self._ring
+        self._process = self._conn = self._ring = None
+        self._frame_slot = None
+
+        if conn is not None:
+            try:
+                conn.send(("stop",))
+            except (EOFError, OSError):
+                pass
+        if process is not None:
+            process.join(timeout=CAMERA_SETTINGS.stop_join_timeout)
+            if process.is_alive():
+                # Stuck in a read; the frames in flight are not worth waiting for
+                process.terminate()
+                process.join(timeout=CAMERA_SETTINGS.stop_join_timeout)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout=CAMERA_SETTINGS.stop_join_timeout)
+        if conn is not None:
+            conn.close()
+        if ring is not None:
+            ring.close()
+
+    def __repr__(self) -> str:
+        """Return string representation of the capture."""
+        return f"ProcessCapture(name={self.name!r}, pid={self.pid})"
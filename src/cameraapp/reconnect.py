@@ -0,0 +1,162 @@
+"""
+Reconnect scheduling module for CameraApp.
+
+One scheduler owns the retry timing of every camera: backoff delays are
+jittered so cameras that dropped together do not retry in lockstep, the
+number of streams being opened at once is bounded, and cameras that keep
+failing are retried slowly forever instead of being given up on.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from cameraapp.config import CAMERA_SETTINGS, LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+@dataclass
+class RetryState:
+    """
+    Retry bookkeeping for one camera.
+
+    Attributes:
+        attempts: Failed attempts since the last successful open
+        next_attempt: time.monotonic() of the scheduled attempt (None if idle)
+    """
+
+    attempts: int = 0
+    next_attempt: Optional[float] = None
+
+
+class ReconnectScheduler:
+    """
+    Thread-safe retry timing and open admission for all cameras.
+
+    The first ``max_retries`` attempts back off exponentially from
+    ``base_delay`` up to ``max_delay``; after that the camera is considered
+    offline and retried every ``offline_interval`` seconds. Every delay is
+    drawn uniformly from the upper half of its nominal value.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = CAMERA_SETTINGS.retry_delay_base,
+        max_delay: float = CAMERA_SETTINGS.max_retry_wait,
+        max_retries: int = CAMERA_SETTINGS.max_retries,
+        offline_interval: float = CAMERA_SETTINGS.offline_retry_interval,
+        max_concurrent_opens: int = CAMERA_SETTINGS.max_concurrent_opens,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            base_delay: Base of the exponential backoff in seconds
+            max_delay: Longest backoff delay in seconds
+            max_retries: Attempts before a camera is considered offline
+            offline_interval: Delay between attempts for offline cameras
+            max_concurrent_opens: Streams that may be opened at the same time
+            rng: Random source for the jitter (defaults to a private Random)
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.offline_interval = offline_interval
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._states: dict[Hashable, RetryState] = {}
+        self._open_slots = threading.BoundedSemaphore(max(1, max_concurrent_opens))
+
+    def schedule(self, key: Hashable) -> float:
+        """
+        Record a failed attempt and schedule the next one.
+
+        Args:
+            key: Camera to schedule
+
+        Returns:
+            Delay in seconds before the next attempt
+        """
+        with self._lock:
+            state = self._states.setdefault(key, RetryState())
+            state.attempts += 1
+            if state.attempts > self.max_retries:
+                nominal = self.offline_interval
+            else:
+                nominal = min(self.base_delay**state.attempts, self.max_delay)
+            delay = self._rng.uniform(nominal / 2, nominal)
+            state.next_attempt = time.monotonic() + delay
+
+        if state.attempts == self.max_retries + 1:
+            logger.warning(
+                f"{key} is offline after {self.max_retries} attempts; "
+                f"retrying every ~{self.offline_interval:.0f}s"
+            )
+        return delay
+
+    def reset(self, key: Hashable) -> None:
+        """
+        Clear the retry history of a camera (after it connected).
+
+        Args:
+            key: Camera to reset
+        """
+        with self._lock:
+            self._states.pop(key, None)
+
+    def attempts(self, key: Hashable) -> int:
+        """Return the failed attempts since the camera last connected."""
+        with self._lock:
+            state = self._states.get(key)
+            return state.attempts if state else 0
+
+    def next_attempt(self, key: Hashable) -> Optional[float]:
+        """
+        Return when the camera's next attempt is due.
+
+        Args:
+            key: Camera to look up
+
+        Returns:
+            time.monotonic() of the next attempt, or None if none is scheduled
+        """
+        with self._lock:
+            state = self._states.get(key)
+            return state.next_attempt if state else None
+
+    def is_offline(self, key: Hashable) -> bool:
+        """Return True once a camera has used up its backoff attempts."""
+        return self.attempts(key) > self.max_retries
+
+    @contextmanager
+    def open_slot(self, stopped: Optional[threading.Event] = None) -> Iterator[bool]:
+        """
+        Hold one of the concurrent open slots.
+
+        Args:
+            stopped: Event that abandons the wait when set
+
+        Yields:
+            True if a slot was acquired, False if ``stopped`` was set first
+        """
+        acquired = False
+        while not acquired and not (stopped is not None and stopped.is_set()):
+            acquired = self._open_slots.acquire(timeout=0.1)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._open_slots.release()
+
+
+# Global reconnect scheduler instance
+reconnect_scheduler = ReconnectScheduler()
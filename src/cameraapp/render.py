@@ -0,0 +1,523 @@
+"""
+Render preparation module for CameraApp.
+
+Draws captured BGR frames into preallocated RGBA tile buffers, either one
+per video tile (TileSurface) or one for the whole grid (MosaicCompositor).
+The heavy work (resize, colour conversion) runs on a worker pool so the Tk
+main thread only pushes finished buffers into its images.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+
+from cameraapp.config import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+ASPECT_RATIOS = {"4:3": 4 / 3, "16:9": 16 / 9}
+
+
+def fit_rect(
+    frame_width: int,
+    frame_height: int,
+    width: int,
+    height: int,
+    aspect_ratio: str,
+) -> tuple[int, int, int, int]:
+    """
+    Compute where a frame lands inside a tile.
+
+    Args:
+        frame_width: Source frame width
+        frame_height: Source frame height
+        width: Tile width in pixels
+        height: Tile height in pixels
+        aspect_ratio: Aspect ratio ("4:3", "16:9", or "fit")
+
+    Returns:
+        (left, top, new_width, new_height) of the image inside the tile
+    """
+    target_ratio = ASPECT_RATIOS.get(aspect_ratio)
+    if target_ratio is None:
+        # "fit" (or unknown) stretches to the whole tile
+        return 0, 0, width, height
+
+    # Calculate new dimensions maintaining ratio
+    new_width = width
+    new_height = int(new_width / target_ratio)
+
+    if new_height > height:
+        new_height = height
+        new_width = int(new_height * target_ratio)
+
+    new_width = max(1, new_width)
+    new_height = max(1, new_height)
+
+    return (width - new_width) // 2, (height - new_height) // 2, new_width, new_height
+
+
+def _interpolation(frame_width: int, new_width: int) -> int:
+    """Pick INTER_AREA for downscaling and INTER_LINEAR for upscaling."""
+    return cv2.INTER_LINEAR if new_width > frame_width else cv2.INTER_AREA
+
+
+@dataclass
+class PreparedTile:
+    """
+    Result of a render preparation job.
+
+    Attributes:
+        index: Tile index
+        seq: Sequence number of the source frame
+        result: Value returned by the job (whether the frame was drawn)
+        error: Exception raised while preparing, if any
+        duration: Time spent in the job in seconds
+    """
+
+    index: int
+    seq: int
+    result: Any = None
+    error: Optional[BaseException] = None
+    duration: float = 0.0
+
+
+class RenderPipeline:
+    """
+    Prepares tiles on a worker pool (cv2 releases the GIL while resizing).
+
+    At most one job per tile is in flight; a tile whose previous job has not
+    been collected yet is reported as busy so the caller can skip it and
+    pick up the newest frame on a later tick.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            max_workers: Worker threads (0 prepares synchronously in the caller)
+        """
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if max_workers > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="TileRender",
+            )
+        self._pending: dict[int, Future[PreparedTile]] = {}
+
+    def is_busy(self, index: int) -> bool:
+        """Return whether a job for the tile is still pending collection."""
+        return index in self._pending
+
+    def submit_call(
+        self,
+        index: int,
+        seq: int,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> bool:
+        """
+        Queue a preparation call (e.g. TileSurface.draw) for a tile.
+
+        The call's return value becomes PreparedTile.result.
+
+        Args:
+            index: Tile index
+            seq: Sequence number of the frame
+            func: Callable run on a worker thread
+            *args: Arguments for func
+
+        Returns:
+            False if the tile already has a job in flight
+        """
+        if index in self._pending:
+            return False
+
+        if self._executor is None:
+            future: Future[PreparedTile] = Future()
+            future.set_result(self._run(index, seq, func, args))
+        else:
+            future = self._executor.submit(self._run, index, seq, func, args)
+        self._pending[index] = future
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Return the number of jobs not yet collected."""
+        return len(self._pending)
+
+    def collect(self) -> list[PreparedTile]:
+        """
+        Return finished jobs, freeing their tiles for new submissions.
+
+        Returns:
+            Prepared tiles in tile order
+        """
+        done = [i for i, future in self._pending.items() if future.done()]
+        results = []
+        for index in sorted(done):
+            future = self._pending.pop(index)
+            results.append(future.result())
+        return results
+
+    def reset(self) -> None:
+        """Forget all pending jobs (e.g. after the tile layout changes)."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for queued jobs."""
+        self.reset()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _run(
+        index: int,
+        seq: int,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+    ) -> PreparedTile:
+        """Run one preparation call (runs on a worker thread)."""
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception as e:
+            return PreparedTile(
+                index=index, seq=seq, error=e, duration=time.perf_counter() - start
+            )
+        return PreparedTile(
+            index=index, seq=seq, result=result, duration=time.perf_counter() - start
+        )
+
+
+@dataclass(frozen=True)
+class TileRect:
+    """Position of a tile inside the mosaic."""
+
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def contains(self, x: int, y: int) -> bool:
+        """Return whether a point lies inside the tile."""
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+
+def grid_layout(
+    width: int,
+    height: int,
+    count: int,
+    columns: int,
+    gap: int = 2,
+) -> list[TileRect]:
+    """
+    Split an area into a grid of equally sized tiles.
+
+    Args:
+        width: Total width in pixels
+        height: Total height in pixels
+        count: Number of tiles
+        columns: Number of grid columns
+        gap: Pixels between tiles
+
+    Returns:
+        Tile rectangles in row-major order
+    """
+    if count <= 0:
+        return []
+
+    columns = max(1, columns)
+    rows = (count + columns - 1) // columns
+    tile_width = max(1, (width - gap * (columns - 1)) // columns)
+    tile_height = max(1, (height - gap * (rows - 1)) // rows)
+
+    return [
+        TileRect(
+            x=(i % columns) * (tile_width + gap),
+            y=(i // columns) * (tile_height + gap),
+            width=tile_width,
+            height=tile_height,
+        )
+        for i in range(count)
+    ]
+
+
+class TileSurface:
+    """
+    Draws frames into a fixed RGBA region without per-frame allocations.
+
+    The region is either a view into a larger buffer (a mosaic tile) or a
+    buffer owned by the surface. Resizing goes into a reused scratch buffer
+    and colour conversion writes straight into the region; both are only
+    reallocated when the tile geometry or aspect ratio changes.
+    """
+
+    def __init__(self, view: NDArray[np.uint8]) -> None:
+        """
+        Initialize a surface over an RGBA region.
+
+        Args:
+            view: Array of shape (height, width, 4) to draw into
+        """
+        self._view = view
+        self._image: Optional[Image.Image] = None
+        self._scratch: Optional[NDArray[np.uint8]] = None
+        self._target: Optional[NDArray[np.uint8]] = None
+        self._rect: Optional[tuple[int, int, int, int]] = None
+
+    @classmethod
+    def allocate(cls, width: int, height: int) -> "TileSurface":
+        """
+        Create a surface with its own opaque black buffer.
+
+        Args:
+            width: Tile width in pixels
+            height: Tile height in pixels
+
+        Returns:
+            The new surface
+        """
+        buffer = np.zeros((height, width, 4), dtype=np.uint8)
+        buffer[:, :, 3] = 255
+        return cls(buffer)
+
+    @property
+    def array(self) -> NDArray[np.uint8]:
+        """Return the RGBA array the surface draws into."""
+        return self._view
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Return the surface size as (width, height)."""
+        return self._view.shape[1], self._view.shape[0]
+
+    @property
+    def image(self) -> Image.Image:
+        """
+        Return a PIL image sharing memory with the surface.
+
+        Only valid for surfaces created with allocate() (contiguous buffers).
+        """
+        if self._image is None:
+            width, height = self.size
+            self._image = Image.frombuffer(
+                "RGBA", (width, height), self._view, "raw", "RGBA", 0, 1
+            )
+        return self._image
+
+    def clear(self) -> None:
+        """Paint the surface opaque black."""
+        self._view[:, :, :3] = 0
+        self._view[:, :, 3] = 255
+        self._rect = None
+        self._target = None
+
+    def draw(self, frame: NDArray[np.uint8], aspect_ratio: str) -> bool:
+        """
+        Draw a BGR frame into the surface, letterboxed as requested.
+
+        Args:
+            frame: Input BGR frame
+            aspect_ratio: Aspect ratio ("4:3", "16:9", or "fit")
+
+        Returns:
+            True if the frame was drawn
+        """
+        frame_height, frame_width = frame.shape[:2]
+        if frame_height == 0 or frame_width == 0:
+            return False
+
+        width, height = self.size
+        rect = fit_rect(frame_width, frame_height, width, height, aspect_ratio)
+        scratch = self._scratch
+        if rect != self._rect or self._target is None or scratch is None:
+            # Letterbox bars only need repainting when the image area moves
+            self.clear()
+            left, top, new_width, new_height = rect
+            self._rect = rect
+            self._target = self._view[top : top + new_height, left : left + new_width]
+            scratch = np.empty((new_height, new_width, 3), dtype=np.uint8)
+            self._scratch = scratch
+
+        _, _, new_width, new_height = rect
+        cv2.resize(
+            frame,
+            (new_width, new_height),
+            dst=scratch,
+            interpolation=_interpolation(frame_width, new_width),
+        )
+        cv2.cvtColor(scratch, cv2.COLOR_BGR2RGBA, dst=self._target)
+        return True
+
+
+class MosaicCompositor:
+    """
+    Composites every tile into one preallocated RGBA buffer.
+
+    Tiles are resized and colour-converted directly into their region of
+    the buffer, so the UI only has to push a single image per tick.
+    Different tiles cover disjoint regions and may be drawn concurrently.
+    """
+
+    def __init__(self, columns: int, gap: int = 2) -> None:
+        """
+        Initialize the compositor.
+
+        Args:
+            columns: Number of grid columns
+            gap: Pixels between tiles
+        """
+        self.columns = columns
+        self.gap = gap
+        self._surface: Optional[TileSurface] = None
+        self._tiles: list[TileRect] = []
+        self._surfaces: list[TileSurface] = []
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Return the mosaic size as (width, height)."""
+        if self._surface is None:
+            return 0, 0
+        return self._surface.size
+
+    @property
+    def tiles(self) -> list[TileRect]:
+        """Return the current tile layout."""
+        return self._tiles
+
+    @property
+    def image(self) -> Optional[Image.Image]:
+        """Return a PIL image sharing memory with the mosaic buffer."""
+        if self._surface is None:
+            return None
+        return self._surface.image
+
+    def configure(self, width: int, height: int, count: int) -> bool:
+        """
+        (Re)allocate the buffer and layout if the geometry changed.
+
+        Args:
+            width: Mosaic width in pixels
+            height: Mosaic height in pixels
+            count: Number of tiles
+
+        Returns:
+            True if the buffer was reallocated (all tiles must be redrawn)
+        """
+        if width <= 1 or height <= 1:
+            return False
+        if self.size == (width, height) and len(self._tiles) == count:
+            return False
+
+        self._surface = TileSurface.allocate(width, height)
+        buffer = self._surface.array
+        self._tiles = grid_layout(width, height, count, self.columns, self.gap)
+        self._surfaces = [
+            TileSurface(buffer[t.y : t.y + t.height, t.x : t.x + t.width])
+            for t in self._tiles
+        ]
+        return True
+
+    def tile_at(self, x: int, y: int) -> Optional[int]:
+        """Return the index of the tile under a point, if any."""
+        for index, tile in enumerate(self._tiles):
+            if tile.contains(x, y):
+                return index
+        return None
+
+    def clear_tile(self, index: int) -> None:
+        """Paint a tile opaque black."""
+        if 0 <= index < len(self._surfaces):
+            self._surfaces[index].clear()
+
+    def draw(
+        self,
+        index: int,
+        frame: NDArray[np.uint8],
+        aspect_ratio: str,
+    ) -> bool:
+        """
+        Draw a BGR frame into its tile, letterboxed as requested.
+
+        Args:
+            index: Tile index
+            frame: Input BGR frame
+            aspect_ratio: Aspect ratio ("4:3", "16:9", or "fit")
+
+        Returns:
+            True if the tile was drawn
+        """
+        if not 0 <= index < len(self._surfaces):
+            return False
+        return self._surfaces[index].draw(frame, aspect_ratio)
+
+
+class TickTimer:
+    """
+    Accumulates main-thread time per UI tick and logs periodic summaries.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float = 10.0,
+        log: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Initialize the timer.
+
+        Args:
+            name: Label used in the log line
+            interval: Seconds between summaries (0 disables logging)
+            log: Optional logger instance
+        """
+        self.name = name
+        self.interval = interval
+        self._logger = log or logger
+        self._reset(time.monotonic())
+
+    def _reset(self, now: float) -> None:
+        """Start a new summary window at ``now``."""
+        self._window_start = now
+        self.ticks = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.items = 0
+
+    def record(self, duration: float, items: int = 0) -> None:
+        """
+        Record one tick.
+
+        Args:
+            duration: Main-thread time spent in the tick, in seconds
+            items: Number of tiles updated in the tick
+        """
+        self.ticks += 1
+        self.total += duration
+        self.items += items
+        if duration > self.max:
+            self.max = duration
+
+        now = time.monotonic()
+        if self.interval > 0 and now - self._window_start >= self.interval:
+            self._logger.debug(
+                f"{self.name}: {self.ticks} ticks, "
+                f"avg {self.total / self.ticks * 1000:.2f} ms, "
+                f"max {self.max * 1000:.2f} ms, "
+                f"{self.items} tile updates"
+            )
+            self._reset(now)
@@ -3,24 +3,65 @@ Network scanner module for CameraApp.
 
 Provides ONVIF discovery and RTSP port scanning to find cameras on the network.
 Includes direct ONVIF probing for cameras with WS-Discovery disabled.
+
+Port scans run on one of two engines: "async" (the default) keeps a bounded
+window of non-blocking connects in flight on an asyncio event loop and
+generates targets lazily, so memory stays proportional to the window even
+for a /16; "thread" submits one blocking connect per (ip, port) to a
+thread pool. Unless a port list is given, scans are tiered: the liveness
+ports (NetworkSettings.scan_liveness_ports) are probed on every address and
+the vendor ports only on hosts that accepted or refused a connection, so
+empty addresses cost one timeout per liveness port instead of one per
+camera port. The kernel's neighbor table (the ARP cache) can order the
+addresses so known hosts and those with camera vendor MAC addresses
+(oui.py) come first, or limit the scan to them, and MAC vendors choose
+the RTSP URL patterns suggested for a camera. ONVIF is probed directly on
+every open HTTP port as soon as the port scan finds it, on a bounded pool
+that runs alongside the scan.
+
+iter_scan() runs a full scan in the background and yields each camera as
+soon as it is found, and again whenever it learns more about it, so callers
+can show results while the scan is still running.
 """
 
 from __future__ import annotations
 
+import asyncio
+import errno
+import http.client
 import ipaddress
 import logging
+import queue
 import re
+import shutil
 import socket
-import urllib.request
-import urllib.error
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field
-from typing import Callable, Optional
+import subprocess
+import threading
+import time
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from enum import Enum, auto
+from typing import Callable, Optional, Union
+
+from cameraapp.config import LOGGER_NAME, NETWORK_SETTINGS
+from cameraapp.oui import VENDOR_NAMES, lookup_vendor
 
-from cameraapp.config import LOGGER_NAME
+try:
+    import resource
+
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
 
 logger = logging.getLogger(LOGGER_NAME)
 
+# File descriptors left for the rest of the process by the async engine
+RESERVED_FDS = 64
+
+# The kernel's IPv4 neighbor table on Linux
+ARP_TABLE_PATH = "/proc/net/arp"
+
 # Common camera ports
 CAMERA_PORTS = {
     554: "RTSP",
@@ -34,6 +75,9 @@ CAMERA_PORTS = {
     34567: "DVR Generic",
 }
 
+# Ports from CAMERA_PORTS that may serve ONVIF over HTTP
+ONVIF_HTTP_PORTS = (80, 8080, 8000, 8899)
+
 # Common RTSP URL patterns by manufacturer
 RTSP_URL_PATTERNS = {
     "hikvision": [
@@ -61,6 +105,13 @@ RTSP_URL_PATTERNS = {
         "/Streaming/Channels/101",
         "/stream1",
     ],
+    "axis": [
+        "/axis-media/media.amp",
+    ],
+    "uniview": [
+        "/media/video1",
+        "/unicast/c1/s0/live",
+    ],
 }
 
 # ONVIF SOAP templates
@@ -94,6 +145,14 @@ ONVIF_GET_STREAM_URI = '''<?xml version="1.0" encoding="UTF-8"?>
 </s:Envelope>'''
 
 
+class PortState(Enum):
+    """Outcome of a port probe."""
+
+    OPEN = auto()  # Connection accepted
+    CLOSED = auto()  # Connection refused: the host is up
+    SILENT = auto()  # No answer (timeout, unreachable or error)
+
+
 @dataclass
 class ONVIFInfo:
     """Information retrieved from ONVIF device."""
@@ -119,6 +178,7 @@ class DiscoveredCamera:
     rtsp_urls: list[str] = field(default_factory=list)
     onvif_available: bool = False
     onvif_info: Optional[ONVIFInfo] = None
+    mac: str = ""  # From the neighbor table, if the camera is on the segment
 
     def get_suggested_rtsp_url(self, username: str = "", password: str = "") -> str:
         """Get the most likely RTSP URL for this camera."""
@@ -138,6 +198,13 @@ class DiscoveredCamera:
             return url
         return ""
 
+    def snapshot(self) -> DiscoveredCamera:
+        """Return a copy with its own lists and RTSP URL suggestions filled in."""
+        camera = replace(self, ports=list(self.ports), rtsp_urls=list(self.rtsp_urls))
+        if not camera.rtsp_urls:
+            camera._generate_rtsp_urls()
+        return camera
+
     def _generate_rtsp_urls(self) -> None:
         """Generate possible RTSP URLs based on detected manufacturer."""
         # If we have ONVIF-discovered URL, use it first
@@ -160,29 +227,38 @@ class DiscoveredCamera:
         if port != 554:
             base = f"rtsp://{self.ip}:{port}"
 
-        # Determine manufacturer from ports or ONVIF info
+        patterns = self._detect_rtsp_patterns()
+        self.rtsp_urls = [f"{base}{pattern}" for pattern in patterns]
+
+    def _detect_rtsp_patterns(self) -> list[str]:
+        """Pick RTSP URL patterns (and manufacturer) from MAC, ports or ONVIF."""
+        vendor = lookup_vendor(self.mac) if self.mac else None
+        if vendor:
+            if self.manufacturer in ("", "Unknown"):
+                self.manufacturer = VENDOR_NAMES[vendor]
+            return RTSP_URL_PATTERNS[vendor]
         if self.onvif_available and not self.manufacturer:
             self.manufacturer = "ONVIF"
-            patterns = RTSP_URL_PATTERNS["onvif"]
-        elif 8000 in self.ports:
+            return RTSP_URL_PATTERNS["onvif"]
+        if 8000 in self.ports:
             self.manufacturer = "Hikvision"
-            patterns = RTSP_URL_PATTERNS["hikvision"]
-        elif 37777 in self.ports:
+            return RTSP_URL_PATTERNS["hikvision"]
+        if 37777 in self.ports:
             self.manufacturer = "Dahua"
-            patterns = RTSP_URL_PATTERNS["dahua"]
-        elif 8899 in self.ports:
+            return RTSP_URL_PATTERNS["dahua"]
+        if 8899 in self.ports:
             self.manufacturer = "Intelbras"
-            patterns = RTSP_URL_PATTERNS["intelbras"]
-        else:
-            patterns = RTSP_URL_PATTERNS["generic"]
-
-        self.rtsp_urls = [f"{base}{pattern}" for pattern in patterns]
+            return RTSP_URL_PATTERNS["intelbras"]
+        return RTSP_URL_PATTERNS["generic"]
 
 
 class ONVIFProber:
     """
     Probes cameras directly via ONVIF HTTP/SOAP.
     Works even when WS-Discovery is disabled.
+
+    All requests of one probe (device information, profiles and stream URI)
+    share a single keep-alive HTTP connection to the device.
     """
 
     ONVIF_PATHS = [
@@ -211,43 +287,70 @@ class ONVIFProber:
         Returns:
             ONVIFInfo if ONVIF is available, None otherwise
         """
-        # Try to get device info
-        for path in self.ONVIF_PATHS:
-            url = f"http://{ip}:{port}{path}"
-            response = self._soap_request(url, ONVIF_DEVICE_INFO)
-            if response and "GetDeviceInformationResponse" in response:
-                info = self._parse_device_info(response)
+        conn = http.client.HTTPConnection(ip, port, timeout=self.timeout)
+        try:
+            # Try to get device info
+            for path in self.ONVIF_PATHS:
+                response = self._soap_request(conn, path, ONVIF_DEVICE_INFO)
+                if response and "GetDeviceInformationResponse" in response:
+                    info = self._parse_device_info(response)
+
+                    # Try to get RTSP URL
+                    rtsp_url = self._get_rtsp_url(conn)
+                    if rtsp_url:
+                        info.rtsp_url = rtsp_url
+
+                    logger.info(f"ONVIF direct probe success: {ip}:{port}")
+                    return info
+        except OSError as e:
+            # No HTTP server answering: the other paths would fail the same way
+            logger.debug(f"ONVIF direct probe of {ip}:{port} failed: {e}")
+        finally:
+            conn.close()
 
-                # Try to get RTSP URL
-                rtsp_url = self._get_rtsp_url(ip, port)
-                if rtsp_url:
-                    info.rtsp_url = rtsp_url
+        return None
 
-                logger.info(f"ONVIF direct probe success: {ip}:{port}")
-                return info
+    def _soap_request(
+        self, conn: http.client.HTTPConnection, path: str, body: str
+    ) -> Optional[str]:
+        """
+        Send a SOAP request on a keep-alive connection and return the response.
 
-        return None
+        Args:
+            conn: Connection to the device, reopened if the device closed it
+            path: Service path
+            body: SOAP envelope
 
-    def _soap_request(self, url: str, body: str) -> Optional[str]:
-        """Send SOAP request and return response."""
-        try:
-            headers = {
-                "Content-Type": "application/soap+xml; charset=utf-8",
-                "User-Agent": "CameraApp/1.0",
-            }
-            req = urllib.request.Request(
-                url,
-                data=body.encode("utf-8"),
-                headers=headers,
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                return resp.read().decode("utf-8", errors="ignore")
-        except (urllib.error.URLError, urllib.error.HTTPError, socket.timeout):
-            return None
-        except Exception as e:
-            logger.debug(f"SOAP request error to {url}: {e}")
-            return None
+        Returns:
+            Response body, or None on an HTTP error status or invalid response
+
+        Raises:
+            OSError: If the device cannot be reached
+        """
+        headers = {
+            "Content-Type": "application/soap+xml; charset=utf-8",
+            "User-Agent": "CameraApp/1.0",
+        }
+        # A reused connection may have been closed by the device meanwhile
+        attempts = 2 if conn.sock is not None else 1
+        for attempt in range(attempts):
+            try:
+                conn.request("POST", path, body=body.encode("utf-8"), headers=headers)
+                resp = conn.getresponse()
+                data = resp.read().decode("utf-8", errors="ignore")
+            except ConnectionError:
+                conn.close()
+                if attempt + 1 < attempts:
+                    continue
+                raise
+            except http.client.HTTPException as e:
+                conn.close()
+                logger.debug(f"SOAP request error to {conn.host}{path}: {e}")
+                return None
+            if resp.status >= 400:
+                return None
+            return data
+        return None
 
     def _parse_device_info(self, response: str) -> ONVIFInfo:
         """Parse ONVIF GetDeviceInformationResponse."""
@@ -269,12 +372,19 @@ class ONVIFProber:
 
         return info
 
-    def _get_rtsp_url(self, ip: str, port: int = 80) -> Optional[str]:
+    def _get_rtsp_url(self, conn: http.client.HTTPConnection) -> Optional[str]:
         """Get RTSP URL via ONVIF media service."""
+        try:
+            return self._request_rtsp_url(conn)
+        except OSError as e:
+            logger.debug(f"ONVIF media request to {conn.host} failed: {e}")
+            return None
+
+    def _request_rtsp_url(self, conn: http.client.HTTPConnection) -> Optional[str]:
+        """Query the media service for the first profile's stream URI."""
         # First get profiles
         for media_path in self.MEDIA_PATHS:
-            url = f"http://{ip}:{port}{media_path}"
-            response = self._soap_request(url, ONVIF_GET_PROFILES)
+            response = self._soap_request(conn, media_path, ONVIF_GET_PROFILES)
             if response and "Profiles" in response:
                 # Extract first profile token
                 match = re.search(r'token="([^"]+)"', response)
@@ -288,7 +398,9 @@ class ONVIFProber:
                     stream_request = ONVIF_GET_STREAM_URI.format(
                         profile_token=profile_token
                     )
-                    stream_response = self._soap_request(url, stream_request)
+                    stream_response = self._soap_request(
+                        conn, media_path, stream_request
+                    )
 
                     if stream_response:
                         uri_match = re.search(
@@ -312,18 +424,49 @@ class NetworkScanner:
         timeout: float = 1.0,
         max_workers: int = 100,
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        engine: str = NETWORK_SETTINGS.scan_engine,
+        concurrency: int = NETWORK_SETTINGS.scan_concurrency,
+        progress_interval: float = NETWORK_SETTINGS.scan_progress_interval,
+        onvif_workers: int = NETWORK_SETTINGS.onvif_probe_workers,
+        liveness_ports: Iterable[int] = NETWORK_SETTINGS.scan_liveness_ports,
+        vendor_ports: Iterable[int] = NETWORK_SETTINGS.scan_vendor_ports,
+        neighbor_mode: str = NETWORK_SETTINGS.scan_neighbor_mode,
     ) -> None:
         """
         Initialize the network scanner.
 
         Args:
             timeout: Connection timeout in seconds
-            max_workers: Maximum concurrent threads
+            max_workers: Maximum concurrent threads (thread engine)
             progress_callback: Optional callback(current, total, message)
+            engine: Port scan engine, "async" or "thread"
+            concurrency: Maximum port probes in flight (async engine)
+            progress_interval: Minimum seconds between progress reports
+                (phase starts and ends are always reported)
+            onvif_workers: Maximum direct ONVIF probes running at once
+            liveness_ports: Ports probed on every address by scan_ports()
+            vendor_ports: Ports probed only on hosts that answered on a
+                liveness port
+            neighbor_mode: Use of the neighbor table by scan_ports(): "order"
+                (known hosts first), "prune" (only known hosts) or "off"
         """
+        if engine not in ("async", "thread"):
+            raise ValueError(f"Unknown scan engine: {engine!r}")
+        if neighbor_mode not in ("order", "prune", "off"):
+            raise ValueError(f"Unknown neighbor mode: {neighbor_mode!r}")
         self.timeout = timeout
         self.max_workers = max_workers
         self.progress_callback = progress_callback
+        self.engine = engine
+        self.concurrency = max(1, concurrency)
+        self.progress_interval = progress_interval
+        self.onvif_workers = max(1, onvif_workers)
+        self.liveness_ports = list(liveness_ports)
+        self.vendor_ports = [p for p in vendor_ports if p not in self.liveness_ports]
+        self.neighbor_mode = neighbor_mode
+        self.probes_sent = 0  # Connection attempts of the last port scan
+        self.probes_saved = 0  # Attempts the tiers avoided in that scan
+        self._last_progress = 0.0
         self._stop_requested = False
         self._onvif_prober = ONVIFProber(timeout=3.0)
 
@@ -334,17 +477,35 @@ class NetworkScanner:
     def _report_progress(self, current: int, total: int, message: str = "") -> None:
         """Report progress to callback if set."""
         if self.progress_callback:
+            self._last_progress = time.monotonic()
             try:
                 self.progress_callback(current, total, message)
             except Exception:
                 pass
 
-    def discover_onvif(self, timeout: int = 10) -> list[DiscoveredCamera]:
+    def _emit_camera(
+        self,
+        on_camera: Optional[Callable[[DiscoveredCamera], None]],
+        camera: DiscoveredCamera,
+    ) -> None:
+        """Pass a snapshot of a new or updated camera to a callback if set."""
+        if on_camera:
+            try:
+                on_camera(camera.snapshot())
+            except Exception as e:
+                logger.debug(f"Camera callback error: {e}")
+
+    def discover_onvif(
+        self,
+        timeout: int = 10,
+        on_camera: Optional[Callable[[DiscoveredCamera], None]] = None,
+    ) -> list[DiscoveredCamera]:
         """
         Discover cameras using ONVIF WS-Discovery.
 
         Args:
             timeout: Discovery timeout in seconds
+            on_camera: Optional callback(camera) for each camera as it is found
 
         Returns:
             List of discovered cameras
@@ -400,6 +561,7 @@ class NetworkScanner:
                     )
                     cameras.append(camera)
                     logger.info(f"ONVIF WS-Discovery found: {ip}")
+                    self._emit_camera(on_camera, camera)
 
             wsd.stop()
 
@@ -472,121 +634,391 @@ class NetworkScanner:
         ip_range: str,
         ports: Optional[list[int]] = None,
         probe_onvif: bool = True,
+        on_camera: Optional[Callable[[DiscoveredCamera], None]] = None,
     ) -> list[DiscoveredCamera]:
         """
         Scan a range of IPs for camera ports.
 
         Args:
             ip_range: IP range in CIDR notation (e.g., "192.168.0.0/24")
-            ports: List of ports to scan (default: common camera ports)
-            probe_onvif: Whether to probe ONVIF on port 80 (default True)
+            ports: Ports to probe on every address (default: the liveness
+                ports on every address, then the vendor ports on hosts
+                that answered)
+            probe_onvif: Whether to probe ONVIF on open HTTP ports (default
+                True); probes start as soon as a port is found
+            on_camera: Optional callback(camera) called with a snapshot of a
+                camera when it is found and whenever it gains a port or
+                ONVIF information
 
         Returns:
             List of discovered cameras
         """
         if ports is None:
-            ports = list(CAMERA_PORTS.keys())
+            tiers = [self.liveness_ports, self.vendor_ports]
+        else:
+            tiers = [list(ports)]
+        port_count = sum(len(tier) for tier in tiers)
+
+        ip_count = self._count_ip_range(ip_range)
+        neighbors, prune = self._scan_neighbors(ip_range)
+        addresses = self._scan_order(ip_range, neighbors, prune)
+        scan_count = len(neighbors) if prune else ip_count
+        total_scans = scan_count * len(tiers[0])
+        targets = ((ip, port) for ip in addresses for port in tiers[0])
+
+        logger.info(
+            f"Scanning {scan_count} IPs on {port_count} ports ({self.engine} engine)"
+        )
+        self._report_progress(0, total_scans, f"Escaneando {scan_count} IPs...")
 
-        ips = self._parse_ip_range(ip_range)
-        total_scans = len(ips) * len(ports)
+        found_cameras: dict[str, DiscoveredCamera] = {}
+        # Insertion-ordered set; hosts in the neighbor table are known to exist
+        alive_hosts: dict[str, None] = dict.fromkeys(neighbors)
+        lock = threading.Lock()
+        onvif_probes: dict[tuple[str, int], Future[None]] = {}
+        onvif_pool = (
+            ThreadPoolExecutor(
+                max_workers=self.onvif_workers, thread_name_prefix="ONVIFProbe"
+            )
+            if probe_onvif
+            else None
+        )
 
-        logger.info(f"Scanning {len(ips)} IPs on {len(ports)} ports")
-        self._report_progress(0, total_scans, f"Escaneando {len(ips)} IPs...")
+        def on_refused(ip: str) -> None:
+            alive_hosts[ip] = None
 
-        found_cameras: dict[str, DiscoveredCamera] = {}
-        ips_with_port_80: list[str] = []
-        completed = 0
+        def on_open(ip: str, port: int) -> None:
+            alive_hosts[ip] = None
+            with lock:
+                if ip not in found_cameras:
+                    found_cameras[ip] = DiscoveredCamera(
+                        ip=ip,
+                        ports=[],
+                        source="scan",
+                        mac=neighbors.get(ip, ""),
+                    )
+                found_cameras[ip].ports.append(port)
+                logger.info(f"Found open port: {ip}:{port}")
+                self._emit_camera(on_camera, found_cameras[ip])
+
+            # Probe ONVIF on HTTP ports right away, alongside the port scan
+            if onvif_pool and port in ONVIF_HTTP_PORTS and not self._stop_requested:
+                onvif_probes[(ip, port)] = onvif_pool.submit(
+                    self._probe_found_camera, found_cameras[ip], port, lock, on_camera
+                )
+
+        try:
+            # Phase 1: Port scan, each tier only on hosts the previous ones found
+            self._scan_targets(targets, total_scans, on_open, on_refused)
+            probes_sent = total_scans + self._scan_live_hosts(
+                ip_range, tiers[1:], neighbors, alive_hosts, on_open, on_refused
+            )
+
+            self.probes_sent = probes_sent
+            self.probes_saved = ip_count * port_count - probes_sent
+            if len(tiers) > 1:
+                logger.info(
+                    f"Tiered scan: {len(alive_hosts)} live hosts, "
+                    f"{probes_sent} connection attempts, "
+                    f"{self.probes_saved} saved"
+                )
+
+            # Phase 2: Wait for the ONVIF probes still running
+            self._wait_for_onvif_probes(list(onvif_probes.values()))
+        finally:
+            if onvif_pool:
+                onvif_pool.shutdown(wait=False, cancel_futures=True)
+
+        cameras = list(found_cameras.values())
+        self._complete_cameras(cameras, neighbors)
+
+        message = f"Scan completo: {len(cameras)} dispositivo(s)"
+        if self.probes_saved:
+            message += f", {self.probes_saved} conexões evitadas"
+        self._report_progress(total_scans, total_scans, message)
+
+        return cameras
+
+    def _scan_neighbors(self, ip_range: str) -> tuple[dict[str, str], bool]:
+        """
+        Read the neighbor table entries a port scan of a range starts from.
+
+        Returns:
+            The entries inside the range (IP -> MAC) and whether the scan
+            should be limited to them
+        """
+        neighbors: dict[str, str] = {}
+        if self.neighbor_mode != "off":
+            neighbors = self._neighbors_in_range(ip_range)
+        prune = self.neighbor_mode == "prune"
+        if prune and not neighbors:
+            logger.warning("No known hosts in the neighbor table, scanning all")
+            prune = False
+        return neighbors, prune
+
+    @staticmethod
+    def _complete_cameras(
+        cameras: list[DiscoveredCamera], neighbors: dict[str, str]
+    ) -> None:
+        """Fill in MAC addresses and RTSP URLs the scan did not find."""
+        for camera in cameras:
+            if not camera.mac and camera.ip in neighbors:
+                camera.mac = neighbors[camera.ip]
+            # Generate RTSP URLs for cameras without ONVIF
+            if not camera.rtsp_urls:
+                camera._generate_rtsp_urls()
+
+    def _scan_live_hosts(
+        self,
+        ip_range: str,
+        tiers: list[list[int]],
+        neighbors: dict[str, str],
+        alive_hosts: dict[str, None],
+        on_open: Callable[[str, int], None],
+        on_refused: Callable[[str], None],
+    ) -> int:
+        """
+        Probe the later port tiers on the hosts found alive so far.
+
+        Args:
+            ip_range: IP range being scanned
+            tiers: Port tiers after the first one
+            neighbors: Neighbor table entries in the range (updated in place)
+            alive_hosts: Hosts known to exist (updated in place)
+            on_open: Called with (ip, port) for every open port
+            on_refused: Called with the IP of every refused connection
+
+        Returns:
+            Number of connection attempts made
+        """
+        probes_sent = 0
+        if self.neighbor_mode == "order" and not self._stop_requested:
+            # The scan filled the neighbor table with every host that
+            # answered ARP, including those silent on the liveness ports
+            neighbors.update(self._neighbors_in_range(ip_range))
+            alive_hosts.update(dict.fromkeys(neighbors))
+        for tier in tiers:
+            if not tier or not alive_hosts or self._stop_requested:
+                break
+            hosts = list(alive_hosts)
+            tier_scans = len(hosts) * len(tier)
+            self._report_progress(
+                0, tier_scans, f"Escaneando {len(hosts)} hosts ativos..."
+            )
+            self._scan_targets(
+                ((ip, port) for ip in hosts for port in tier),
+                tier_scans,
+                on_open,
+                on_refused,
+            )
+            probes_sent += tier_scans
+        return probes_sent
+
+    def _probe_found_camera(
+        self,
+        camera: DiscoveredCamera,
+        port: int,
+        lock: threading.Lock,
+        on_camera: Optional[Callable[[DiscoveredCamera], None]],
+    ) -> None:
+        """Probe ONVIF on an open port of a camera found by the port scan."""
+        with lock:
+            if self._stop_requested or camera.onvif_info:
+                return  # Already identified through another port
+        try:
+            onvif_camera = self.probe_onvif_direct(camera.ip, port)
+        except Exception as e:
+            logger.debug(f"ONVIF direct probe error on {camera.ip}:{port}: {e}")
+            return
+        if not onvif_camera:
+            return
+        with lock:
+            # Update existing camera with ONVIF info
+            if camera.onvif_info:
+                return
+            camera.onvif_available = True
+            camera.onvif_info = onvif_camera.onvif_info
+            camera.source = "onvif_direct"
+            camera.manufacturer = onvif_camera.manufacturer or camera.manufacturer
+            camera.model = onvif_camera.model
+            camera.firmware = onvif_camera.firmware
+            if onvif_camera.rtsp_urls:
+                camera.rtsp_urls = onvif_camera.rtsp_urls
+            # Add port 554 if not present
+            if 554 not in camera.ports:
+                camera.ports.append(554)
+            self._emit_camera(on_camera, camera)
+
+    def _wait_for_onvif_probes(self, probes: list[Future[None]]) -> None:
+        """Wait for the ONVIF probes still running, reporting progress."""
+        pending = [f for f in probes if not f.done()]
+        if not pending or self._stop_requested:
+            return
+        total_probes = len(probes)
+        done = total_probes - len(pending)
+        self._report_progress(
+            done,
+            total_probes,
+            f"Verificando ONVIF em {len(pending)} dispositivos...",
+        )
+        for _ in as_completed(pending):
+            if self._stop_requested:
+                break
+            done += 1
+            if self._progress_due(done, total_probes):
+                self._report_progress(
+                    done,
+                    total_probes,
+                    f"Verificando ONVIF... ({done}/{total_probes})",
+                )
+
+    def _progress_due(self, current: int, total: int) -> bool:
+        """Return whether a report of step ``current`` should be sent now."""
+        if not self.progress_callback:
+            return False
+        if current >= total:
+            return True
+        return time.monotonic() - self._last_progress >= self.progress_interval
+
+    def _report_scan_progress(self, completed: int, total: int) -> None:
+        """Report port scan progress at most every progress_interval."""
+        if self._progress_due(completed, total):
+            self._report_progress(
+                completed, total, f"Escaneando portas... {completed}/{total}"
+            )
+
+    def _scan_targets(
+        self,
+        targets: Iterable[tuple[str, int]],
+        total: int,
+        on_open: Callable[[str, int], None],
+        on_refused: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Probe targets on the configured engine."""
+        if self.engine == "async":
+            asyncio.run(self._scan_targets_async(targets, total, on_open, on_refused))
+        else:
+            self._scan_targets_threaded(targets, total, on_open, on_refused)
+
+    def _scan_targets_threaded(
+        self,
+        targets: Iterable[tuple[str, int]],
+        total: int,
+        on_open: Callable[[str, int], None],
+        on_refused: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Probe targets with blocking connects on a thread pool.
 
-        # Phase 1: Port scan
+        One future is created per target up front.
+
+        Args:
+            targets: (ip, port) pairs to probe
+            total: Number of targets, for progress reports
+            on_open: Called with (ip, port) for every open port
+            on_refused: Optional callback(ip) for every refused connection
+        """
+        completed = 0
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {}
 
-            for ip in ips:
+            for ip, port in targets:
                 if self._stop_requested:
                     break
-                for port in ports:
-                    future = executor.submit(self._check_port, ip, port)
-                    futures[future] = (ip, port)
+                future = executor.submit(self._check_port, ip, port)
+                futures[future] = (ip, port)
 
             for future in as_completed(futures):
                 if self._stop_requested:
                     break
 
                 completed += 1
-                if completed % 100 == 0 or completed == total_scans:
-                    self._report_progress(
-                        completed, total_scans,
-                        f"Escaneando portas... {completed}/{total_scans}"
-                    )
-
-                result = future.result()
-                if result:
-                    ip, port = result
-                    if ip not in found_cameras:
-                        found_cameras[ip] = DiscoveredCamera(
-                            ip=ip,
-                            ports=[],
-                            source="scan",
-                        )
-                    found_cameras[ip].ports.append(port)
-                    logger.info(f"Found open port: {ip}:{port}")
+                self._report_scan_progress(completed, total)
 
-                    # Track IPs with port 80 for ONVIF probing
-                    if port == 80 and ip not in ips_with_port_80:
-                        ips_with_port_80.append(ip)
+                state = future.result()
+                if state is PortState.OPEN:
+                    on_open(*futures[future])
+                elif state is PortState.CLOSED and on_refused:
+                    on_refused(futures[future][0])
 
-        # Phase 2: ONVIF direct probe on devices with port 80
-        if probe_onvif and ips_with_port_80 and not self._stop_requested:
-            self._report_progress(
-                0, len(ips_with_port_80),
-                f"Verificando ONVIF em {len(ips_with_port_80)} dispositivos..."
-            )
-
-            for i, ip in enumerate(ips_with_port_80):
-                if self._stop_requested:
-                    break
-
-                self._report_progress(
-                    i + 1, len(ips_with_port_80),
-                    f"Verificando ONVIF: {ip} ({i+1}/{len(ips_with_port_80)})"
-                )
+    async def _scan_targets_async(
+        self,
+        targets: Iterable[tuple[str, int]],
+        total: int,
+        on_open: Callable[[str, int], None],
+        on_refused: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Probe targets with non-blocking connects on the running event loop.
 
-                onvif_camera = self.probe_onvif_direct(ip)
-                if onvif_camera:
-                    # Update existing camera with ONVIF info
-                    if ip in found_cameras:
-                        cam = found_cameras[ip]
-                        cam.onvif_available = True
-                        cam.onvif_info = onvif_camera.onvif_info
-                        cam.source = "onvif_direct"
-                        cam.manufacturer = onvif_camera.manufacturer or cam.manufacturer
-                        cam.model = onvif_camera.model
-                        cam.firmware = onvif_camera.firmware
-                        if onvif_camera.rtsp_urls:
-                            cam.rtsp_urls = onvif_camera.rtsp_urls
-                        # Add port 554 if not present
-                        if 554 not in cam.ports:
-                            cam.ports.append(554)
-                    else:
-                        found_cameras[ip] = onvif_camera
-
-        # Generate RTSP URLs for cameras without ONVIF
-        cameras = list(found_cameras.values())
-        for camera in cameras:
-            if not camera.rtsp_urls:
-                camera._generate_rtsp_urls()
+        A fixed set of ``concurrency`` probe loops share one target
+        iterator, so targets are generated only as probes finish and at
+        most that many sockets exist at any time.
 
-        self._report_progress(
-            total_scans, total_scans,
-            f"Scan completo: {len(cameras)} dispositivo(s)"
-        )
+        Args:
+            targets: (ip, port) pairs to probe
+            total: Number of targets, for progress reports
+            on_open: Called with (ip, port) for every open port
+            on_refused: Optional callback(ip) for every refused connection
+        """
+        target_iter = iter(targets)
+        completed = 0
 
-        return cameras
+        async def probe_loop() -> None:
+            nonlocal completed
+            for ip, port in target_iter:
+                if self._stop_requested:
+                    return
+                state = await self._probe_port(ip, port)
+                completed += 1
+                self._report_scan_progress(completed, total)
+                if state is PortState.OPEN:
+                    on_open(ip, port)
+                elif state is PortState.CLOSED and on_refused:
+                    on_refused(ip)
+
+        loops = [
+            asyncio.ensure_future(probe_loop()) for _ in range(self._async_window())
+        ]
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            for loop_task in loops:
+                loop_task.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+
+    def _async_window(self) -> int:
+        """Return the async engine's window, kept within the open-file limit."""
+        window = self.concurrency
+        if RESOURCE_AVAILABLE:
+            soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if soft_limit != resource.RLIM_INFINITY:
+                window = min(window, max(1, soft_limit - RESERVED_FDS))
+        return window
+
+    async def _probe_port(self, ip: str, port: int) -> PortState:
+        """Check if a port is open on an IP without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        try:
+            family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError:
+            return PortState.SILENT
+        try:
+            sock.setblocking(False)
+            await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), self.timeout)
+            return PortState.OPEN
+        except ConnectionRefusedError:
+            return PortState.CLOSED
+        except (OSError, asyncio.TimeoutError):
+            return PortState.SILENT
+        finally:
+            sock.close()
 
-    def _check_port(self, ip: str, port: int) -> Optional[tuple[str, int]]:
+    def _check_port(self, ip: str, port: int) -> PortState:
         """Check if a port is open on an IP."""
         if self._stop_requested:
-            return None
+            return PortState.SILENT
 
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -594,51 +1026,139 @@ class NetworkScanner:
             result = sock.connect_ex((ip, port))
             sock.close()
             if result == 0:
-                return (ip, port)
+                return PortState.OPEN
+            if result == errno.ECONNREFUSED:
+                return PortState.CLOSED
         except Exception:
             pass
-        return None
+        return PortState.SILENT
 
     def _parse_ip_range(self, ip_range: str) -> list[str]:
         """Parse an IP range string to list of IPs."""
-        ips = []
+        return list(self._iter_ip_range(ip_range))
+
+    def _neighbors_in_range(self, ip_range: str) -> dict[str, str]:
+        """Return the neighbor table entries (IP -> MAC) inside an IP range."""
+        table = read_neighbor_table()
+        if not table:
+            return {}
+        # The table is small; test its entries instead of walking the range
+        in_range = self._ip_range_filter(ip_range)
+        neighbors = {ip: mac for ip, mac in table.items() if in_range(ip)}
+        vendors = sum(1 for mac in neighbors.values() if lookup_vendor(mac))
+        logger.info(
+            f"Neighbor table: {len(neighbors)} known hosts in range, "
+            f"{vendors} with camera vendor MAC addresses"
+        )
+        return neighbors
+
+    def _scan_order(
+        self, ip_range: str, neighbors: dict[str, str], prune: bool
+    ) -> Iterator[str]:
+        """
+        Yield the addresses of a range in scan order.
+
+        Known hosts with camera vendor MAC addresses come first, then the
+        other known hosts, then (unless pruning) the rest of the range.
+        """
+        yield from sorted(
+            neighbors, key=lambda ip: lookup_vendor(neighbors[ip]) is None
+        )
+        if not prune:
+            for ip in self._iter_ip_range(ip_range):
+                if ip not in neighbors:
+                    yield ip
 
+    def _count_ip_range(self, ip_range: str) -> int:
+        """Return how many IPs _iter_ip_range() yields, without listing them."""
+        try:
+            network = ipaddress.ip_network(ip_range, strict=False)
+        except ValueError:
+            return sum(1 for _ in self._iter_ip_range(ip_range))
+        # hosts() skips the network and broadcast addresses (IPv4) or the
+        # subnet-router anycast address (IPv6) except in the smallest networks
+        if network.version == 4:
+            reserved = 2 if network.prefixlen < 31 else 0
+        else:
+            reserved = 1 if network.prefixlen < 127 else 0
+        return network.num_addresses - reserved
+
+    def _iter_ip_range(self, ip_range: str) -> Iterator[str]:
+        """Yield the IPs of an IP range string one at a time."""
         try:
             # Try CIDR notation
             network = ipaddress.ip_network(ip_range, strict=False)
-            for ip in network.hosts():
-                ips.append(str(ip))
         except ValueError:
-            # Try range notation (e.g., 192.168.1.1-254)
-            if "-" in ip_range:
-                parts = ip_range.split("-")
-                if len(parts) == 2:
-                    try:
-                        start_ip = ipaddress.ip_address(parts[0].strip())
-                        end_part = parts[1].strip()
-
-                        if "." not in end_part:
-                            base = ".".join(parts[0].split(".")[:-1])
-                            end_ip = ipaddress.ip_address(f"{base}.{end_part}")
-                        else:
-                            end_ip = ipaddress.ip_address(end_part)
-
-                        current = int(start_ip)
-                        end = int(end_ip)
-                        while current <= end:
-                            ips.append(str(ipaddress.ip_address(current)))
-                            current += 1
-                    except ValueError:
-                        pass
+            pass
+        else:
+            for ip in network.hosts():
+                yield str(ip)
+            return
+
+        bounds = self._ip_range_bounds(ip_range)
+        if bounds is None:
+            return
+        if "-" not in ip_range:
+            yield ip_range
+            return
+        for current in range(bounds[0], bounds[1] + 1):
+            yield str(ipaddress.ip_address(current))
+
+    @staticmethod
+    def _ip_range_bounds(ip_range: str) -> Optional[tuple[int, int]]:
+        """
+        Parse a range (e.g., 192.168.1.1-254) or single IP to its bounds.
+
+        Returns:
+            The first and last address as integers, or None if invalid
+        """
+        if "-" not in ip_range:
+            # Single IP
+            try:
+                ip = int(ipaddress.ip_address(ip_range))
+            except ValueError:
+                return None
+            return ip, ip
+
+        parts = ip_range.split("-")
+        if len(parts) != 2:
+            return None
+        try:
+            start_ip = ipaddress.ip_address(parts[0].strip())
+            end_part = parts[1].strip()
+
+            if "." not in end_part:
+                base = ".".join(parts[0].split(".")[:-1])
+                end_ip = ipaddress.ip_address(f"{base}.{end_part}")
             else:
-                # Single IP
-                try:
-                    ipaddress.ip_address(ip_range)
-                    ips.append(ip_range)
-                except ValueError:
-                    pass
+                end_ip = ipaddress.ip_address(end_part)
+        except ValueError:
+            return None
+        return int(start_ip), int(end_ip)
 
-        return ips
+    def _ip_range_filter(self, ip_range: str) -> Callable[[str], bool]:
+        """Return a test for whether an IP is one _iter_ip_range() yields."""
+        try:
+            network = ipaddress.ip_network(ip_range, strict=False)
+        except ValueError:
+            bounds = self._ip_range_bounds(ip_range)
+            if bounds is None:
+                return lambda ip: False
+            first, last = bounds
+            return lambda ip: first <= int(ipaddress.ip_address(ip)) <= last
+
+        # hosts() skips the same reserved addresses as in _count_ip_range()
+        reserved: set[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]] = set()
+        if network.version == 4 and network.prefixlen < 31:
+            reserved = {network.network_address, network.broadcast_address}
+        elif network.version == 6 and network.prefixlen < 127:
+            reserved = {network.network_address}
+
+        def contains(ip: str) -> bool:
+            address = ipaddress.ip_address(ip)
+            return address in network and address not in reserved
+
+        return contains
 
     def full_scan(
         self,
@@ -646,6 +1166,7 @@ class NetworkScanner:
         include_onvif: bool = True,
         ports: Optional[list[int]] = None,
         probe_onvif_direct: bool = True,
+        on_camera: Optional[Callable[[DiscoveredCamera], None]] = None,
     ) -> list[DiscoveredCamera]:
         """
         Perform a full network scan combining ONVIF discovery, direct probing,
@@ -655,7 +1176,9 @@ class NetworkScanner:
             ip_range: IP range for port scan (auto-detect if None)
             include_onvif: Whether to include ONVIF WS-Discovery
             ports: Ports to scan (default: common camera ports)
-            probe_onvif_direct: Whether to probe ONVIF directly on port 80
+            probe_onvif_direct: Whether to probe ONVIF directly on HTTP ports
+            on_camera: Optional callback(camera) called with a snapshot of a
+                camera, merged across sources, whenever it is found or updated
 
         Returns:
             Combined list of discovered cameras (deduplicated)
@@ -665,38 +1188,119 @@ class NetworkScanner:
 
         # ONVIF WS-Discovery (for cameras that support it)
         if include_onvif:
-            onvif_cameras = self.discover_onvif()
+            onvif_cameras = self.discover_onvif(on_camera=on_camera)
             for cam in onvif_cameras:
                 all_cameras[cam.ip] = cam
 
+        def on_scanned(cam: DiscoveredCamera) -> None:
+            # Report cameras WS-Discovery already found with the merged info
+            if cam.ip in all_cameras:
+                merged = all_cameras[cam.ip].snapshot()
+                self._merge_camera(merged, cam)
+                cam = merged
+            if on_camera:
+                on_camera(cam)
+
         # Port scan + direct ONVIF probe
         if ip_range:
             scanned_cameras = self.scan_ports(
-                ip_range, ports, probe_onvif=probe_onvif_direct
+                ip_range,
+                ports,
+                probe_onvif=probe_onvif_direct,
+                on_camera=on_scanned if on_camera else None,
             )
             for cam in scanned_cameras:
                 if cam.ip in all_cameras:
-                    # Merge information
-                    existing = all_cameras[cam.ip]
-                    for port in cam.ports:
-                        if port not in existing.ports:
-                            existing.ports.append(port)
-
-                    # Update with ONVIF info if found
-                    if cam.onvif_info and not existing.onvif_info:
-                        existing.onvif_info = cam.onvif_info
-                        existing.onvif_available = True
-                        if cam.rtsp_urls:
-                            existing.rtsp_urls = cam.rtsp_urls
-                        if cam.manufacturer != "Unknown":
-                            existing.manufacturer = cam.manufacturer
-
-                    existing._generate_rtsp_urls()
+                    self._merge_camera(all_cameras[cam.ip], cam)
                 else:
                     all_cameras[cam.ip] = cam
 
         return list(all_cameras.values())
 
+    @staticmethod
+    def _merge_camera(existing: DiscoveredCamera, cam: DiscoveredCamera) -> None:
+        """Merge what a port scan found into a WS-Discovery camera."""
+        for port in cam.ports:
+            if port not in existing.ports:
+                existing.ports.append(port)
+
+        # Update with ONVIF info if found
+        if cam.onvif_info and not existing.onvif_info:
+            existing.onvif_info = cam.onvif_info
+            existing.onvif_available = True
+            if cam.rtsp_urls:
+                existing.rtsp_urls = cam.rtsp_urls
+            if cam.manufacturer != "Unknown":
+                existing.manufacturer = cam.manufacturer
+
+        if cam.mac and not existing.mac:
+            existing.mac = cam.mac
+
+        existing._generate_rtsp_urls()
+
+    def iter_scan(
+        self,
+        ip_range: Optional[str] = None,
+        include_onvif: bool = True,
+        ports: Optional[list[int]] = None,
+        probe_onvif_direct: bool = True,
+    ) -> Generator[DiscoveredCamera, None, None]:
+        """
+        Run full_scan() in a background thread and yield cameras as found.
+
+        A camera is yielded when it is first found and again, as a fresh
+        snapshot, whenever it gains ports, ONVIF information or RTSP URLs,
+        so consumers should key results by IP. The final state of every
+        camera is yielded once more when the scan ends. Closing the
+        generator early stops the scan.
+
+        Args:
+            ip_range: IP range for port scan (auto-detect if None)
+            include_onvif: Whether to include ONVIF WS-Discovery
+            ports: Ports to scan (default: common camera ports)
+            probe_onvif_direct: Whether to probe ONVIF directly on HTTP ports
+
+        Yields:
+            Snapshots of discovered cameras
+
+        Raises:
+            Exception: Whatever full_scan() raised in the background thread
+        """
+        # Cameras, then the exception if the scan failed, then None at the end
+        events: queue.Queue[Union[DiscoveredCamera, Exception, None]] = queue.Queue()
+
+        def run() -> None:
+            try:
+                cameras = self.full_scan(
+                    ip_range,
+                    include_onvif,
+                    ports,
+                    probe_onvif_direct,
+                    on_camera=events.put,
+                )
+                for camera in cameras:
+                    events.put(camera.snapshot())
+            except Exception as e:
+                events.put(e)
+            finally:
+                events.put(None)
+
+        thread = threading.Thread(target=run, name="NetworkScan", daemon=True)
+        thread.start()
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    return
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        finally:
+            # Repeat the stop in case full_scan() had not started and reset it
+            while thread.is_alive():
+                self.stop()
+                thread.join(0.1)
+
 
 def get_local_network() -> Optional[str]:
     """Get the local network in CIDR notation."""
@@ -714,6 +1318,45 @@ def get_local_network() -> Optional[str]:
         return None
 
 
+def read_neighbor_table() -> dict[str, str]:
+    """
+    Read the kernel's IPv4 neighbor (ARP) table.
+
+    Reads /proc/net/arp on Linux and falls back to ``ip neigh``; other
+    platforms get an empty table.
+
+    Returns:
+        Mapping of IP address to lowercase MAC address for resolved entries
+    """
+    neighbors: dict[str, str] = {}
+    try:
+        with open(ARP_TABLE_PATH, encoding="ascii") as arp:
+            next(arp, None)  # Header
+            for line in arp:
+                fields = line.split()
+                # Flags 0x0 marks an incomplete entry
+                if len(fields) >= 4 and fields[2] != "0x0":
+                    neighbors[fields[0]] = fields[3].lower()
+    except OSError:
+        if shutil.which("ip"):
+            try:
+                output = subprocess.run(
+                    ["ip", "-4", "neigh", "show"],
+                    capture_output=True,
+                    text=True,
+                    timeout=2.0,
+                    check=False,
+                ).stdout
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.debug(f"Could not read the neighbor table: {e}")
+                output = ""
+            for line in output.splitlines():
+                fields = line.split()
+                if "lladdr" in fields and fields[-1] not in ("FAILED", "INCOMPLETE"):
+                    neighbors[fields[0]] = fields[fields.index("lladdr") + 1].lower()
+    return {ip: mac for ip, mac in neighbors.items() if mac != "00:00:00:00:00:00"}
+
+
 def test_rtsp_url(url: str, timeout: float = 5.0) -> bool:
     """
     Test if an RTSP URL is accessible.
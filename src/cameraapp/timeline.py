@@ -0,0 +1,146 @@
+"""
+Connect timeline module for CameraApp.
+
+Records each connection attempt of a camera as a sequence of timed phases
+(reconnect wait, open admission, ONVIF resolution, stream open, first
+frame) and summarises time-to-first-frame across cameras.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Phase names, in the order they happen
+PHASE_BACKOFF = "backoff"
+PHASE_ADMISSION = "admission"
+PHASE_ONVIF = "onvif"
+PHASE_OPEN = "open"
+PHASE_FIRST_FRAME = "first_frame"
+PHASES = (PHASE_BACKOFF, PHASE_ADMISSION, PHASE_ONVIF, PHASE_OPEN, PHASE_FIRST_FRAME)
+
+
+@dataclass
+class ConnectTimeline:
+    """
+    Timed phases of one connection attempt.
+
+    Phases that run more than once in an attempt (e.g. a second ONVIF
+    resolution after a stale cached URI) accumulate their durations.
+
+    Attributes:
+        reason: What started the attempt ("connect" or "reconnect")
+        started: time.monotonic() when the attempt started
+        phases: Phase name to duration in seconds, in the order first seen
+        outcome: "pending", "connected", "failed" or "no_frames"
+        from_cache: Whether the stream URI came from the connection cache
+        finished: time.monotonic() when the outcome was set (0 while pending)
+    """
+
+    reason: str = "connect"
+    started: float = field(default_factory=time.monotonic)
+    phases: dict[str, float] = field(default_factory=dict)
+    outcome: str = "pending"
+    from_cache: bool = False
+    finished: float = 0.0
+
+    def add(self, phase: str, duration: float) -> None:
+        """
+        Add time spent in a phase.
+
+        Args:
+            phase: Phase name (see PHASES)
+            duration: Duration in seconds
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a phase."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    def finish(self, outcome: str) -> None:
+        """
+        Set the attempt's outcome.
+
+        Args:
+            outcome: "connected", "failed" or "no_frames"
+        """
+        self.outcome = outcome
+        self.finished = time.monotonic()
+
+    @property
+    def total(self) -> float:
+        """Return the attempt's duration so far in seconds."""
+        end = self.finished or time.monotonic()
+        return end - self.started
+
+    @property
+    def time_to_first_frame(self) -> Optional[float]:
+        """Return seconds from the start of the attempt to its first frame."""
+        if self.outcome != "connected":
+            return None
+        return self.total
+
+    def describe(self) -> str:
+        """Return a one-line summary such as "onvif 0.41s, open 1.20s"."""
+        parts = [f"{name} {duration:.2f}s" for name, duration in self.phases.items()]
+        source = ", cached URI" if self.from_cache else ""
+        return f"{', '.join(parts) or 'no phases'} ({self.outcome}{source})"
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Return the nearest-rank percentile of a list.
+
+    Args:
+        values: Values (need not be sorted)
+        q: Percentile between 0 and 100
+
+    Returns:
+        The percentile, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(timelines: Iterable[ConnectTimeline]) -> str:
+    """
+    Summarise time-to-first-frame and per-phase durations across cameras.
+
+    Args:
+        timelines: One timeline per camera
+
+    Returns:
+        Summary such as "p50/p95 time-to-first-frame across 32 cameras: ..."
+    """
+    connected = [t for t in timelines if t.time_to_first_frame is not None]
+    if not connected:
+        return "No camera delivered a frame"
+
+    ttff = [t.time_to_first_frame or 0.0 for t in connected]
+    phases = []
+    for name in PHASES:
+        durations = [t.phases[name] for t in connected if name in t.phases]
+        if durations:
+            phases.append(
+                f"{name} {percentile(durations, 50):.2f}/"
+                f"{percentile(durations, 95):.2f}s"
+            )
+    cached = sum(1 for t in connected if t.from_cache)
+    return (
+        f"p50/p95 time-to-first-frame across {len(connected)} cameras: "
+        f"{percentile(ttff, 50):.2f}/{percentile(ttff, 95):.2f}s "
+        f"[{', '.join(phases)}] ({cached} from cached URIs)"
+    )
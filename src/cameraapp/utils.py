@@ -10,17 +10,19 @@ import json
 import logging
 import logging.handlers
 import sys
-import tkinter as tk
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
 
 from cameraapp.config import (
+    CAMERA_SETTINGS,
     LOGGER_NAME,
     LOGGING_SETTINGS,
     PATHS,
 )
 
 if TYPE_CHECKING:
+    import tkinter as tk
+
     from cameraapp.camera import Camera
 
 logger = logging.getLogger(LOGGER_NAME)
@@ -111,14 +113,26 @@ def save_cameras(cameras: list[Camera], log: Optional[logging.Logger] = None) ->
                 credential_manager.store_password(cam.ip, cam.port, cam.password)
 
             # Save camera data without password
-            camera_data.append({
+            entry: dict[str, Any] = {
                 "type": getattr(cam, "camera_type", "RTSP"),
                 "ip": cam.ip,
                 "port": cam.port,
                 "username": cam.username,
                 "rtsp_url": cam.rtsp_url,
                 # Password is NOT stored here - it's in secure storage
-            })
+            }
+            decode_fps = getattr(cam, "decode_fps", None)
+            # decode_fps is saved only when it differs from
+            # CameraSettings.target_decode_fps; 0 retrieves every frame
+            if (
+                isinstance(decode_fps, (int, float))
+                and decode_fps != CAMERA_SETTINGS.target_decode_fps
+            ):
+                entry["decode_fps"] = decode_fps
+            priority = getattr(cam, "priority", 0)
+            if isinstance(priority, int) and priority != 0:
+                entry["priority"] = priority
+            camera_data.append(entry)
 
         # Create directory and save
         PATHS.cameras_file.parent.mkdir(parents=True, exist_ok=True)
@@ -177,6 +191,7 @@ def load_cameras(log: Optional[logging.Logger] = None) -> list[Camera]:
 
                 # Retrieve password from secure storage
                 password = credential_manager.retrieve_password(ip, port) or ""
+                decode_fps = data.get("decode_fps")
 
                 cam = Camera(
                     ip=ip,
@@ -185,6 +200,8 @@ def load_cameras(log: Optional[logging.Logger] = None) -> list[Camera]:
                     password=password,
                     rtsp_url=data.get("rtsp_url", ""),
                     camera_type=data.get("type", "RTSP"),
+                    decode_fps=float(decode_fps) if decode_fps is not None else None,
+                    priority=int(data.get("priority", 0)),
                 )
                 cameras.append(cam)
 
@@ -224,6 +241,9 @@ def center_window(window: tk.Misc) -> None:
     Args:
         window: The tkinter window to center
     """
+    # Imported here so headless use of this module never loads tkinter
+    from tkinter import TclError
+
     try:
         if not window.winfo_exists():
             return
@@ -250,7 +270,7 @@ def center_window(window: tk.Misc) -> None:
 
         window.focus_force()
 
-    except tk.TclError as e:
+    except TclError as e:
         if "application has been destroyed" not in str(e):
             logger.error(f"Tcl error centering window: {e}")
     except Exception as e:
@@ -35,6 +35,8 @@ def mock_paths(temp_dir: Path) -> Generator[MagicMock, None, None]:
     mock.data_dir = temp_dir
     mock.log_dir = temp_dir / "logs"
     mock.cameras_file = temp_dir / "cameras.json"
+    mock.connection_cache_file = temp_dir / "connections.json"
+    mock.metrics_file = temp_dir / "metrics.prom"
 
     # Create directories
     mock.log_dir.mkdir(parents=True, exist_ok=True)
@@ -72,6 +74,9 @@ def mock_video_capture() -> Generator[MagicMock, None, None]:
     with patch("cv2.VideoCapture") as mock_cap:
         instance = MagicMock()
         instance.isOpened.return_value = True
-        instance.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        instance.read.return_value = (True, frame)
+        instance.grab.return_value = True
+        instance.retrieve.return_value = (True, frame)
         mock_cap.return_value = instance
         yield mock_cap
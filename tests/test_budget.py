@@ -0,0 +1,177 @@
+"""
+Tests for the budget module.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cameraapp.budget import DecodeBudget
+    from cameraapp.camera import Camera
+
+
+def _camera(
+    mock_logger: logging.Logger,
+    index: int,
+    fps: float = 25.0,
+    cost: float = 0.01,
+    priority: int = 0,
+    grab_cost: float = 0.0,
+) -> Camera:
+    """
+    Create a connected camera whose metrics show ``fps`` at ``cost`` s/frame.
+
+    Every frame is also grabbed at ``grab_cost`` CPU seconds.
+    """
+    from cameraapp.camera import Camera, CameraState
+
+    camera = Camera(
+        ip=f"192.168.1.{100 + index}",
+        port=554,
+        username="admin",
+        password="password",
+        rtsp_url=f"rtsp://192.168.1.{100 + index}:554/stream",
+        logger_instance=mock_logger,
+        decode_fps=0,
+        priority=priority,
+    )
+    camera._set_state(CameraState.CONNECTED)
+    camera.metrics.frames_grabbed = int(fps * 10)
+    camera.metrics.frames_decoded = int(fps * 10)
+    for _ in range(int(fps * 10)):
+        camera.metrics.decode_seconds.observe(cost)
+    camera.metrics.grab_seconds.observe(grab_cost, int(fps * 10))
+    return camera
+
+
+def _measured(budget: DecodeBudget, cameras: list[Camera]) -> dict[Camera, float]:
+    """Rebalance twice, ten seconds apart, so the metrics above are measured."""
+    budget.rebalance(cameras, now=0.0)
+    for camera in cameras:
+        metrics = camera.metrics
+        metrics.frames_grabbed *= 2
+        metrics.frames_decoded *= 2
+        metrics.grab_seconds.sum *= 2
+        metrics.decode_seconds.sum *= 2
+    return budget.rebalance(cameras, now=10.0)
+
+
+class TestDecodeBudget:
+    """Tests for DecodeBudget."""
+
+    def test_measures_source_fps_and_cost(self, mock_logger: logging.Logger) -> None:
+        """Test frame rate and decode cost are measured from camera metrics."""
+        from cameraapp.budget import DecodeBudget
+
+        budget = DecodeBudget(cores=4, logger_instance=mock_logger)
+        camera = _camera(mock_logger, 0, fps=12.5, cost=0.004)
+
+        _measured(budget, [camera])
+        estimate = budget.estimate(camera)
+
+        assert estimate is not None
+        assert abs(estimate.source_fps - 12.5) < 1e-6
+        assert abs(estimate.cost - 0.004) < 1e-6
+        assert estimate.grab_cost == 0.0
+
+    def test_grab_cost_is_reserved_from_the_budget(
+        self, mock_logger: logging.Logger
+    ) -> None:
+        """Test the CPU spent grabbing every frame is not handed out."""
+        from cameraapp.budget import DecodeBudget
+
+        # Grabbing takes 0.4 of the 0.5 cores; retrieving at 25 fps needs 0.25
+        budget = DecodeBudget(cores=0.5, min_fps=1, logger_instance=mock_logger)
+        cameras = [_camera(mock_logger, i, grab_cost=0.008) for i in range(2)]
+
+        limits = _measured(budget, cameras)
+
+        estimate = budget.estimate(cameras[0])
+        assert estimate is not None and abs(estimate.grab_cost - 0.008) < 1e-9
+        used = sum(limits[camera] * 0.01 for camera in cameras)
+        assert all(1 <= limits[camera] < 25 for camera in cameras)
+        assert abs(used - 0.1) < 1e-6
+
+    def test_no_limits_within_budget(self, mock_logger: logging.Logger) -> None:
+        """Test cameras that fit in the budget are left unlimited."""
+        from cameraapp.budget import DecodeBudget
+
+        budget = DecodeBudget(cores=1, logger_instance=mock_logger)
+        cameras = [_camera(mock_logger, i) for i in range(3)]
+
+        limits = _measured(budget, cameras)
+
+        assert all(limit == 0.0 for limit in limits.values())
+        assert all(camera.budget_fps == 0.0 for camera in cameras)
+
+    def test_low_priority_cameras_slow_down_over_budget(
+        self, mock_logger: logging.Logger
+    ) -> None:
+        """Test an overloaded budget keeps high priorities and floors the rest."""
+        from cameraapp.budget import DecodeBudget
+
+        # Four cameras want 0.25 cores each; the budget is 0.5 cores
+        budget = DecodeBudget(cores=0.5, min_fps=2, logger_instance=mock_logger)
+        important = _camera(mock_logger, 0, priority=0)
+        others = [_camera(mock_logger, i, priority=9) for i in range(1, 4)]
+
+        limits = _measured(budget, [important, *others])
+
+        assert limits[important] == 0.0  # Its whole demand fits
+        for camera in others:
+            assert 2 <= limits[camera] < 25
+            assert camera.effective_decode_fps == limits[camera]
+        used = 25 * 0.01 + sum(limits[camera] * 0.01 for camera in others)
+        assert abs(used - 0.5) < 1e-6
+
+    def test_larger_tiles_get_larger_shares(self, mock_logger: logging.Logger) -> None:
+        """Test equal-priority cameras are weighted by tile size."""
+        from cameraapp.budget import DecodeBudget
+
+        budget = DecodeBudget(cores=0.2, min_fps=1, logger_instance=mock_logger)
+        large, small = _camera(mock_logger, 0), _camera(mock_logger, 1)
+        large.display_area = 640 * 480
+        small.display_area = 160 * 120
+
+        limits = _measured(budget, [large, small])
+
+        assert limits[large] > limits[small] >= 1
+
+    def test_hidden_and_disconnected_cameras_are_not_budgeted(
+        self, mock_logger: logging.Logger
+    ) -> None:
+        """Test only cameras that decode share the budget."""
+        from cameraapp.budget import DecodeBudget
+        from cameraapp.camera import CameraState
+
+        budget = DecodeBudget(cores=0.3, logger_instance=mock_logger)
+        shown = _camera(mock_logger, 0)
+        hidden = _camera(mock_logger, 1)
+        hidden.visible = False
+        offline = _camera(mock_logger, 2)
+        offline._set_state(CameraState.ERROR)
+
+        limits = _measured(budget, [shown, hidden, offline])
+
+        assert limits == {shown: 0.0, hidden: 0.0, offline: 0.0}
+
+    def test_pool_lifts_limit_of_removed_camera(
+        self, mock_logger: logging.Logger
+    ) -> None:
+        """Test a camera removed from a pool is no longer limited."""
+        from cameraapp.budget import DecodeBudget
+        from cameraapp.pool import CameraPool
+
+        budget = DecodeBudget(cores=0.1, logger_instance=mock_logger)
+        pool = CameraPool(mock_logger, budget=budget)
+        cameras = [_camera(mock_logger, i) for i in range(2)]
+        ids = [pool.add(camera) for camera in cameras]
+        _measured(budget, cameras)
+        assert cameras[1].budget_fps > 0
+
+        pool.remove(ids[1])
+
+        assert cameras[1].budget_fps == 0.0
+        assert budget.estimate(cameras[1]) is None
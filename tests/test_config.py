@@ -22,6 +22,8 @@ class TestPaths:
         assert isinstance(paths.data_dir, Path)
         assert isinstance(paths.log_dir, Path)
         assert isinstance(paths.cameras_file, Path)
+        assert isinstance(paths.connection_cache_file, Path)
+        assert isinstance(paths.metrics_file, Path)
 
     def test_paths_are_absolute(self) -> None:
         """Test that all paths are absolute."""
@@ -49,6 +51,14 @@ class TestPaths:
 
         assert str(paths.cameras_file).startswith(str(paths.data_dir))
 
+    def test_connection_cache_next_to_cameras_file(self) -> None:
+        """Test that the connection cache is stored next to cameras.json."""
+        from cameraapp.config import Paths
+
+        paths = Paths.create()
+
+        assert paths.connection_cache_file.parent == paths.cameras_file.parent
+
 
 class TestCameraSettings:
     """Tests for CameraSettings configuration."""
@@ -65,8 +75,24 @@ class TestCameraSettings:
         assert settings.max_retries == 5
         assert settings.retry_delay_base == 2
         assert settings.max_retry_wait == 60
-        assert settings.frame_queue_size == 5
         assert settings.consecutive_read_failures_limit == 10
+        assert settings.capture_mode == "grab"
+        assert settings.target_decode_fps == 15.0
+        assert settings.hidden_decode_fps == 0.0
+        assert settings.decode_budget_cores == 0.0
+        assert settings.decode_budget_min_fps == 1.0
+        assert settings.decode_budget_interval == 2.0
+        assert settings.startup_workers == 4
+        assert settings.stop_join_timeout == 0.5
+        assert settings.shutdown_timeout == 2.0
+        assert settings.max_concurrent_opens == 8
+        assert settings.offline_retry_interval == 300
+        assert settings.connect_history == 10
+        assert settings.subscriber_queue_size == 8
+        assert settings.capture_engine == "thread"
+        assert settings.worker_start_method == ""
+        assert settings.worker_ring_slots == 6
+        assert settings.worker_max_restarts == 3
 
     def test_camera_settings_immutable(self) -> None:
         """Test that CameraSettings is immutable (frozen dataclass)."""
@@ -88,10 +114,14 @@ class TestUISettings:
         settings = UISettings()
 
         assert settings.frame_update_interval == 30
+        assert settings.max_idle_interval == 250
+        assert settings.frame_stall_timeout == 3.0
         assert settings.default_aspect_ratio == "fit"
         assert settings.default_window_width == 1280
         assert settings.default_window_height == 720
         assert settings.grid_columns == 2
+        assert settings.render_workers == 4
+        assert settings.renderer == "labels"
 
 
 class TestLoggingSettings:
@@ -109,6 +139,57 @@ class TestLoggingSettings:
         assert "%(asctime)s" in settings.format_string
 
 
+class TestMetricsSettings:
+    """Tests for MetricsSettings configuration."""
+
+    def test_metrics_export_disabled_by_default(self) -> None:
+        """Test the metrics endpoint and file dump are off by default."""
+        from cameraapp.config import MetricsSettings
+
+        settings = MetricsSettings()
+
+        assert settings.http_port == 0
+        assert settings.http_host == "127.0.0.1"
+        assert settings.dump_interval == 0.0
+
+
+class TestHeadlessSettings:
+    """Tests for HeadlessSettings configuration."""
+
+    def test_headless_settings_defaults(self) -> None:
+        """Test default headless service settings values."""
+        from cameraapp.config import HeadlessSettings
+
+        settings = HeadlessSettings()
+
+        assert settings.frame_stall_timeout == 3.0
+        assert settings.supervise_interval == 1.0
+        assert settings.status_interval == 60.0
+
+
+class TestNetworkSettings:
+    """Tests for NetworkSettings configuration."""
+
+    def test_network_settings_defaults(self) -> None:
+        """Test default network and scanner settings values."""
+        from cameraapp.config import NetworkSettings
+        from cameraapp.scanner import CAMERA_PORTS
+
+        settings = NetworkSettings()
+
+        assert settings.onvif_discovery_timeout == 5
+        assert settings.force_tcp_transport is True
+        assert settings.scan_engine == "async"
+        assert settings.scan_concurrency == 512
+        assert settings.scan_progress_interval == 0.1
+        assert settings.onvif_probe_workers == 16
+        assert settings.scan_neighbor_mode == "order"
+        assert settings.scan_liveness_ports == (554, 80)
+        assert set(settings.scan_liveness_ports + settings.scan_vendor_ports) == set(
+            CAMERA_PORTS
+        )
+
+
 class TestGlobalConfig:
     """Tests for global configuration instances."""
 
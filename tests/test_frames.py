@@ -0,0 +1,244 @@
+"""
+Tests for the frames module.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from cameraapp.frames import FramePacket
+
+
+def _frame(value: int = 0) -> np.ndarray:
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+class TestLatestFrameSlot:
+    """Tests for LatestFrameSlot."""
+
+    def test_empty_slot(self) -> None:
+        """Test a new slot has no frame and sequence 0."""
+        from cameraapp.frames import LatestFrameSlot
+
+        slot = LatestFrameSlot()
+
+        assert slot.seq == 0
+        assert slot.latest() is None
+        assert slot.latest_after(0) is None
+
+    def test_publish_keeps_only_newest(self) -> None:
+        """Test publishing replaces the previous frame."""
+        from cameraapp.frames import LatestFrameSlot
+
+        slot = LatestFrameSlot()
+        slot.publish(_frame(1), timestamp=1.0)
+        slot.publish(_frame(2), timestamp=2.0)
+
+        packet = slot.latest()
+
+        assert packet is not None
+        assert packet.seq == 2
+        assert packet.timestamp == 2.0
+        assert packet.frame[0, 0, 0] == 2
+
+    def test_latest_after_filters_seen_frames(self) -> None:
+        """Test latest_after returns None for already seen sequence numbers."""
+        from cameraapp.frames import LatestFrameSlot
+
+        slot = LatestFrameSlot()
+        first = slot.publish(_frame())
+
+        assert slot.latest_after(0) is first
+        assert slot.latest_after(first.seq) is None
+
+    def test_counts_each_packet_once(self) -> None:
+        """Test packets are counted once as delivered or dropped."""
+        from cameraapp.frames import LatestFrameSlot
+
+        slot = LatestFrameSlot()
+        first = slot.publish(_frame())
+        slot.latest_after(0)
+        slot.latest_after(0)  # A second consumer
+        slot.publish(_frame())
+        slot.publish(_frame())  # Replaces a packet nobody took
+        slot.wait_for(first.seq, timeout=0)
+
+        assert slot.delivered == 2
+        assert slot.dropped == 1
+
+    def test_clear_keeps_sequence(self) -> None:
+        """Test clear drops the frame but sequence numbers keep increasing."""
+        from cameraapp.frames import LatestFrameSlot
+
+        slot = LatestFrameSlot()
+        slot.publish(_frame())
+        slot.clear()
+
+        assert slot.latest() is None
+        assert slot.publish(_frame()).seq == 2
+
+    def test_wait_for_new_frame(self) -> None:
+        """Test wait_for wakes up when a frame is published."""
+        from cameraapp.frames import LatestFrameSlot
+
+        slot = LatestFrameSlot()
+        timer = threading.Timer(0.05, lambda: slot.publish(_frame(7)))
+        timer.start()
+
+        packet = slot.wait_for(0, timeout=2.0)
+        timer.join()
+
+        assert packet is not None
+        assert packet.frame[0, 0, 0] == 7
+
+    def test_wait_for_timeout(self) -> None:
+        """Test wait_for returns None when nothing is published."""
+        from cameraapp.frames import LatestFrameSlot
+
+        slot = LatestFrameSlot()
+
+        assert slot.wait_for(0, timeout=0.01) is None
+
+    def test_published_frame_is_read_only(self) -> None:
+        """Test published frames cannot be modified by consumers."""
+        from cameraapp.frames import LatestFrameSlot
+
+        slot = LatestFrameSlot()
+        packet = slot.publish(_frame())
+
+        assert not packet.frame.flags.writeable
+
+
+class TestFrameSubscription:
+    """Tests for FrameSubscription."""
+
+    def _packet(self, seq: int) -> FramePacket:
+        """Create a packet with the given sequence number."""
+        from cameraapp.frames import FramePacket
+
+        return FramePacket(frame=_frame(seq), seq=seq, timestamp=float(seq))
+
+    def test_latest_policy_keeps_newest(self) -> None:
+        """Test the latest policy drops frames the consumer did not take."""
+        from cameraapp.frames import DropPolicy, FrameSubscription
+
+        subscription = FrameSubscription("ui", DropPolicy.LATEST)
+        for seq in (1, 2, 3):
+            subscription.offer(self._packet(seq))
+
+        assert subscription.lag == 3
+        packet = subscription.poll()
+
+        assert packet is not None and packet.seq == 3
+        assert subscription.poll() is None
+        assert subscription.stats() == {
+            "name": "ui",
+            "policy": "latest",
+            "offered": 3,
+            "delivered": 1,
+            "dropped": 2,
+            "lag": 0,
+            "pending": 0,
+        }
+
+    def test_queue_policies(self) -> None:
+        """Test full queues drop the oldest or the newest frame by policy."""
+        from cameraapp.frames import DropPolicy, FrameSubscription
+
+        oldest = FrameSubscription("recorder", DropPolicy.DROP_OLDEST, max_pending=2)
+        newest = FrameSubscription("detector", DropPolicy.DROP_NEWEST, max_pending=2)
+        for seq in (1, 2, 3):
+            oldest.offer(self._packet(seq))
+            newest.offer(self._packet(seq))
+
+        assert [oldest.poll().seq, oldest.poll().seq] == [2, 3]  # type: ignore
+        assert [newest.poll().seq, newest.poll().seq] == [1, 2]  # type: ignore
+        assert oldest.dropped == newest.dropped == 1
+
+    def test_duplicate_packets_are_ignored(self) -> None:
+        """Test a packet is offered at most once."""
+        from cameraapp.frames import DropPolicy, FrameSubscription
+
+        subscription = FrameSubscription("recorder", DropPolicy.DROP_OLDEST)
+        packet = self._packet(1)
+        subscription.offer(packet)
+        subscription.offer(packet)
+
+        assert subscription.offered == 1
+
+    def test_get_waits_and_close_wakes(self) -> None:
+        """Test get() blocks for a frame and returns None once closed."""
+        from cameraapp.frames import FrameSubscription
+
+        closed: list[FrameSubscription] = []
+        subscription = FrameSubscription("ui", on_close=closed.append)
+        threading.Timer(0.05, subscription.offer, args=(self._packet(1),)).start()
+
+        packet = subscription.get(timeout=2.0)
+
+        assert packet is not None and packet.seq == 1
+        threading.Timer(0.05, subscription.close).start()
+        assert subscription.get(timeout=2.0) is None
+        assert subscription.closed
+        assert closed == [subscription]
+
+
+class TestFrameNotifier:
+    """Tests for FrameNotifier."""
+
+    def test_consume_clears_pending(self) -> None:
+        """Test consume reports notifications once."""
+        from cameraapp.frames import FrameNotifier
+
+        notifier = FrameNotifier()
+
+        assert notifier.consume() is False
+        notifier.notify()
+        notifier.notify()
+        assert notifier.consume() is True
+        assert notifier.consume() is False
+
+    def test_wakeup_only_when_armed(self) -> None:
+        """Test the wakeup runs once per arm() and not for every frame."""
+        from cameraapp.frames import FrameNotifier
+
+        woken = threading.Event()
+        calls: list[int] = []
+
+        def wakeup() -> None:
+            calls.append(1)
+            woken.set()
+
+        notifier = FrameNotifier(wakeup)
+        notifier.start()
+        try:
+            notifier.notify()
+            assert not woken.wait(0.05)
+
+            notifier.consume()
+            notifier.arm()
+            notifier.notify()
+            notifier.notify()
+            assert woken.wait(2.0)
+        finally:
+            notifier.stop()
+
+        assert calls == [1]
+
+    def test_arm_with_pending_frame_wakes_immediately(self) -> None:
+        """Test a frame published before arm() is not missed."""
+        from cameraapp.frames import FrameNotifier
+
+        woken = threading.Event()
+        notifier = FrameNotifier(woken.set)
+        notifier.start()
+        try:
+            notifier.notify()
+            notifier.arm()
+            assert woken.wait(2.0)
+        finally:
+            notifier.stop()
@@ -0,0 +1,107 @@
+"""
+Tests for the headless module.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+if TYPE_CHECKING:
+    from cameraapp.camera import Camera
+
+
+class TestHeadlessImports:
+    """Tests for the headless import footprint."""
+
+    def test_headless_does_not_import_tkinter_or_pil(self) -> None:
+        """Test the headless entry points load neither tkinter nor PIL."""
+        code = (
+            "import sys, cameraapp, cameraapp.main, cameraapp.headless; "
+            "print('tkinter' in sys.modules, 'PIL' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "False False"
+
+
+class TestHeadlessService:
+    """Tests for HeadlessService."""
+
+    def _camera(self, mock_logger: logging.Logger, index: int) -> Camera:
+        """Create an RTSP camera."""
+        from cameraapp.camera import Camera
+
+        return Camera(
+            ip=f"192.168.1.{100 + index}",
+            port=554,
+            username="admin",
+            password="password",
+            rtsp_url=f"rtsp://192.168.1.{100 + index}:554/stream",
+            logger_instance=mock_logger,
+        )
+
+    def test_start_run_and_stop(
+        self,
+        mock_logger: logging.Logger,
+        mock_video_capture: MagicMock,
+    ) -> None:
+        """Test cameras are connected, supervised and disconnected on stop."""
+        from cameraapp.headless import HeadlessService
+
+        cameras = [self._camera(mock_logger, i) for i in range(3)]
+        service = HeadlessService(cameras, mock_logger)
+
+        service.start()
+        deadline = time.monotonic() + 2.0
+        while not all(cam.connected for cam in cameras):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        threading.Timer(0.05, service.request_stop).start()
+        service.run()
+        service.stop()
+
+        assert not any(cam.connected for cam in cameras)
+
+    def test_stalled_stream_is_restarted(
+        self,
+        mock_logger: logging.Logger,
+    ) -> None:
+        """Test supervision asks stalled cameras to reconnect."""
+        from cameraapp.headless import HeadlessService
+
+        camera = MagicMock()
+        camera.connected = True
+        camera.last_frame_time = time.monotonic() - 10
+        service = HeadlessService([camera], mock_logger, stall_timeout=3.0)
+
+        service._check_stalls(time.monotonic())
+
+        camera.reconnect.assert_called_once()
+
+    def test_main_runs_for_duration(self, mock_logger: logging.Logger) -> None:
+        """Test main() exits cleanly after --duration."""
+        from cameraapp import headless
+        from cameraapp.config import HeadlessSettings
+
+        with (
+            patch("cameraapp.utils.setup_logging", return_value=mock_logger),
+            patch("cameraapp.utils.load_cameras", return_value=[]),
+            patch("signal.signal"),
+            patch(
+                "cameraapp.headless.HEADLESS_SETTINGS",
+                HeadlessSettings(supervise_interval=0.01),
+            ),
+        ):
+            assert headless.main(["--duration", "0"]) == 0
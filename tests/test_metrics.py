@@ -0,0 +1,128 @@
+"""
+Tests for the metrics module.
+"""
+
+from __future__ import annotations
+
+import urllib.request
+from pathlib import Path
+
+
+class _Owner:
+    """Stand-in for a camera owning metrics."""
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_observe_and_quantiles(self) -> None:
+        """Test values land in buckets and quantiles use bucket bounds."""
+        from cameraapp.metrics import Histogram
+
+        histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+        for value in (0.005, 0.005, 0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        assert histogram.count == 5
+        assert histogram.counts == [2, 1, 1, 1]
+        assert histogram.quantile(0.4) == 0.01
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(1.0) == 1.0
+        assert histogram.cumulative()[-1] == ("+Inf", 5)
+
+    def test_observe_with_count(self) -> None:
+        """Test an average observed for several events counts each of them."""
+        from cameraapp.metrics import Histogram
+
+        histogram = Histogram(buckets=(0.01, 0.1))
+        histogram.observe(0.05, 4)
+
+        assert histogram.count == 4
+        assert histogram.counts == [0, 4, 0]
+        assert abs(histogram.sum - 0.2) < 1e-12
+
+    def test_empty_snapshot(self) -> None:
+        """Test an empty histogram reports zeros."""
+        from cameraapp.metrics import Histogram
+
+        snapshot = Histogram().snapshot()
+
+        assert snapshot["count"] == 0
+        assert snapshot["mean"] == 0.0
+        assert snapshot["p95"] == 0.0
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_snapshot_and_weak_owners(self) -> None:
+        """Test snapshots cover registered cameras until they are dropped."""
+        from cameraapp.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        owner = _Owner()
+        metrics = registry.register(owner, "10.0.0.1:554")
+        metrics.frames_decoded += 3
+        metrics.decode_seconds.observe(0.004)
+
+        snapshot = registry.snapshot()
+
+        assert snapshot["10.0.0.1:554"]["frames_decoded"] == 3
+        assert snapshot["10.0.0.1:554"]["decode_seconds"]["count"] == 1
+
+        del owner
+
+        assert registry.snapshot() == {}
+
+    def test_render_openmetrics(self) -> None:
+        """Test the exposition text has typed families and ends with EOF."""
+        from cameraapp.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        owner = _Owner()
+        metrics = registry.register(owner, "10.0.0.1:554")
+        metrics.frames_grabbed = 7
+        metrics.stream_width = 1920
+        metrics.render_seconds.observe(0.002)
+
+        text = registry.render_openmetrics()
+
+        assert "# TYPE cameraapp_frames_grabbed counter" in text
+        assert 'cameraapp_frames_grabbed_total{camera="10.0.0.1:554"} 7' in text
+        assert 'cameraapp_stream_width{camera="10.0.0.1:554"} 1920' in text
+        assert (
+            'cameraapp_render_seconds_bucket{camera="10.0.0.1:554",le="+Inf"} 1' in text
+        )
+        assert text.endswith("# EOF\n")
+
+    def test_http_endpoint(self) -> None:
+        """Test the local endpoint serves the OpenMetrics text."""
+        from cameraapp.metrics import OPENMETRICS_CONTENT_TYPE, MetricsRegistry
+
+        registry = MetricsRegistry()
+        owner = _Owner()
+        registry.register(owner, "10.0.0.1:554").reconnects = 2
+        port = registry.start_http_server(0)
+        try:
+            url = f"http://127.0.0.1:{port}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            registry.stop()
+
+        assert content_type == OPENMETRICS_CONTENT_TYPE
+        assert 'cameraapp_reconnects_total{camera="10.0.0.1:554"} 2' in body
+
+    def test_dump(self, temp_dir: Path) -> None:
+        """Test metrics are written to a file."""
+        from cameraapp.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        owner = _Owner()
+        registry.register(owner, "10.0.0.1:554")
+        path = temp_dir / "metrics.prom"
+
+        registry.dump(path)
+
+        assert path.read_text(encoding="utf-8").endswith("# EOF\n")
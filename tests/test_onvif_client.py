@@ -0,0 +1,180 @@
+"""
+Tests for the onvif_client module.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("onvif")
+
+_ENVELOPE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" '
+    'xmlns:tds="http://www.onvif.org/ver10/device/wsdl" '
+    'xmlns:trt="http://www.onvif.org/ver10/media/wsdl" '
+    'xmlns:tt="http://www.onvif.org/ver10/schema">'
+    "<s:Body>{body}</s:Body></s:Envelope>"
+)
+
+_RESPONSES = {
+    "GetSystemDateAndTime": (
+        "<tds:GetSystemDateAndTimeResponse><tds:SystemDateAndTime>"
+        "<tt:DateTimeType>NTP</tt:DateTimeType>"
+        "<tt:DaylightSavings>false</tt:DaylightSavings>"
+        "<tt:UTCDateTime><tt:Time><tt:Hour>{now.tm_hour}</tt:Hour>"
+        "<tt:Minute>{now.tm_min}</tt:Minute><tt:Second>{now.tm_sec}</tt:Second>"
+        "</tt:Time><tt:Date><tt:Year>{now.tm_year}</tt:Year>"
+        "<tt:Month>{now.tm_mon}</tt:Month><tt:Day>{now.tm_mday}</tt:Day>"
+        "</tt:Date></tt:UTCDateTime>"
+        "</tds:SystemDateAndTime></tds:GetSystemDateAndTimeResponse>"
+    ),
+    "GetCapabilities": (
+        "<tds:GetCapabilitiesResponse><tds:Capabilities><tt:Media>"
+        "<tt:XAddr>http://127.0.0.1:{port}/onvif/media_service</tt:XAddr>"
+        "</tt:Media></tds:Capabilities></tds:GetCapabilitiesResponse>"
+    ),
+    "GetProfiles": (
+        '<trt:GetProfilesResponse><trt:Profiles token="main">'
+        "<tt:Name>main</tt:Name></trt:Profiles></trt:GetProfilesResponse>"
+    ),
+    "GetStreamUri": (
+        "<trt:GetStreamUriResponse><trt:MediaUri>"
+        "<tt:Uri>rtsp://127.0.0.1:{port}/stream</tt:Uri>"
+        "<tt:InvalidAfterConnect>false</tt:InvalidAfterConnect>"
+        "<tt:InvalidAfterReboot>false</tt:InvalidAfterReboot>"
+        "<tt:Timeout>PT0S</tt:Timeout>"
+        "</trt:MediaUri></trt:GetStreamUriResponse>"
+    ),
+}
+
+
+class _FakeDevice(BaseHTTPRequestHandler):
+    """Minimal ONVIF device answering the stream resolution calls."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    calls: list[str] = []
+    connections: list[int] = []
+
+    def setup(self) -> None:
+        """Count TCP connections."""
+        super().setup()
+        self.connections.append(1)
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Reply to the SOAP operation named in the request body."""
+        request = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        operation = next(name for name in _RESPONSES if name in request)
+        self.calls.append(operation)
+        body = _RESPONSES[operation].format(
+            now=time.gmtime(), port=self.server.server_address[1]
+        )
+        payload = _ENVELOPE.format(body=body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/soap+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Silence per-request logging."""
+
+
+@pytest.fixture
+def fake_device() -> Generator[int, None, None]:
+    """Run a fake ONVIF device and yield its port."""
+    _FakeDevice.calls = []
+    _FakeDevice.connections = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeDevice)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+class TestOnvifClientFactory:
+    """Tests for OnvifClientFactory."""
+
+    def test_wsdl_parsed_once(self) -> None:
+        """Test WSDL documents are shared between callers."""
+        from cameraapp.onvif_client import OnvifClientFactory
+
+        factory = OnvifClientFactory()
+
+        assert factory.document("media.wsdl") is factory.document("media.wsdl")
+
+    def test_device_reused_until_password_changes(self) -> None:
+        """Test device clients are cached per host, port and user."""
+        from cameraapp.onvif_client import OnvifClientFactory
+
+        factory = OnvifClientFactory()
+        device = factory.device("10.0.0.5", 80, "admin", "a")
+
+        assert factory.device("10.0.0.5", 80, "admin", "a") is device
+        assert factory.device("10.0.0.5", 80, "admin", "b") is not device
+        factory.close()
+
+
+class TestOnvifDevice:
+    """Tests for OnvifDevice against a fake device."""
+
+    def test_get_stream_uri(self, fake_device: int) -> None:
+        """Test resolution creates only the needed services and keeps the session."""
+        from cameraapp.onvif_client import OnvifClientFactory
+
+        factory = OnvifClientFactory(timeout=5)
+        device = factory.device("127.0.0.1", fake_device, "admin", "admin")
+
+        first = device.get_stream_uri()
+        second = device.get_stream_uri()
+        services = set(device._services)
+        factory.close()
+
+        assert first == (f"rtsp://127.0.0.1:{fake_device}/stream", "main")
+        assert second == first
+        assert services == {"devicemgmt", "media"}
+        assert _FakeDevice.calls == [
+            "GetSystemDateAndTime",
+            "GetCapabilities",
+            "GetProfiles",
+            "GetStreamUri",
+            "GetProfiles",
+            "GetStreamUri",
+        ]
+        assert len(_FakeDevice.connections) == 1
+
+    def test_camera_resolves_through_shared_factory(
+        self, fake_device: int, mock_logger: logging.Logger
+    ) -> None:
+        """Test Camera.get_rtsp_url_from_onvif uses the shared client."""
+        from cameraapp.camera import Camera
+        from cameraapp.onvif_client import OnvifClientFactory
+
+        factory = OnvifClientFactory(timeout=5)
+        camera = Camera(
+            ip="127.0.0.1",
+            port=fake_device,
+            username="admin",
+            password="admin",
+            camera_type="ONVIF",
+            logger_instance=mock_logger,
+        )
+
+        with patch("cameraapp.camera.onvif_clients", factory):
+            url = camera.get_rtsp_url_from_onvif()
+            again = camera.get_rtsp_url_from_onvif()
+        factory.close()
+
+        assert url == again == f"rtsp://127.0.0.1:{fake_device}/stream"
+        assert camera._onvif_profile_token == "main"
+        assert len(_FakeDevice.connections) == 1
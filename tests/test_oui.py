@@ -0,0 +1,58 @@
+"""
+Tests for the oui module.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import pytest
+
+
+class TestOUI:
+    """Tests for MAC vendor lookup."""
+
+    @pytest.mark.parametrize(
+        "mac",
+        ["44:19:b6:12:34:56", "44-19-B6-12-34-56", "4419.b612.3456", "4419B6123456"],
+    )
+    def test_prefix_accepts_common_notations(self, mac: str) -> None:
+        """Test MAC addresses in the usual notations give the same OUI."""
+        from cameraapp.oui import oui_prefix
+
+        assert oui_prefix(mac) == "44:19:B6"
+
+    def test_prefix_of_invalid_address(self) -> None:
+        """Test strings that are not MAC addresses have no OUI."""
+        from cameraapp.oui import oui_prefix
+
+        assert oui_prefix("") == ""
+        assert oui_prefix("44:19:b6") == ""
+
+    @pytest.mark.parametrize(
+        ("mac", "vendor"),
+        [
+            ("44:19:b6:00:00:01", "hikvision"),
+            ("58:8f:cf:00:00:01", "hikvision"),  # EZVIZ
+            ("90:02:a9:00:00:01", "dahua"),
+            ("00:1a:3f:00:00:01", "intelbras"),
+            ("00:40:8c:00:00:01", "axis"),
+            ("48:ea:63:00:00:01", "uniview"),
+            ("00:11:22:33:44:55", None),
+            ("46:19:b6:00:00:01", None),  # Locally administered
+        ],
+    )
+    def test_lookup_vendor(self, mac: str, vendor: Optional[str]) -> None:
+        """Test MAC addresses map to the vendor their OUI was assigned to."""
+        from cameraapp.oui import lookup_vendor
+
+        assert lookup_vendor(mac) == vendor
+
+    def test_every_vendor_has_rtsp_patterns(self) -> None:
+        """Test each vendor in the database has a name and URL patterns."""
+        from cameraapp.oui import OUI_VENDORS, VENDOR_NAMES
+        from cameraapp.scanner import RTSP_URL_PATTERNS
+
+        for vendor in set(OUI_VENDORS.values()):
+            assert vendor in VENDOR_NAMES
+            assert RTSP_URL_PATTERNS[vendor]
@@ -0,0 +1,211 @@
+"""
+Tests for the pool module.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+if TYPE_CHECKING:
+    from cameraapp.camera import Camera
+
+
+def _camera(mock_logger: logging.Logger, index: int, port: int = 554) -> Camera:
+    """Create an RTSP camera."""
+    from cameraapp.camera import Camera
+
+    return Camera(
+        ip=f"192.168.1.{100 + index}",
+        port=port,
+        username="admin",
+        password="password",
+        rtsp_url=f"rtsp://192.168.1.{100 + index}:{port}/stream",
+        logger_instance=mock_logger,
+    )
+
+
+class TestCameraPoolMembership:
+    """Tests for adding, looking up and removing cameras."""
+
+    def test_add_assigns_stable_ids(self, mock_logger: logging.Logger) -> None:
+        """Test default IDs are ip:port with a suffix for duplicates."""
+        from cameraapp.pool import CameraPool
+
+        pool = CameraPool(mock_logger)
+        first = _camera(mock_logger, 0)
+        duplicate = _camera(mock_logger, 0)
+        other = _camera(mock_logger, 1)
+
+        assert pool.add(first) == "192.168.1.100:554"
+        assert pool.add(duplicate) == "192.168.1.100:554#2"
+        assert pool.add(other, "door") == "door"
+
+        assert pool.ids == ["192.168.1.100:554", "192.168.1.100:554#2", "door"]
+        assert pool.cameras == (first, duplicate, other)
+        assert pool.get("door") is other
+        assert pool.id_of(duplicate) == "192.168.1.100:554#2"
+        assert "door" in pool
+        assert len(pool) == 3
+
+    def test_add_rejects_duplicates(self, mock_logger: logging.Logger) -> None:
+        """Test a camera or an explicit ID cannot be added twice."""
+        from cameraapp.pool import CameraPool
+
+        pool = CameraPool(mock_logger)
+        camera = _camera(mock_logger, 0)
+        pool.add(camera, "door")
+
+        with pytest.raises(ValueError):
+            pool.add(camera)
+        with pytest.raises(ValueError):
+            pool.add(_camera(mock_logger, 1), "door")
+
+    def test_remove_only_touches_that_camera(
+        self,
+        mock_logger: logging.Logger,
+        mock_video_capture: MagicMock,
+    ) -> None:
+        """Test removing a camera disconnects it and leaves the others running."""
+        from cameraapp.pool import CameraPool
+
+        pool = CameraPool(mock_logger)
+        cameras = [_camera(mock_logger, i) for i in range(3)]
+        ids = [pool.add(camera) for camera in cameras]
+        for camera in cameras:
+            assert camera.connect()
+
+        removed = pool.remove(ids[1])
+
+        assert removed is cameras[1]
+        assert not cameras[1].connected
+        assert cameras[0].connected and cameras[2].connected
+        assert pool.cameras == (cameras[0], cameras[2])
+        assert pool.id_of(cameras[1]) is None
+        with pytest.raises(KeyError):
+            pool.remove(ids[1])
+
+        pool.stop()
+
+
+class TestCameraPoolLifecycle:
+    """Tests for starting, stopping and observing cameras."""
+
+    def test_start_and_stop(
+        self,
+        mock_logger: logging.Logger,
+        mock_video_capture: MagicMock,
+    ) -> None:
+        """Test start() connects cameras in the background and stop() ends them."""
+        from cameraapp.pool import CameraPool
+
+        pool = CameraPool(mock_logger, workers=2)
+        cameras = [_camera(mock_logger, i) for i in range(4)]
+        for camera in cameras:
+            pool.add(camera)
+
+        pool.start()
+        deadline = time.monotonic() + 2.0
+        while not pool.startup_done:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        assert all(camera.connected for camera in cameras)
+        assert not any(pool.is_pending(camera_id) for camera_id in pool.ids)
+
+        pool.stop()
+
+        assert not any(camera.connected for camera in cameras)
+
+    def test_stop_uses_one_deadline_for_blocked_readers(
+        self,
+        mock_logger: logging.Logger,
+        mock_video_capture: MagicMock,
+    ) -> None:
+        """Test stop() signals every reader at once and shares one deadline."""
+        import threading
+
+        from cameraapp.pool import CameraPool
+
+        release = threading.Event()
+        instance = mock_video_capture.return_value
+
+        def blocking_grab() -> bool:
+            release.wait(5)
+            return False
+
+        instance.grab.side_effect = blocking_grab
+        pool = CameraPool(mock_logger)
+        cameras = [_camera(mock_logger, i) for i in range(6)]
+        for camera in cameras:
+            pool.add(camera)
+            assert camera.connect()
+        time.sleep(0.05)  # Let the readers enter grab()
+
+        start = time.monotonic()
+        with patch.object(mock_logger, "warning") as warning:
+            pool.stop(timeout=0.2)
+
+        assert time.monotonic() - start < 0.6
+        assert not any(camera.connected for camera in cameras)
+        assert "6 readers still in I/O" in warning.call_args[0][0]
+
+        release.set()
+        deadline = time.monotonic() + 2.0
+        while instance.release.call_count < len(cameras):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def test_state_listeners_receive_camera_ids(
+        self,
+        mock_logger: logging.Logger,
+        mock_video_capture: MagicMock,
+    ) -> None:
+        """Test state changes are reported with the camera's pool ID."""
+        from cameraapp.camera import CameraState
+        from cameraapp.pool import CameraPool
+
+        pool = CameraPool(mock_logger)
+        camera = _camera(mock_logger, 0)
+        camera_id = pool.add(camera)
+        events: list[tuple[str, CameraState]] = []
+        pool.add_state_listener(lambda cid, cam, state: events.append((cid, state)))
+
+        assert camera.connect()
+        camera.disconnect()
+
+        assert events == [
+            (camera_id, CameraState.CONNECTING),
+            (camera_id, CameraState.CONNECTED),
+            (camera_id, CameraState.DISCONNECTED),
+        ]
+
+        pool.remove(camera_id)
+        camera.connected = True
+        assert len(events) == 3
+
+    def test_latest_frames(self, mock_logger: logging.Logger) -> None:
+        """Test latest_frames() returns each camera's newest unseen frame."""
+        from cameraapp.pool import CameraPool
+
+        pool = CameraPool(mock_logger)
+        cameras = [_camera(mock_logger, i) for i in range(3)]
+        ids = [pool.add(camera) for camera in cameras]
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        cameras[0]._frame_slot.publish(frame)
+        cameras[1]._frame_slot.publish(frame)
+
+        frames = pool.latest_frames()
+
+        assert set(frames) == {ids[0], ids[1]}
+        assert frames[ids[0]].seq == 1
+
+        cameras[1]._frame_slot.publish(frame)
+        seen = {camera_id: packet.seq for camera_id, packet in frames.items()}
+
+        assert set(pool.latest_frames(after=seen)) == {ids[1]}
@@ -0,0 +1,235 @@
+"""
+Tests for the process_capture module.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+from pathlib import Path
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def video_file(temp_dir: Path) -> str:
+    """Write a short 64x48 test video and return its path."""
+    path = temp_dir / "stream.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+    for i in range(200):
+        writer.write(np.full((48, 64, 3), i, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+class TestFrameRing:
+    """Tests for FrameRing."""
+
+    def test_attach_shares_memory(self) -> None:
+        """Test an attached ring sees frames written through the owner."""
+        from cameraapp.process_capture import FrameRing
+
+        owner = FrameRing.create((2, 3, 3), slots=4)
+        try:
+            other = FrameRing.attach(owner.name, (2, 3, 3), slots=4)
+            owner.slot(1)[:] = 7
+
+            assert other.slot(1)[0, 0, 0] == 7
+            assert other.slot(0)[0, 0, 0] == 0
+            other.close()
+        finally:
+            owner.close()
+
+
+class TestProcessCapture:
+    """Tests for ProcessCapture."""
+
+    def test_reads_frames_from_worker(self, video_file: str) -> None:
+        """Test frames decoded in the worker arrive as read-only copies."""
+        from cameraapp.process_capture import ProcessCapture
+
+        cap = ProcessCapture(video_file, name="test")
+        try:
+            assert cap.isOpened()
+            assert cap.pid is not None and cap.pid != os.getpid()
+            width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+            height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+            assert (width, height) == (64, 48)
+
+            ok, frame = cap.read()
+
+            assert ok and frame is not None
+            assert frame.shape == (48, 64, 3)
+            assert not frame.flags.writeable
+            assert frame.base is None
+        finally:
+            cap.release()
+
+        assert not cap.isOpened()
+        assert cap.pid is None
+        # The copy outlives the ring
+        assert frame.shape == (48, 64, 3)
+        assert int(frame.sum()) >= 0
+
+    def test_worker_grabs_without_decoding_at_negative_rate(self) -> None:
+        """Test a worker told not to decode keeps grabbing and reports it."""
+        import multiprocessing
+        import threading
+        import time
+        from unittest.mock import MagicMock
+
+        from cameraapp.process_capture import FrameRing, _capture_worker
+
+        capture = MagicMock()
+        capture.isOpened.return_value = True
+        capture.read.return_value = (True, np.zeros((2, 3, 3), np.uint8))
+        capture.get.return_value = 0.0
+        capture.grab.side_effect = lambda: time.sleep(0.005) or True
+        capture.retrieve.side_effect = lambda image: (True, image)
+        decode_fps = multiprocessing.Value("d", -1.0, lock=False)
+        parent, child = multiprocessing.Pipe()
+        ring = FrameRing.create((2, 3, 3), slots=2)
+
+        def receive() -> tuple:
+            assert parent.poll(2.0), "worker went quiet"
+            return parent.recv()
+
+        with (
+            patch("cv2.VideoCapture", return_value=capture),
+            patch("cameraapp.process_capture.GRAB_REPORT_INTERVAL", 0.02),
+            patch("signal.signal"),
+        ):
+            worker = threading.Thread(
+                target=_capture_worker, args=("test", [], child, decode_fps)
+            )
+            worker.start()
+            try:
+                assert receive()[0] == "opened"
+                parent.send(("ring", ring.name, 2))
+                assert receive()[0] == "frame"  # The frame read on open
+
+                messages = [receive() for _ in range(3)]
+                assert [message[0] for message in messages] == ["grabbed"] * 3
+                # Each report counts the grabs since the previous one
+                assert all(message[1] >= 1 for message in messages)
+                assert capture.retrieve.call_count == 0
+
+                decode_fps.value = 0.0
+                while receive()[0] != "frame":
+                    pass
+                assert capture.retrieve.call_count > 0
+            finally:
+                parent.send(("stop",))
+                worker.join(timeout=2)
+                ring.close()
+
+    def test_worker_gives_up_after_repeated_read_failures(self) -> None:
+        """Test a worker backs off between failed reads and exits after N."""
+        import multiprocessing
+        import threading
+        import time
+        from unittest.mock import MagicMock
+
+        from cameraapp.process_capture import FrameRing, _capture_worker
+
+        capture = MagicMock()
+        capture.isOpened.return_value = True
+        capture.read.return_value = (True, np.zeros((2, 3, 3), np.uint8))
+        capture.get.return_value = 0.0
+        capture.grab.return_value = False
+        decode_fps = multiprocessing.Value("d", 0.0, lock=False)
+        parent, child = multiprocessing.Pipe()
+        ring = FrameRing.create((2, 3, 3), slots=2)
+
+        with (
+            patch("cv2.VideoCapture", return_value=capture),
+            patch("cameraapp.process_capture.WORKER_FAILURE_BACKOFF", 0.05),
+            patch("signal.signal"),
+        ):
+            worker = threading.Thread(
+                target=_capture_worker, args=("test", [], child, decode_fps, 3)
+            )
+            start = time.monotonic()
+            worker.start()
+            try:
+                assert parent.recv()[0] == "opened"
+                parent.send(("ring", ring.name, 2))
+                assert parent.recv()[0] == "frame"
+
+                messages = [parent.recv() for _ in range(3)]
+                worker.join(timeout=2)
+
+                assert messages == [("read_failed",), ("read_failed",), ("failed",)]
+                assert not worker.is_alive()
+                assert capture.grab.call_count == 3
+                assert time.monotonic() - start >= 0.1
+                capture.release.assert_called_once()
+            finally:
+                worker.join(timeout=2)
+                ring.close()
+
+    def test_crashed_worker_is_restarted(self, video_file: str) -> None:
+        """Test a killed worker is replaced and reads resume."""
+        from cameraapp.process_capture import ProcessCapture
+
+        cap = ProcessCapture(video_file, name="test")
+        try:
+            assert cap.read()[0]
+            old_pid = cap.pid
+            assert old_pid is not None
+            os.kill(old_pid, signal.SIGKILL)
+
+            assert not cap.grab()  # The read that saw the crash fails
+            assert cap.restarts == 1
+            assert cap.isOpened() and cap.pid != old_pid
+            assert cap.read()[0]
+        finally:
+            cap.release()
+
+    def test_open_failure(self, temp_dir: Path) -> None:
+        """Test a stream that cannot be opened leaves the capture closed."""
+        from cameraapp.process_capture import ProcessCapture
+
+        cap = ProcessCapture(str(temp_dir / "missing.avi"), name="test")
+
+        assert not cap.isOpened()
+        assert not cap.grab()
+        assert cap.pid is None
+        cap.release()
+
+    def test_camera_uses_process_engine(
+        self, video_file: str, mock_logger: logging.Logger
+    ) -> None:
+        """Test a camera publishes frames decoded by a capture worker."""
+        import time
+        from dataclasses import replace
+
+        from cameraapp.camera import Camera
+        from cameraapp.config import CAMERA_SETTINGS
+
+        settings = replace(CAMERA_SETTINGS, capture_engine="process")
+        with patch("cameraapp.camera.CAMERA_SETTINGS", settings):
+            camera = Camera(
+                ip="192.168.1.100",
+                port=554,
+                username="admin",
+                password="password",
+                rtsp_url=video_file,
+                logger_instance=mock_logger,
+                decode_fps=0,
+            )
+            try:
+                assert camera.connect()
+                deadline = time.monotonic() + 5.0
+                while camera.frame_seq < 3 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+                packet = camera.get_latest_frame()
+                assert packet is not None
+                assert packet.frame.shape == (48, 64, 3)
+            finally:
+                camera.disconnect()
@@ -0,0 +1,114 @@
+"""
+Tests for the reconnect module.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+
+class TestReconnectScheduler:
+    """Tests for ReconnectScheduler."""
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        """Test delays grow exponentially within the upper half of each step."""
+        from cameraapp.reconnect import ReconnectScheduler
+
+        scheduler = ReconnectScheduler(
+            base_delay=2, max_delay=10, max_retries=5, rng=random.Random(1)
+        )
+
+        delays = [scheduler.schedule("cam") for _ in range(5)]
+
+        for attempt, delay in enumerate(delays, start=1):
+            nominal = min(2**attempt, 10)
+            assert nominal / 2 <= delay <= nominal
+        assert scheduler.attempts("cam") == 5
+        assert not scheduler.is_offline("cam")
+
+    def test_cameras_do_not_retry_in_lockstep(self) -> None:
+        """Test cameras failing together get different delays."""
+        from cameraapp.reconnect import ReconnectScheduler
+
+        scheduler = ReconnectScheduler(base_delay=2, max_delay=60)
+
+        delays = {scheduler.schedule(f"cam{i}") for i in range(20)}
+
+        assert len(delays) > 1
+
+    def test_offline_cameras_retry_forever(self) -> None:
+        """Test attempts past max_retries use the offline interval."""
+        from cameraapp.reconnect import ReconnectScheduler
+
+        scheduler = ReconnectScheduler(
+            base_delay=2, max_delay=60, max_retries=2, offline_interval=300
+        )
+        scheduler.schedule("cam")
+        scheduler.schedule("cam")
+
+        for _ in range(3):
+            delay = scheduler.schedule("cam")
+            assert 150 <= delay <= 300
+        assert scheduler.is_offline("cam")
+
+    def test_next_attempt_and_reset(self) -> None:
+        """Test the next attempt time is exposed until the camera is reset."""
+        from cameraapp.reconnect import ReconnectScheduler
+
+        scheduler = ReconnectScheduler(base_delay=2, max_delay=60)
+        assert scheduler.next_attempt("cam") is None
+
+        before = time.monotonic()
+        delay = scheduler.schedule("cam")
+        next_attempt = scheduler.next_attempt("cam")
+
+        assert next_attempt is not None
+        assert before + delay <= next_attempt <= time.monotonic() + delay
+
+        scheduler.reset("cam")
+
+        assert scheduler.next_attempt("cam") is None
+        assert scheduler.attempts("cam") == 0
+
+    def test_open_slots_limit_concurrency(self) -> None:
+        """Test only max_concurrent_opens callers hold a slot at once."""
+        from cameraapp.reconnect import ReconnectScheduler
+
+        scheduler = ReconnectScheduler(max_concurrent_opens=2)
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def open_stream() -> None:
+            nonlocal active, peak
+            with scheduler.open_slot() as admitted:
+                assert admitted
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=open_stream) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+
+    def test_open_slot_wait_is_abandoned_when_stopped(self) -> None:
+        """Test a stopped reader stops waiting for a slot."""
+        from cameraapp.reconnect import ReconnectScheduler
+
+        scheduler = ReconnectScheduler(max_concurrent_opens=1)
+        stopped = threading.Event()
+        stopped.set()
+
+        with scheduler.open_slot() as first:
+            with scheduler.open_slot(stopped) as second:
+                assert first is True
+                assert second is False
@@ -0,0 +1,275 @@
+"""
+Tests for the render module.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+import numpy as np
+import pytest
+
+
+def _bgr_frame(width: int = 640, height: int = 480) -> np.ndarray:
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = 255  # Pure blue in BGR
+    return frame
+
+
+class TestRenderPipeline:
+    """Tests for RenderPipeline."""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_submit_and_collect(self, workers: int) -> None:
+        """Test jobs are prepared and collected per tile."""
+        from cameraapp.render import RenderPipeline, TileSurface
+
+        surfaces = [TileSurface.allocate(80, 60) for _ in range(2)]
+        pipeline = RenderPipeline(max_workers=workers)
+        try:
+            assert pipeline.submit_call(1, 5, surfaces[1].draw, _bgr_frame(), "fit")
+            assert pipeline.submit_call(0, 3, surfaces[0].draw, _bgr_frame(), "fit")
+
+            results = []
+            deadline = time.monotonic() + 2.0
+            while len(results) < 2 and time.monotonic() < deadline:
+                results.extend(pipeline.collect())
+                time.sleep(0.01)
+
+            assert {(tile.index, tile.seq) for tile in results} == {(0, 3), (1, 5)}
+            assert all(tile.result is True for tile in results)
+            assert surfaces[0].image.getpixel((40, 30)) == (0, 0, 255, 255)
+        finally:
+            pipeline.shutdown()
+
+    def test_one_job_per_tile(self) -> None:
+        """Test a tile stays busy until its result is collected."""
+        from cameraapp.render import RenderPipeline, TileSurface
+
+        surface = TileSurface.allocate(80, 60)
+        pipeline = RenderPipeline(max_workers=0)
+
+        assert pipeline.submit_call(0, 1, surface.draw, _bgr_frame(), "fit")
+        assert pipeline.is_busy(0)
+        assert not pipeline.submit_call(0, 2, surface.draw, _bgr_frame(), "fit")
+
+        pipeline.collect()
+
+        assert not pipeline.is_busy(0)
+
+    def test_errors_are_reported(self) -> None:
+        """Test exceptions in a job are returned instead of raised."""
+        from cameraapp.render import RenderPipeline, TileSurface
+
+        surface = TileSurface.allocate(80, 60)
+        pipeline = RenderPipeline(max_workers=0)
+        frame = np.zeros((4, 4, 3), dtype=np.int64)  # Not a depth cv2 resizes
+        pipeline.submit_call(0, 1, surface.draw, frame, "fit")
+
+        (tile,) = pipeline.collect()
+
+        assert tile.result is None
+        assert tile.error is not None
+
+
+class TestTickTimer:
+    """Tests for TickTimer."""
+
+    def test_logs_summary_after_interval(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test a summary is logged once the interval elapses."""
+        from cameraapp.render import TickTimer
+
+        log = logging.getLogger("test_tick_timer")
+        timer = TickTimer("UI tick", interval=0.01, log=log)
+        timer.record(0.002, items=3)
+        time.sleep(0.02)
+
+        with caplog.at_level(logging.DEBUG, logger="test_tick_timer"):
+            timer.record(0.004, items=1)
+
+        assert "UI tick: 2 ticks" in caplog.text
+        assert "4 tile updates" in caplog.text
+        assert timer.ticks == 0
+
+
+class TestGridLayout:
+    """Tests for grid_layout function."""
+
+    def test_layout_rows_and_columns(self) -> None:
+        """Test tiles are laid out row-major with gaps."""
+        from cameraapp.render import grid_layout
+
+        tiles = grid_layout(202, 100, 3, columns=2, gap=2)
+
+        assert len(tiles) == 3
+        assert (tiles[0].x, tiles[0].y, tiles[0].width, tiles[0].height) == (
+            0,
+            0,
+            100,
+            49,
+        )
+        assert (tiles[1].x, tiles[1].y) == (102, 0)
+        assert (tiles[2].x, tiles[2].y) == (0, 51)
+
+    def test_layout_empty(self) -> None:
+        """Test no tiles are produced for zero cameras."""
+        from cameraapp.render import grid_layout
+
+        assert grid_layout(100, 100, 0, columns=2) == []
+
+
+class TestMosaicCompositor:
+    """Tests for MosaicCompositor."""
+
+    def test_configure_only_reallocates_on_change(self) -> None:
+        """Test the buffer is kept while the geometry is unchanged."""
+        from cameraapp.render import MosaicCompositor
+
+        compositor = MosaicCompositor(columns=2)
+
+        assert compositor.configure(1, 1, 4) is False
+        assert compositor.configure(400, 300, 4) is True
+        assert compositor.configure(400, 300, 4) is False
+        assert compositor.configure(400, 300, 5) is True
+        assert compositor.size == (400, 300)
+
+    def test_draw_writes_rgba_in_place(self) -> None:
+        """Test drawing converts to RGBA inside the tile and letterboxes."""
+        from cameraapp.render import MosaicCompositor
+
+        compositor = MosaicCompositor(columns=2, gap=0)
+        compositor.configure(400, 100, 2)
+
+        assert compositor.draw(1, _bgr_frame(), "4:3")
+
+        image = compositor.image
+        assert image is not None
+        assert image.mode == "RGBA"
+        assert image.getpixel((300, 50)) == (0, 0, 255, 255)  # Tile 1 centre
+        assert image.getpixel((201, 50)) == (0, 0, 0, 255)  # Letterbox bar
+        assert image.getpixel((100, 50)) == (0, 0, 0, 255)  # Tile 0 untouched
+
+    def test_clear_tile(self) -> None:
+        """Test clearing a tile paints it black."""
+        from cameraapp.render import MosaicCompositor
+
+        compositor = MosaicCompositor(columns=1, gap=0)
+        compositor.configure(100, 100, 1)
+        compositor.draw(0, _bgr_frame(), "fit")
+        compositor.clear_tile(0)
+
+        assert compositor.image is not None
+        assert compositor.image.getpixel((50, 50)) == (0, 0, 0, 255)
+
+    def test_tile_at(self) -> None:
+        """Test hit-testing points against the layout."""
+        from cameraapp.render import MosaicCompositor
+
+        compositor = MosaicCompositor(columns=2, gap=2)
+        compositor.configure(202, 100, 2)
+
+        assert compositor.tile_at(10, 10) == 0
+        assert compositor.tile_at(150, 10) == 1
+        assert compositor.tile_at(101, 10) is None
+
+
+class TestTileSurface:
+    """Tests for TileSurface."""
+
+    def test_draw_and_image_share_memory(self) -> None:
+        """Test the PIL image reflects draws without being rebuilt."""
+        from cameraapp.render import TileSurface
+
+        surface = TileSurface.allocate(160, 120)
+        image = surface.image
+
+        assert surface.draw(_bgr_frame(), "fit")
+        assert surface.image is image
+        assert image.getpixel((80, 60)) == (0, 0, 255, 255)
+
+    def test_letterbox_repainted_on_ratio_change(self) -> None:
+        """Test switching aspect ratio clears the old image area."""
+        from cameraapp.render import TileSurface
+
+        surface = TileSurface.allocate(200, 100)
+        surface.draw(_bgr_frame(), "fit")
+        surface.draw(_bgr_frame(), "4:3")
+
+        assert surface.image.getpixel((5, 50)) == (0, 0, 0, 255)
+        assert surface.image.getpixel((100, 50)) == (0, 0, 255, 255)
+
+    def test_fit_fills_the_tile(self) -> None:
+        """Test "fit" stretches the frame over the whole tile."""
+        from cameraapp.render import TileSurface
+
+        surface = TileSurface.allocate(320, 100)
+
+        assert surface.draw(_bgr_frame(), "fit")
+        assert surface.image.getpixel((0, 0)) == (0, 0, 255, 255)
+        assert surface.image.getpixel((319, 99)) == (0, 0, 255, 255)
+
+    def test_empty_frame_is_not_drawn(self) -> None:
+        """Test frames without pixels are skipped."""
+        from cameraapp.render import TileSurface
+
+        surface = TileSurface.allocate(80, 60)
+
+        assert not surface.draw(np.zeros((0, 0, 3), dtype=np.uint8), "fit")
+
+    def test_steady_state_draw_does_not_allocate(self) -> None:
+        """Test repeated draws reuse the tile buffers (tracemalloc)."""
+        import tracemalloc
+
+        from cameraapp.render import TileSurface
+
+        frame = _bgr_frame(1280, 720)
+        surface = TileSurface.allocate(320, 200)
+        surface.draw(frame, "16:9")  # Warm up: allocates the scratch buffer
+        tile_bytes = 320 * 200 * 4
+
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            for _ in range(20):
+                surface.draw(frame, "16:9")
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert current - baseline < 1024
+        assert peak - baseline < tile_bytes // 10
+
+
+class TestMosaicAllocation:
+    """Tests for allocation-free mosaic drawing."""
+
+    def test_steady_state_mosaic_draw_does_not_allocate(self) -> None:
+        """Test repeated mosaic draws write into the shared buffer (tracemalloc)."""
+        import tracemalloc
+
+        from cameraapp.render import MosaicCompositor
+
+        frame = _bgr_frame(1280, 720)
+        compositor = MosaicCompositor(columns=2)
+        compositor.configure(640, 400, 4)
+        for index in range(4):
+            compositor.draw(index, frame, "16:9")  # Warm up the scratch buffers
+        mosaic_bytes = 640 * 400 * 4
+
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            for _ in range(5):
+                for index in range(4):
+                    compositor.draw(index, frame, "16:9")
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert current - baseline < 1024
+        assert peak - baseline < mosaic_bytes // 10
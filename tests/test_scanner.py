@@ -0,0 +1,662 @@
+"""
+Tests for the scanner module.
+"""
+
+from __future__ import annotations
+
+import socket
+from collections.abc import Generator, Iterable
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def open_port() -> Generator[int, None, None]:
+    """Listen on a loopback port and return its number."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    yield server.getsockname()[1]
+    server.close()
+
+
+@pytest.fixture
+def closed_port() -> int:
+    """Return a loopback port nothing listens on."""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+@pytest.fixture
+def onvif_server() -> Generator[tuple[int, list[str]], None, None]:
+    """
+    Serve a minimal ONVIF device on loopback.
+
+    Yields:
+        The port and a list that records one entry per TCP connection
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    connections: list[str] = []
+    responses = {
+        "GetDeviceInformation": (
+            "<tds:GetDeviceInformationResponse>"
+            "<tds:Manufacturer>Acme</tds:Manufacturer><tds:Model>X1</tds:Model>"
+            "</tds:GetDeviceInformationResponse>"
+        ),
+        "GetProfiles": (
+            '<trt:GetProfilesResponse><trt:Profiles token="main"/>'
+            "</trt:GetProfilesResponse>"
+        ),
+        "GetStreamUri": "<tt:Uri>rtsp://127.0.0.1/main</tt:Uri>",
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        """Answers ONVIF requests on the first device and media paths."""
+
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            """Record the connection."""
+            super().setup()
+            connections.append(self.client_address[0])
+
+        def do_POST(self) -> None:  # noqa: N802
+            """Reply to a SOAP request."""
+            body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+            reply = next(
+                (text for action, text in responses.items() if f"<{action} " in body),
+                None,
+            )
+            if self.path not in ("/onvif/device_service", "/onvif/media_service"):
+                reply = None
+            data = (reply or "").encode()
+            self.send_response(200 if reply else 404)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: object) -> None:
+            """Silence per-request logging."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], connections
+    server.shutdown()
+    server.server_close()
+
+
+class TestIPRanges:
+    """Tests for IP range parsing."""
+
+    @pytest.mark.parametrize(
+        ("ip_range", "count"),
+        [
+            ("192.168.1.0/24", 254),
+            ("10.0.0.0/31", 2),
+            ("10.0.0.7/32", 1),
+            ("192.168.1.1-10", 10),
+            ("192.168.1.250-192.168.2.5", 12),
+            ("192.168.1.9", 1),
+            ("not an address", 0),
+        ],
+    )
+    def test_count_matches_iteration(self, ip_range: str, count: int) -> None:
+        """Test the lazy iterator and the count agree with the list parser."""
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner()
+
+        assert scanner._count_ip_range(ip_range) == count
+        assert list(scanner._iter_ip_range(ip_range)) == scanner._parse_ip_range(
+            ip_range
+        )
+        assert len(scanner._parse_ip_range(ip_range)) == count
+
+    def test_iteration_is_lazy(self) -> None:
+        """Test a /8 can be iterated without listing every address."""
+        from itertools import islice
+
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner()
+        ips = scanner._iter_ip_range("10.0.0.0/8")
+
+        assert list(islice(ips, 2)) == ["10.0.0.1", "10.0.0.2"]
+        assert scanner._count_ip_range("10.0.0.0/8") == 2**24 - 2
+
+
+class TestPortScanEngines:
+    """Tests for the async and thread port scan engines."""
+
+    @pytest.mark.parametrize("engine", ["async", "thread"])
+    def test_finds_open_ports(
+        self, engine: str, open_port: int, closed_port: int
+    ) -> None:
+        """Test both engines report open ports and their progress."""
+        from cameraapp.scanner import NetworkScanner
+
+        progress: list[tuple[int, int]] = []
+        scanner = NetworkScanner(
+            timeout=1.0,
+            engine=engine,
+            progress_callback=lambda current, total, _: progress.append(
+                (current, total)
+            ),
+        )
+
+        cameras = scanner.scan_ports(
+            "127.0.0.1", ports=[open_port, closed_port], probe_onvif=False
+        )
+
+        assert [camera.ip for camera in cameras] == ["127.0.0.1"]
+        assert cameras[0].ports == [open_port]
+        assert cameras[0].rtsp_urls
+        assert progress[0] == (0, 2)
+        assert (2, 2) in progress
+
+    def test_async_window_is_bounded(self) -> None:
+        """Test the async engine keeps at most ``concurrency`` probes in flight."""
+        import asyncio
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner(engine="async", concurrency=8)
+        in_flight = 0
+        peak = 0
+        pulled = 0
+        pulled_at_first_probe = 0
+
+        async def fake_probe(ip: str, port: int) -> None:
+            nonlocal in_flight, peak, pulled_at_first_probe
+            pulled_at_first_probe = pulled_at_first_probe or pulled
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+
+        def targets() -> Generator[tuple[str, int], None, None]:
+            nonlocal pulled
+            for i in range(200):
+                pulled += 1
+                yield (f"10.0.0.{i + 1}", 554)
+
+        with patch.object(scanner, "_probe_port", side_effect=fake_probe):
+            asyncio.run(scanner._scan_targets_async(targets(), 200, lambda *a: None))
+
+        assert pulled_at_first_probe <= 8  # Targets are pulled as probes finish
+        assert pulled == 200
+        assert peak == 8
+
+    def test_async_scan_stops_on_request(self) -> None:
+        """Test stop() ends an async scan and cancels probes in flight."""
+        import asyncio
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner(engine="async", concurrency=4)
+        started = 0
+
+        async def slow_probe(ip: str, port: int) -> None:
+            nonlocal started
+            started += 1
+            if started == 10:
+                scanner.stop()
+            await asyncio.sleep(0.01)
+
+        targets = ((f"10.0.0.{i % 250 + 1}", 554) for i in range(10_000))
+        with patch.object(scanner, "_probe_port", side_effect=slow_probe):
+            asyncio.run(scanner._scan_targets_async(targets, 10_000, lambda *a: None))
+
+        assert started < 20
+
+    @pytest.mark.parametrize("engine", ["async", "thread"])
+    def test_probes_tell_refused_from_open(
+        self, engine: str, open_port: int, closed_port: int
+    ) -> None:
+        """Test a refused connection is told apart from an open port."""
+        import asyncio
+
+        from cameraapp.scanner import NetworkScanner, PortState
+
+        scanner = NetworkScanner(timeout=1.0, engine=engine)
+
+        def probe(port: int) -> PortState:
+            if engine == "async":
+                return asyncio.run(scanner._probe_port("127.0.0.1", port))
+            return scanner._check_port("127.0.0.1", port)
+
+        assert probe(open_port) is PortState.OPEN
+        assert probe(closed_port) is PortState.CLOSED
+
+    @pytest.mark.parametrize("engine", ["async", "thread"])
+    def test_vendor_ports_only_probed_on_live_hosts(self, engine: str) -> None:
+        """Test the second tier only probes hosts that accepted or refused."""
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner, PortState
+
+        progress: list[str] = []
+        scanner = NetworkScanner(
+            engine=engine,
+            neighbor_mode="off",
+            liveness_ports=[554, 80],
+            vendor_ports=[8000, 37777],
+            progress_callback=lambda current, total, message: progress.append(message),
+        )
+        states = {
+            ("10.0.0.1", 554): PortState.OPEN,
+            ("10.0.0.2", 80): PortState.CLOSED,  # RST: the host is up
+            ("10.0.0.2", 8000): PortState.OPEN,
+        }
+        probed: list[tuple[str, int]] = []
+
+        def check(ip: str, port: int) -> PortState:
+            probed.append((ip, port))
+            return states.get((ip, port), PortState.SILENT)
+
+        async def probe(ip: str, port: int) -> PortState:
+            return check(ip, port)
+
+        with (
+            patch.object(scanner, "_probe_port", side_effect=probe),
+            patch.object(scanner, "_check_port", side_effect=check),
+        ):
+            cameras = scanner.scan_ports("10.0.0.1-8", probe_onvif=False)
+
+        vendor_probes = {target for target in probed if target[1] in (8000, 37777)}
+        assert vendor_probes == {
+            (ip, port) for ip in ("10.0.0.1", "10.0.0.2") for port in (8000, 37777)
+        }
+        assert len(probed) == 8 * 2 + 2 * 2
+        assert {camera.ip: camera.ports for camera in cameras} == {
+            "10.0.0.1": [554],
+            "10.0.0.2": [8000],
+        }
+        assert scanner.probes_sent == 20
+        assert scanner.probes_saved == 8 * 4 - 20
+        assert "12 conexões evitadas" in progress[-1]
+
+    def test_unknown_engine_rejected(self) -> None:
+        """Test an unknown engine name raises ValueError."""
+        from cameraapp.scanner import NetworkScanner
+
+        with pytest.raises(ValueError):
+            NetworkScanner(engine="carrier-pigeon")
+
+
+class TestIterScan:
+    """Tests for streaming scan results."""
+
+    def test_yields_cameras_and_updates_while_scanning(self) -> None:
+        """Test cameras are yielded when found and again when enriched."""
+        import threading
+        from collections.abc import Callable
+        from unittest.mock import patch
+
+        from cameraapp.scanner import DiscoveredCamera, NetworkScanner, ONVIFInfo
+
+        scanner = NetworkScanner()
+        first_seen = threading.Event()
+
+        async def fake_scan(
+            targets: Iterable[tuple[str, int]],
+            total: int,
+            on_open: Callable[[str, int], None],
+            on_refused: object = None,
+        ) -> None:
+            for ip, port in targets:
+                if port == 80:
+                    on_open(ip, port)
+
+        def fake_probe(ip: str, port: int = 80) -> DiscoveredCamera:
+            # The ONVIF phase only finishes once the port result was seen
+            assert first_seen.wait(5.0)
+            info = ONVIFInfo(manufacturer="Acme", rtsp_url=f"rtsp://{ip}/onvif")
+            return DiscoveredCamera(
+                ip=ip, manufacturer="Acme", onvif_available=True, onvif_info=info
+            )
+
+        results = []
+        with patch.object(scanner, "_scan_targets_async", side_effect=fake_scan):
+            with patch.object(scanner, "probe_onvif_direct", side_effect=fake_probe):
+                for camera in scanner.iter_scan("10.0.0.5", include_onvif=False):
+                    results.append(camera)
+                    first_seen.set()
+
+        assert results[0].ports == [80]
+        assert results[0].onvif_info is None
+        assert results[0].rtsp_urls  # Suggestions are filled in right away
+        assert results[-1].manufacturer == "Acme"
+        assert results[-1].rtsp_urls[0] == "rtsp://10.0.0.5/onvif"
+        assert sorted(results[-1].ports) == [80, 554]
+        assert {camera.ip for camera in results} == {"10.0.0.5"}
+
+    def test_closing_the_iterator_stops_the_scan(self) -> None:
+        """Test breaking out of iter_scan() stops the background scan."""
+        import asyncio
+        import threading
+        from collections.abc import Callable
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner()
+
+        async def endless_scan(
+            targets: Iterable[tuple[str, int]],
+            total: int,
+            on_open: Callable[[str, int], None],
+            on_refused: object = None,
+        ) -> None:
+            on_open("10.0.0.5", 554)
+            while not scanner._stop_requested:
+                await asyncio.sleep(0.01)
+
+        with patch.object(scanner, "_scan_targets_async", side_effect=endless_scan):
+            scan = scanner.iter_scan("10.0.0.0/24", include_onvif=False)
+            assert next(scan).ip == "10.0.0.5"
+            scan.close()
+
+        assert scanner._stop_requested
+        assert not any(t.name == "NetworkScan" for t in threading.enumerate())
+
+    def test_scan_errors_are_raised_to_the_consumer(self) -> None:
+        """Test an exception in the background scan reaches the iterator."""
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner()
+
+        with patch.object(scanner, "scan_ports", side_effect=OSError("no network")):
+            with pytest.raises(OSError, match="no network"):
+                list(scanner.iter_scan("10.0.0.0/24", include_onvif=False))
+
+    def test_progress_is_throttled(self) -> None:
+        """Test port scan progress is reported by time, not per probe."""
+        from cameraapp.scanner import NetworkScanner
+
+        progress: list[tuple[int, int]] = []
+        scanner = NetworkScanner(
+            progress_callback=lambda current, total, _: progress.append(
+                (current, total)
+            ),
+            progress_interval=60.0,
+        )
+
+        for completed in range(1, 10001):
+            scanner._report_scan_progress(completed, 10000)
+
+        assert progress == [(1, 10000), (10000, 10000)]
+
+
+class TestONVIFProbing:
+    """Tests for direct ONVIF probing."""
+
+    def test_probe_reuses_one_connection(
+        self, onvif_server: tuple[int, list[str]]
+    ) -> None:
+        """Test device info, profiles and stream URI share a connection."""
+        from cameraapp.scanner import ONVIFProber
+
+        port, connections = onvif_server
+
+        info = ONVIFProber(timeout=2.0).probe("127.0.0.1", port)
+
+        assert info is not None
+        assert (info.manufacturer, info.model) == ("Acme", "X1")
+        assert info.rtsp_url == "rtsp://127.0.0.1/main"
+        assert len(connections) == 1
+
+    def test_probe_gives_up_on_unreachable_port(self, closed_port: int) -> None:
+        """Test a refused connection ends the probe without trying every path."""
+        from unittest.mock import patch
+
+        from cameraapp.scanner import ONVIFProber
+
+        prober = ONVIFProber(timeout=1.0)
+        with patch.object(
+            prober, "_soap_request", wraps=prober._soap_request
+        ) as request:
+            assert prober.probe("127.0.0.1", closed_port) is None
+
+        assert request.call_count == 1
+
+    def test_probes_start_during_port_scan(self) -> None:
+        """Test ONVIF is probed on every HTTP port while the scan still runs."""
+        import threading
+        from collections.abc import Callable
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner()
+        probed: list[tuple[str, int]] = []
+        probe_started = threading.Event()
+
+        async def fake_scan(
+            targets: Iterable[tuple[str, int]],
+            total: int,
+            on_open: Callable[[str, int], None],
+            on_refused: object = None,
+        ) -> None:
+            for ip, port in targets:
+                if port in (554, 8080, 8899):
+                    on_open(ip, port)
+                if port == 8080:
+                    # The scan only goes on once a probe is already running
+                    assert probe_started.wait(5.0)
+
+        def fake_probe(ip: str, port: int = 80) -> None:
+            probed.append((ip, port))
+            probe_started.set()
+
+        with patch.object(scanner, "_scan_targets_async", side_effect=fake_scan):
+            with patch.object(scanner, "probe_onvif_direct", side_effect=fake_probe):
+                cameras = scanner.scan_ports("10.0.0.5")
+
+        assert sorted(probed) == [("10.0.0.5", 8080), ("10.0.0.5", 8899)]
+        assert sorted(cameras[0].ports) == [554, 8080, 8899]
+
+    def test_probes_run_in_parallel_up_to_the_pool_size(self) -> None:
+        """Test ONVIF probes of different hosts overlap, bounded by the pool."""
+        import threading
+        import time
+        from collections.abc import Callable
+        from unittest.mock import patch
+
+        from cameraapp.scanner import DiscoveredCamera, NetworkScanner, ONVIFInfo
+
+        scanner = NetworkScanner(onvif_workers=4)
+        barrier = threading.Barrier(4, timeout=5.0)
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        async def fake_scan(
+            targets: Iterable[tuple[str, int]],
+            total: int,
+            on_open: Callable[[str, int], None],
+            on_refused: object = None,
+        ) -> None:
+            for ip, port in targets:
+                if port == 80:
+                    on_open(ip, port)
+
+        def fake_probe(ip: str, port: int = 80) -> DiscoveredCamera:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            barrier.wait()  # Fails unless four probes run at once
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            info = ONVIFInfo(manufacturer="Acme")
+            return DiscoveredCamera(
+                ip=ip, manufacturer="Acme", onvif_available=True, onvif_info=info
+            )
+
+        with patch.object(scanner, "_scan_targets_async", side_effect=fake_scan):
+            with patch.object(scanner, "probe_onvif_direct", side_effect=fake_probe):
+                cameras = scanner.scan_ports("10.0.0.1-8")
+
+        assert peak == 4
+        assert len(cameras) == 8
+        assert all(camera.manufacturer == "Acme" for camera in cameras)
+
+
+class TestNeighborTable:
+    """Tests for neighbor table assisted scanning."""
+
+    def test_reads_proc_arp(self, temp_dir: Path) -> None:
+        """Test resolved /proc/net/arp entries are read and others skipped."""
+        from unittest.mock import patch
+
+        from cameraapp.scanner import read_neighbor_table
+
+        arp = temp_dir / "arp"
+        arp.write_text(
+            "IP address       HW type     Flags       HW address            "
+            "Mask     Device\n"
+            "192.168.1.10     0x1         0x2         44:19:B6:00:00:01     "
+            "*        eth0\n"
+            "192.168.1.11     0x1         0x0         00:00:00:00:00:00     "
+            "*        eth0\n"
+        )
+
+        with patch("cameraapp.scanner.ARP_TABLE_PATH", str(arp)):
+            assert read_neighbor_table() == {"192.168.1.10": "44:19:b6:00:00:01"}
+
+    def test_falls_back_to_ip_neigh(self, temp_dir: Path) -> None:
+        """Test ``ip neigh`` is used where /proc/net/arp is missing."""
+        import subprocess
+        from unittest.mock import patch
+
+        from cameraapp.scanner import read_neighbor_table
+
+        output = (
+            "192.168.1.10 dev eth0 lladdr 90:02:a9:00:00:01 REACHABLE\n"
+            "192.168.1.11 dev eth0 lladdr 90:02:a9:00:00:02 STALE\n"
+            "192.168.1.12 dev eth0  FAILED\n"
+        )
+        result = subprocess.CompletedProcess([], 0, stdout=output)
+
+        with (
+            patch("cameraapp.scanner.ARP_TABLE_PATH", str(temp_dir / "none")),
+            patch("shutil.which", return_value="/sbin/ip"),
+            patch("subprocess.run", return_value=result),
+        ):
+            assert read_neighbor_table() == {
+                "192.168.1.10": "90:02:a9:00:00:01",
+                "192.168.1.11": "90:02:a9:00:00:02",
+            }
+
+    @pytest.mark.parametrize("mode", ["order", "prune"])
+    def test_known_hosts_are_scanned_first(self, mode: str) -> None:
+        """Test camera vendor hosts lead the scan and pruning drops the rest."""
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner, PortState
+
+        scanner = NetworkScanner(
+            neighbor_mode=mode, liveness_ports=[554], vendor_ports=[]
+        )
+        table = {
+            "10.0.0.3": "02:00:00:00:00:03",  # Not a camera vendor
+            "10.0.0.7": "44:19:b6:00:00:07",  # Hikvision
+            "192.168.9.9": "44:19:b6:00:00:09",  # Outside the range
+        }
+        probed: list[str] = []
+
+        async def probe(ip: str, port: int) -> PortState:
+            probed.append(ip)
+            return PortState.OPEN if ip == "10.0.0.7" else PortState.SILENT
+
+        with (
+            patch("cameraapp.scanner.read_neighbor_table", return_value=table),
+            patch.object(scanner, "_probe_port", side_effect=probe),
+        ):
+            cameras = scanner.scan_ports("10.0.0.1-8", probe_onvif=False)
+
+        if mode == "order":
+            assert probed[:2] == ["10.0.0.7", "10.0.0.3"]
+            assert sorted(probed) == [f"10.0.0.{i}" for i in range(1, 9)]
+        else:
+            assert probed == ["10.0.0.7", "10.0.0.3"]
+        assert len(cameras) == 1
+        assert cameras[0].mac == "44:19:b6:00:00:07"
+        assert cameras[0].manufacturer == "Hikvision"
+        assert cameras[0].rtsp_urls[0] == "rtsp://10.0.0.7/Streaming/Channels/101"
+
+    @pytest.mark.parametrize(
+        "ip_range",
+        ["10.0.0.0/16", "10.0.0.1-8", "10.0.0.1 - 10.0.0.8", "10.0.0.7", "bogus"],
+    )
+    def test_range_filter_matches_iteration(self, ip_range: str) -> None:
+        """Test neighbor entries are kept exactly when the range yields them."""
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner()
+        in_range = scanner._ip_range_filter(ip_range)
+        candidates = ["10.0.0.0", "10.0.0.1", "10.0.0.7", "10.0.0.9", "10.0.255.255"]
+        candidates += ["10.1.0.1", "192.168.0.7"]
+
+        expected = set(scanner._iter_ip_range(ip_range)) & set(candidates)
+        assert {ip for ip in candidates if in_range(ip)} == expected
+
+    def test_neighbors_do_not_walk_the_range(self) -> None:
+        """Test matching the neighbor table never iterates a large range."""
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner
+
+        scanner = NetworkScanner()
+        table = {"10.20.30.40": "44:19:b6:00:00:01", "172.16.0.1": "02:00:00:00:00:01"}
+
+        with (
+            patch("cameraapp.scanner.read_neighbor_table", return_value=table),
+            patch.object(scanner, "_iter_ip_range", side_effect=AssertionError),
+        ):
+            neighbors = scanner._neighbors_in_range("10.0.0.0/8")
+
+        assert neighbors == {"10.20.30.40": "44:19:b6:00:00:01"}
+
+    def test_prune_without_known_hosts_scans_everything(self) -> None:
+        """Test pruning falls back to the whole range if no host is known."""
+        from unittest.mock import patch
+
+        from cameraapp.scanner import NetworkScanner, PortState
+
+        scanner = NetworkScanner(
+            neighbor_mode="prune", liveness_ports=[554], vendor_ports=[]
+        )
+        probed: list[str] = []
+
+        async def probe(ip: str, port: int) -> PortState:
+            probed.append(ip)
+            return PortState.SILENT
+
+        with (
+            patch("cameraapp.scanner.read_neighbor_table", return_value={}),
+            patch.object(scanner, "_probe_port", side_effect=probe),
+        ):
+            scanner.scan_ports("10.0.0.1-4", probe_onvif=False)
+
+        assert len(probed) == 4
+
+    def test_unknown_neighbor_mode_rejected(self) -> None:
+        """Test an unknown neighbor mode raises ValueError."""
+        from cameraapp.scanner import NetworkScanner
+
+        with pytest.raises(ValueError):
+            NetworkScanner(neighbor_mode="sometimes")
@@ -0,0 +1,81 @@
+"""
+Tests for the timeline module.
+"""
+
+from __future__ import annotations
+
+
+class TestConnectTimeline:
+    """Tests for ConnectTimeline."""
+
+    def test_phases_accumulate_in_order(self) -> None:
+        """Test repeated phases add up and keep their first position."""
+        from cameraapp.timeline import ConnectTimeline
+
+        timeline = ConnectTimeline("connect", started=100.0)
+        timeline.add("onvif", 0.5)
+        timeline.add("open", 1.0)
+        timeline.add("onvif", 0.25)
+
+        assert list(timeline.phases) == ["onvif", "open"]
+        assert timeline.phases["onvif"] == 0.75
+
+    def test_time_to_first_frame_only_when_connected(self) -> None:
+        """Test failed attempts have no time-to-first-frame."""
+        from cameraapp.timeline import ConnectTimeline
+
+        failed = ConnectTimeline()
+        failed.finish("failed")
+        connected = ConnectTimeline(started=10.0)
+        connected.finish("connected")
+        connected.finished = 12.5
+
+        assert failed.time_to_first_frame is None
+        assert connected.time_to_first_frame == 2.5
+
+    def test_phase_context_manager(self) -> None:
+        """Test the phase() block is timed."""
+        import time
+
+        from cameraapp.timeline import ConnectTimeline
+
+        timeline = ConnectTimeline()
+        with timeline.phase("open"):
+            time.sleep(0.01)
+
+        assert timeline.phases["open"] >= 0.01
+
+
+class TestSummarize:
+    """Tests for percentile and summarize functions."""
+
+    def test_percentile_nearest_rank(self) -> None:
+        """Test nearest-rank percentiles."""
+        from cameraapp.timeline import percentile
+
+        values = [float(v) for v in range(1, 21)]
+
+        assert percentile(values, 50) == 10.0
+        assert percentile(values, 95) == 19.0
+        assert percentile([], 50) == 0.0
+
+    def test_summary_reports_ttff_and_phases(self) -> None:
+        """Test the summary covers connected cameras and per-phase p50/p95."""
+        from cameraapp.timeline import ConnectTimeline, summarize
+
+        timelines = []
+        for i in range(4):
+            timeline = ConnectTimeline(started=0.0, from_cache=i == 0)
+            timeline.add("open", 0.5)
+            timeline.add("first_frame", 0.5)
+            timeline.finish("connected")
+            timeline.finished = 1.0 + i
+            timelines.append(timeline)
+        failed = ConnectTimeline()
+        failed.finish("failed")
+
+        summary = summarize([*timelines, failed])
+
+        assert "across 4 cameras: 2.00/4.00s" in summary
+        assert "open 0.50/0.50s" in summary
+        assert "(1 from cached URIs)" in summary